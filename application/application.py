@@ -16,6 +16,8 @@ import atexit
 import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from shutil import copytree
 from unittest.mock import MagicMock
@@ -26,8 +28,12 @@ from application.controller.component_data_controller import ComponentDataContro
 from application.controller.current_controller import CurrentController
 from application.controller.device_controller import DeviceController
 from application.controller.plugins_controller import PluginsController
-from pluginsmanager.observer.autosaver.autosaver import Autosaver
-from pluginsmanager.observer.mod_host.mod_host import ModHost
+from application.dao.banks_dao import BanksDao
+from application.dao.current_dao import CurrentDao
+from application.dao.data_store import DataStore
+from application.mod_host.device_mod_host import DeviceModHost
+from application.mod_host.mod_host_supervisor import ModHostSupervisor
+from application.startup_profiler import StartupProfiler
 
 logging.basicConfig(format='[%(asctime)s] %(levelname)s - %(message)s', stream=sys.stdout, level=logging.DEBUG)
 
@@ -59,35 +65,73 @@ class Application(object):
 
     :param string path_data: Path where the data will be persisted
     :param string address: `mod-host`_ address
-    :param bool test: If ``test == True``, the connection with mod-host will be simulated
+    :param bool test: If ``test == True``, the connection with mod-host will be simulated by a ``MagicMock``.
+                      For simulate the mod-host protocol and timing, informs the ``address`` and
+                      ``port`` of a :class:`.ModHostSimulator`
+    :param bool lazy_banks: If ``lazy_banks == True``, only the current bank is loaded in the
+                            initialization. The others are loaded on demand (see :class:`.BanksDao`)
+    :param bool log_startup: Logs the duration of each startup phase
+                             (see :attr:`startup_profiler`)
+    :param int port: `mod-host`_ socket port
+    :param bool banks_snapshot: Reads the banks of a :class:`.BanksSnapshot`: only the banks files
+                                changed after the last startup are decoded (only without ``lazy_banks``)
+    :param bool data_store: Persists the data in a single file (``pedalpi.db``, see :class:`.DataStore`)
+                            instead of the json files. The json files data is imported in the first use
+
+    If mod-host restarts, the connection is restored by the :attr:`mod_host_supervisor`,
+    that loads the current pedalboard again.
 
     .. _mod-host: https://github.com/moddevices/mod-host
     """
 
-    def __init__(self, path_data="data/", address="localhost", test=False):
-        self.mod_host = self._initialize(address, test)
+    def __init__(self, path_data="data/", address="localhost", test=False, lazy_banks=False, log_startup=False,
+                 port=5555, banks_snapshot=False, data_store=False):
+        self.startup_profiler = StartupProfiler(log=log_startup)
+        """
+        :class:`.StartupProfiler` with the duration of the initialization and :meth:`start` phases
+        """
+        profiler = self.startup_profiler
+
+        self._daos = {}
+        self._daos_lock = threading.Lock()
+
+        with profiler.phase('mod-host connection'):
+            self.mod_host = self._initialize(address, port, test)
 
         # Data
         path_data = Path(path_data)
-        self.path_data = self._initialize_data(path_data)
-        self.autosaver = Autosaver(str(path_data / Path('banks')))
-        self.manager = self.autosaver.load(DeviceController.sys_effect)
+        with profiler.phase('data initialization'):
+            self.path_data = self._initialize_data(path_data)
+
+            self.data_store = DataStore(self.path_data / Path('pedalpi.db')) if data_store else None
+            """
+            :class:`.DataStore` used by the daos (``None`` if ``data_store == False``)
+            """
+        with profiler.phase('banks load'):
+            self.manager, self.autosaver = self._load_banks(lazy_banks, banks_snapshot)
 
         # Controllers
         self.components = []
-        self.controllers = self._load_controllers()
+        with profiler.phase('controllers creation'):
+            self.controllers = self._load_controllers()
 
         self._configure_controllers(self.controllers)
 
         # Observers
-        self.components_observer = ComponentsObserver(self.manager)
-        current_pedalboard_observer = CurrentPedalboardObserver(self.controller(CurrentController))
+        with profiler.phase('observers registration'):
+            self.components_observer = ComponentsObserver(self.manager)
+            current_pedalboard_observer = CurrentPedalboardObserver(self.controller(CurrentController))
 
-        self.manager.register(self.components_observer)
-        self.manager.register(current_pedalboard_observer)
+            self.manager.register(self.components_observer)
+            self.manager.register(current_pedalboard_observer)
 
-    def _initialize(self, address, test=False):
-        mod_host = ModHost(address)
+        self.mod_host_supervisor = None if test else ModHostSupervisor(self.mod_host, self._restore_mod_host)
+        """
+        :class:`.ModHostSupervisor` of the mod-host connection (``None`` if ``test == True``)
+        """
+
+    def _initialize(self, address, port, test=False):
+        mod_host = DeviceModHost(address, port)
         if test:
             mod_host.host = MagicMock()
         else:
@@ -108,6 +152,17 @@ class Application(object):
         self.log('Data - Loads {}', os.path.abspath(str_path))
         return path
 
+    def _load_banks(self, lazy, snapshot):
+        banks_dao = self.dao(BanksDao)
+
+        current_bank = None
+        if lazy:
+            current = self.dao(CurrentDao).load()
+            current_bank = None if current.empty else current.bank
+
+        manager = banks_dao.load(DeviceController.sys_effect, lazy=lazy, current_bank=current_bank, snapshot=snapshot)
+        return manager, banks_dao.autosaver
+
     def _load_controllers(self):
         controllers = {}
 
@@ -124,9 +179,55 @@ class Application(object):
         return controllers
 
     def _configure_controllers(self, controllers):
-        for controller in list(controllers.values()):
+        """
+        Configures each controller after its :attr:`.Controller.dependencies`.
+        The independent controllers are configured concurrently, so the
+        configuration time is the time of the slowest dependencies chain
+        """
+        configured = {}
+
+        with ThreadPoolExecutor(max_workers=len(controllers)) as executor:
+            for controller in self._controllers_by_dependencies(controllers):
+                dependencies = [configured[dependency.__name__] for dependency in controller.dependencies]
+                configured[controller.__class__.__name__] = executor.submit(
+                    self._configure_controller, controller, dependencies
+                )
+
+        for future in configured.values():
+            future.result()
+
+    def _controllers_by_dependencies(self, controllers):
+        ordered = []
+        visiting = []
+
+        def visit(controller):
+            if controller in ordered:
+                return
+            if controller in visiting:
+                raise ValueError('Cyclic controllers dependencies: {}'.format(
+                    [element.__class__.__name__ for element in visiting + [controller]]
+                ))
+
+            visiting.append(controller)
+            for dependency in controller.dependencies:
+                visit(controllers[dependency.__name__])
+            visiting.remove(controller)
+
+            ordered.append(controller)
+
+        for controller in controllers.values():
+            visit(controller)
+
+        return ordered
+
+    def _configure_controller(self, controller, dependencies):
+        for dependency in dependencies:
+            # Raises the dependency configuration error
+            dependency.result()
+
+        with self.startup_profiler.phase(controller.__class__.__name__, group='controller'):
             controller.configure()
-            self.log('Load controller - {}', controller.__class__.__name__)
+        self.log('Load controller - {}', controller.__class__.__name__)
 
     def register(self, component):
         """
@@ -137,15 +238,24 @@ class Application(object):
         """
         self.components.append(component)
 
-    def register_observer(self, observer):
+    def register_observer(self, observer, **kwargs):
         """
         Register a :class:`.ApplicationObserver` specialization into Application.
         The observer will receive calls when changes occurs in system, like
         banks creation, current pedalboard changes.
 
+        A slow observer can receive the notifications asynchronously, in a dedicated
+        thread with a bounded queue (see :class:`.AsynchronousDispatcher`)::
+
+            >>> application.register_observer(observer, asynchronous=True, back_pressure=BackPressure.COALESCE)
+            >>> application.components_observer.dispatcher(observer).lag
+            0.0003
+
         :param ApplicationObserver observer: The observer who will receive the changes notifications
+        :param kwargs: Dispatch options: ``asynchronous``, ``max_size``, ``back_pressure`` and ``events``
+                       (see :meth:`.ComponentsObserver.register`)
         """
-        self.components_observer.register(observer)
+        self.components_observer.register(observer, **kwargs)
 
     def unregister_observer(self, observer):
         """
@@ -167,10 +277,18 @@ class Application(object):
         else:
             self.log('Load current pedalboard - "{}"', current_pedalboard.name)
 
-        self.mod_host.pedalboard = current_pedalboard
+        profiler = self.startup_profiler
+        with profiler.phase('current pedalboard load'):
+            self.mod_host.pedalboard = current_pedalboard
+        with profiler.phase('neighbours pedalboards preload'):
+            self.controller(CurrentController).preload_neighbours()
+
+        if self.mod_host_supervisor is not None:
+            self.mod_host_supervisor.start()
 
         for component in self.components:
-            component.init()
+            with profiler.phase(component.__class__.__name__, group='component'):
+                component.init()
             self.log('Load component - {}', component.__class__.__name__)
 
         self.log('Components loaded')
@@ -184,12 +302,28 @@ class Application(object):
             component.close()
             self.log('Stopping component - {}', component.__class__.__name__)
 
+        self.components_observer.close()
+
+        if self.mod_host_supervisor is not None:
+            self.mod_host_supervisor.stop()
+
         for controller in self.controllers.values():
             controller.close()
             self.log('Stopping controller - {}', controller.__class__.__name__)
 
+        self.autosaver.flush()
+        if self.data_store is not None:
+            self.data_store.close()
+
         atexit.unregister(self.stop)
 
+    def _restore_mod_host(self):
+        current_controller = self.controller(CurrentController)
+
+        self.log('Mod-host - Restore current pedalboard')
+        self.mod_host.restore(current_controller.pedalboard)
+        current_controller.preload_neighbours()
+
     def controller(self, controller):
         """
         Returns the controller instance by Controller class identifier
@@ -201,11 +335,26 @@ class Application(object):
 
     def dao(self, dao):
         """
-        Returns a Dao persister instance by Dao class identifier
+        Returns a Dao persister instance by Dao class identifier.
+
+        Each Dao is created only once and shared by the controllers and components,
+        so its in memory data (as the :class:`.CachedPersistence` and the pending writes)
+        is kept between the calls
 
         :param dao: Class identifier
         :return: Dao instance
         """
+        with self._daos_lock:
+            instance = self._daos.get(dao)
+            if instance is None:
+                instance = self._daos[dao] = self._create_dao(dao)
+
+        return instance
+
+    def _create_dao(self, dao):
+        if self.data_store is not None:
+            return dao(self.path_data, store=self.data_store)
+
         return dao(self.path_data)
 
     def log(self, message, *args, **kwargs):
@@ -0,0 +1,198 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+from application.component.application_observer import ApplicationObserver
+
+
+class BackPressure(Enum):
+    """
+    Informs what :class:`.AsynchronousDispatcher` does when a notification
+    arrives and the observer queue is full
+    """
+    DROP_OLDEST = 'drop-oldest'
+    """
+    Discards the oldest pending notification
+    """
+    COALESCE = 'coalesce'
+    """
+    Replaces a pending notification of the same change (same method and same object).
+    If there isn't, discards the oldest pending notification.
+    The notifications are always coalesced, even if the queue isn't full
+    """
+    BLOCK = 'block'
+    """
+    Blocks who caused the change until the observer processes a notification
+    """
+
+
+class AsynchronousDispatcher(ApplicationObserver):
+    """
+    Delivers the notifications to an observer in a dedicated thread,
+    so a slow observer doesn't delay who caused the change (as a footswitch
+    handler or the mod-host update).
+
+    The pending notifications are kept in a bounded queue. When it is full,
+    the ``back_pressure`` policy is applied.
+
+    .. note::
+
+        The notified objects are the model objects, so when the notification
+        is processed, they may have been changed again.
+
+    :param ApplicationObserver observer: Observer that will receive the notifications
+    :param int max_size: Maximum of pending notifications
+    :param BackPressure back_pressure: Policy when the queue is full
+    """
+
+    def __init__(self, observer, max_size=64, back_pressure=BackPressure.DROP_OLDEST):
+        super(AsynchronousDispatcher, self).__init__()
+        self.observer = observer
+        self.max_size = max_size
+        self.back_pressure = back_pressure
+
+        self.delivered = 0
+        """Total of notifications delivered"""
+        self.dropped = 0
+        """Total of notifications discarded because the queue was full"""
+        self.coalesced = 0
+        """Total of notifications replaced by a more recent of the same change"""
+        self.lag = 0
+        """Time (in seconds) that the last delivered notification waited in queue"""
+        self.max_lag = 0
+        """Greatest :attr:`lag` observed"""
+
+        self._queue = deque()
+        self._pending_by_key = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name='AsynchronousDispatcher-{}'.format(observer.__class__.__name__),
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self):
+        """
+        :return int: Total of notifications waiting delivery
+        """
+        return len(self._queue)
+
+    def close(self, timeout=1):
+        """
+        Delivers the pending notifications and stops the dispatcher thread
+
+        :param float timeout: Maximum time (in seconds) waiting the pending notifications delivery
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join(timeout)
+
+    ####################################
+    # Queue
+    ####################################
+    def _put(self, method, *args, **kwargs):
+        key = self._key(method, args, kwargs)
+
+        with self._condition:
+            if self._closed:
+                return
+
+            if self.back_pressure == BackPressure.COALESCE and key in self._pending_by_key:
+                entry = self._pending_by_key[key]
+                entry[1], entry[2] = args, kwargs
+                self.coalesced += 1
+                return
+
+            while len(self._queue) >= self.max_size:
+                if self.back_pressure == BackPressure.BLOCK:
+                    self._condition.wait()
+                else:
+                    self._forget(self._queue.popleft())
+                    self.dropped += 1
+
+            entry = [method, args, kwargs, time.monotonic(), key]
+            self._queue.append(entry)
+            self._pending_by_key[key] = entry
+            self._condition.notify_all()
+
+    @staticmethod
+    def _key(method, args, kwargs):
+        """
+        Identifies the change: the method, the object changed and the update type
+        """
+        return method, id(args[0]), kwargs.get('update_type', args[1] if len(args) > 1 else None)
+
+    def _forget(self, entry):
+        if self._pending_by_key.get(entry[4]) is entry:
+            del self._pending_by_key[entry[4]]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+
+                if not self._queue:
+                    return
+
+                entry = self._queue.popleft()
+                self._forget(entry)
+                self._condition.notify_all()
+
+            method, args, kwargs, enqueued, key = entry
+
+            self.lag = time.monotonic() - enqueued
+            self.max_lag = max(self.max_lag, self.lag)
+
+            try:
+                getattr(self.observer, method)(*args, **kwargs)
+            except Exception:
+                logging.exception('Observer {} - Error processing {}'.format(self.observer, method))
+
+            self.delivered += 1
+
+    ####################################
+    # Observer
+    ####################################
+    def on_current_pedalboard_changed(self, pedalboard, **kwargs):
+        self._put('on_current_pedalboard_changed', pedalboard, **kwargs)
+
+    def on_bank_updated(self, bank, update_type, index, origin, **kwargs):
+        self._put('on_bank_updated', bank, update_type, index=index, origin=origin, **kwargs)
+
+    def on_pedalboard_updated(self, pedalboard, update_type, index, origin, **kwargs):
+        self._put('on_pedalboard_updated', pedalboard, update_type, index=index, origin=origin, **kwargs)
+
+    def on_effect_updated(self, effect, update_type, index, origin, **kwargs):
+        self._put('on_effect_updated', effect, update_type, index=index, origin=origin, **kwargs)
+
+    def on_effect_status_toggled(self, effect, **kwargs):
+        self._put('on_effect_status_toggled', effect, **kwargs)
+
+    def on_param_value_changed(self, param, **kwargs):
+        self._put('on_param_value_changed', param, **kwargs)
+
+    def on_connection_updated(self, connection, update_type, pedalboard, **kwargs):
+        self._put('on_connection_updated', connection, update_type, pedalboard=pedalboard, **kwargs)
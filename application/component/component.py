@@ -38,13 +38,14 @@ class Component(metaclass=ABCMeta):
     def controller(self, controller):
         return self.application.controller(controller)
 
-    def register_observer(self, observer):
+    def register_observer(self, observer, **kwargs):
         """
         Calls :meth:`.Application.register_observer`.
 
         :param ApplicationObserver observer: The observer who will receive the changes notifications
+        :param kwargs: Dispatch options (see :meth:`.Application.register_observer`)
         """
-        self.application.register_observer(observer)
+        self.application.register_observer(observer, **kwargs)
 
     def unregister_observer(self, observer):
         """
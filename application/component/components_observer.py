@@ -12,59 +12,242 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+from collections import OrderedDict
+
 from application.component.application_observer import ApplicationObserver
+from application.component.asynchronous_dispatcher import AsynchronousDispatcher, BackPressure
 
 
 class ComponentsObserver(ApplicationObserver):
+    """
+    Notifies the registered observers (usually the components) about the changes.
+
+    An expression pedal or a knob changes a param value many times per second.
+    With ``param_window > 0``, the first change is notified immediately and the
+    following changes of the same param, during the window, are coalesced:
+    only the latest is notified at the end of the window::
+
+        >>> components_observer.param_window = 0.01  # 10 ms
+
+    The other notifications (as :meth:`on_current_pedalboard_changed` and the structural
+    changes) are always notified immediately, after the pending param changes, keeping
+    the order of the changes.
+
+    .. note::
+
+        The param changes notified at the end of a window are delivered in a ``threading.Timer``
+        thread, not in the thread that changed the param. The deliveries (of any thread) are
+        serialized by a lock, so an observer is never called concurrently.
+
+    An observer can inform the events it cares about, so it is notified only about them::
+
+        >>> components_observer.register(display, events=['on_current_pedalboard_changed', 'on_param_value_changed'])
+
+    :param BanksManager manager: Manager whose changes will be notified
+    :param float param_window: Coalescing window (in seconds) of the param changes.
+                               ``0`` disables the coalescing
+    """
+
+    events = (
+        'on_current_pedalboard_changed',
+        'on_bank_updated',
+        'on_pedalboard_updated',
+        'on_effect_updated',
+        'on_effect_status_toggled',
+        'on_param_value_changed',
+        'on_connection_updated',
+    )
+    """
+    Events that an observer can be notified
+    """
 
-    def __init__(self, manager):
+    def __init__(self, manager, param_window=0):
         super(ComponentsObserver, self).__init__()
         self.observers = []
+        self._targets = []
+        self._events = []
         self._manager = manager
 
-    def register(self, observer):
+        self._routes = {}
+        self._update_routes()
+
+        self.param_window = param_window
+        self.params_coalesced = 0
+        """Total of param changes not notified because a more recent change of the same param was notified"""
+
+        self._pending_params = OrderedDict()
+        self._param_timer = None
+        self._delivery_lock = threading.RLock()
+
+    def register(self, observer, asynchronous=False, max_size=64, back_pressure=BackPressure.DROP_OLDEST, events=None):
+        """
+        Register an observer. If ``asynchronous``, the notifications will be delivered
+        by an :class:`.AsynchronousDispatcher`; otherwise, they will be delivered
+        in the thread that caused the change.
+
+        :param ApplicationObserver observer: The observer who will receive the changes notifications
+        :param bool asynchronous: Deliver the notifications in a dedicated thread
+        :param int max_size: Maximum of pending notifications (only for asynchronous)
+        :param BackPressure back_pressure: Policy when the pending notifications queue is full
+                                           (only for asynchronous)
+        :param list[string] events: Names of the :attr:`events` that the observer will be notified.
+                                    ``None`` for all events
+        """
+        events = self.events if events is None else tuple(events)
+        for event in events:
+            if event not in self.events:
+                raise ValueError("Event '{}' doesn't exists. Available events: {}".format(event, self.events))
+
+        target = observer
+        if asynchronous:
+            target = AsynchronousDispatcher(observer, max_size, back_pressure)
+
         self.observers.append(observer)
+        self._targets.append(target)
+        self._events.append(events)
         observer.manager = self.manager
 
+        self._update_routes()
+
     def unregister(self, observer):
         observer.manager = None
-        self.observers.remove(observer)
+
+        index = self.observers.index(observer)
+        target = self._targets[index]
+
+        del self.observers[index]
+        del self._targets[index]
+        del self._events[index]
+
+        self._update_routes()
+
+        if target is not observer:
+            target.close()
+
+    def _update_routes(self):
+        """
+        Indexes the observers by event. The routes are immutable, so an observer can
+        be (un)registered during a notification
+        """
+        self._routes = {
+            event: tuple(
+                (observer, target)
+                for observer, target, events in zip(self.observers, self._targets, self._events)
+                if event in events
+            )
+            for event in self.events
+        }
+
+    def dispatcher(self, observer):
+        """
+        :param ApplicationObserver observer: Registered observer
+        :return AsynchronousDispatcher: Dispatcher of the observer (with the lag metrics)
+                                        or ``None`` if it was not registered as asynchronous
+        """
+        target = self._targets[self.observers.index(observer)]
+        return target if target is not observer else None
+
+    def close(self):
+        """
+        Delivers the pending notifications (coalesced params changes and asynchronous observers)
+        and stops their dispatchers
+        """
+        with self._delivery_lock:
+            if self._param_timer is not None:
+                self._param_timer.cancel()
+                self._param_timer = None
+
+            self._flush_params()
+
+        for observer, target in zip(self.observers, self._targets):
+            if target is not observer:
+                target.close()
 
     @property
     def scope(self):
         return self._manager.observer_manager.scope
 
     def on_bank_updated(self, bank, update_type, index, origin, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_bank_updated(bank, update_type, index=index, origin=origin, **kwargs)
+        self._notify('on_bank_updated', bank, update_type, index=index, origin=origin, **kwargs)
 
     def on_pedalboard_updated(self, pedalboard, update_type, index, origin, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_pedalboard_updated(pedalboard, update_type, index=index, origin=origin, **kwargs)
+        self._notify('on_pedalboard_updated', pedalboard, update_type, index=index, origin=origin, **kwargs)
 
     def on_effect_updated(self, effect, update_type, index, origin, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_effect_updated(effect, update_type, index=index, origin=origin, **kwargs)
+        self._notify('on_effect_updated', effect, update_type, index=index, origin=origin, **kwargs)
 
     def on_effect_status_toggled(self, effect, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_effect_status_toggled(effect, **kwargs)
+        self._notify('on_effect_status_toggled', effect, **kwargs)
 
     def on_param_value_changed(self, param, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_param_value_changed(param, **kwargs)
+        if not self._routes['on_param_value_changed']:
+            return
+
+        scope = self.scope
+        if not self.param_window:
+            self._notify_param(param, scope, kwargs)
+            return
+
+        with self._delivery_lock:
+            if self._param_timer is None:
+                self._notify_param(param, scope, kwargs)
+                self._start_param_window()
+                return
+
+            key = (id(param), id(scope))
+            if key in self._pending_params:
+                self.params_coalesced += 1
+
+            self._pending_params[key] = (param, scope, kwargs)
 
     def on_connection_updated(self, connection, update_type, pedalboard, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_connection_updated(connection, update_type, pedalboard=pedalboard, **kwargs)
+        self._notify('on_connection_updated', connection, update_type, pedalboard=pedalboard, **kwargs)
 
     def on_current_pedalboard_changed(self, pedalboard, **kwargs):
-        for observer in self.observers:
-            if observer != self.scope:
-                observer.on_current_pedalboard_changed(pedalboard, **kwargs)
+        self._notify('on_current_pedalboard_changed', pedalboard, **kwargs)
+
+    def _notify(self, event, *args, **kwargs):
+        """
+        Notifies the event after the pending param changes
+        """
+        with self._delivery_lock:
+            self._flush_params()
+
+            scope = self.scope
+            for observer, target in self._routes[event]:
+                if observer != scope:
+                    getattr(target, event)(*args, **kwargs)
+
+    ####################################
+    # Param changes coalescing
+    ####################################
+    def _notify_param(self, param, scope, kwargs):
+        for observer, target in self._routes['on_param_value_changed']:
+            if observer != scope:
+                target.on_param_value_changed(param, **kwargs)
+
+    def _start_param_window(self):
+        self._param_timer = threading.Timer(self.param_window, self._close_param_window)
+        self._param_timer.daemon = True
+        self._param_timer.start()
+
+    def _close_param_window(self):
+        with self._delivery_lock:
+            self._param_timer = None
+
+            # A sweep is still running: the next changes are coalesced too
+            if self._pending_params:
+                self._flush_params()
+                self._start_param_window()
+
+    def _flush_params(self):
+        with self._delivery_lock:
+            if not self._pending_params:
+                return
+
+            pending = list(self._pending_params.values())
+            self._pending_params.clear()
+
+            for param, scope, kwargs in pending:
+                self._notify_param(param, scope, kwargs)
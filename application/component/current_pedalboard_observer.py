@@ -20,6 +20,10 @@ class CurrentPedalboardObserver(ApplicationObserver):
     """
     This viewer allows change the current pedalboard
     if it is updated or removed or if your bank is updated or removed.
+
+    It also invalidates the :attr:`.CurrentController.pedalboards_index`
+    when a bank or pedalboard is added, updated or removed, and identifies
+    the added pedalboards with an uuid (see :meth:`.CurrentController.assign_uuids`).
     """
 
     def __init__(self, current_controller):
@@ -30,6 +34,10 @@ class CurrentPedalboardObserver(ApplicationObserver):
         self._current_controller = current_controller
 
     def on_bank_updated(self, bank, update_type, index, origin, **kwargs):
+        self._current_controller.pedalboards_index.invalidate()
+        if update_type != UpdateType.DELETED:
+            self._current_controller.assign_uuids(bank)
+
         if update_type == UpdateType.UPDATED:
             old_bank = kwargs['old']
             if old_bank == self._current_controller.bank:
@@ -43,6 +51,10 @@ class CurrentPedalboardObserver(ApplicationObserver):
                 self._current_controller.set_bank(new_current_bank)
 
     def on_pedalboard_updated(self, pedalboard, update_type, index, origin, **kwargs):
+        self._current_controller.pedalboards_index.invalidate()
+        if update_type != UpdateType.DELETED:
+            self._current_controller.assign_uuids(origin)
+
         if update_type == UpdateType.UPDATED:
             old_pedalboard = kwargs['old']
 
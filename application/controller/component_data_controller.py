@@ -12,11 +12,106 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections.abc import Mapping, Sequence
+from copy import deepcopy
+
 from application.dao.component_dao import ComponentDao
 
 from application.controller.controller import Controller
 
 
+def freeze(value):
+    """
+    Returns a read only view of ``value`` if it is a ``dict`` or a ``list``
+    """
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, list):
+        return FrozenList(value)
+
+    return value
+
+
+class FrozenDict(Mapping):
+    """
+    Read only view of a ``dict``. The nested ``dict`` and ``list`` are frozen
+    lazily, when they are accessed.
+
+    :param dict data: Data that will be viewed. It should not be changed
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._frozen = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._frozen[key]
+        except KeyError:
+            value = self._frozen[key] = freeze(self._data[key])
+            return value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        return self._data == (other._data if isinstance(other, (FrozenDict, FrozenList)) else other)
+
+    def __repr__(self):
+        return 'FrozenDict({!r})'.format(self._data)
+
+    def copy(self):
+        """
+        :return dict: A mutable deep copy
+        """
+        return deepcopy(self._data)
+
+
+class FrozenList(Sequence):
+    """
+    Read only view of a ``list``. See :class:`.FrozenDict`
+
+    :param list data: Data that will be viewed. It should not be changed
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._frozen = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self._data[index])
+
+        # The list raises the IndexError of the invalid indexes
+        value = self._data[index]
+        if index < 0:
+            index += len(self._data)
+
+        try:
+            return self._frozen[index]
+        except KeyError:
+            frozen = self._frozen[index] = freeze(value)
+            return frozen
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        return self._data == (other._data if isinstance(other, (FrozenDict, FrozenList)) else other)
+
+    def __repr__(self):
+        return 'FrozenList({!r})'.format(self._data)
+
+    def copy(self):
+        """
+        :return list: A mutable deep copy
+        """
+        return deepcopy(self._data)
+
+
 class ComponentDataController(Controller):
     """
     Maybe the pedalboard data it's not sufficient for management in a custom
@@ -65,14 +160,32 @@ class ComponentDataController(Controller):
 
     .. warning::
         It's a easy way for save simple data. Please, don't save binaries or big content
+
+    For frequent reads, prefer :meth:`view`: it returns a cached read only view
+    and not allocates a copy for each read. Use :meth:`update` to change it::
+
+        >>> view = controller.view(key)
+        >>> view['pedalboards']
+        FrozenList([])
+        >>> controller.update(key, lambda data: dict(data, pedalboards=[0, 1]))
+        >>> controller.view(key)['pedalboards']
+        FrozenList([0, 1])
+
+    .. note::
+        Each change rewrites the data of all components. For persists only the changed
+        key, enable the :class:`.ComponentDao` journal::
+
+            >>> controller.dao.journal = True
     """
 
     dao = None
     __data = None
+    __views = None
 
     def configure(self):
         self.dao = self.app.dao(ComponentDao)
         self.__data = self.dao.load()
+        self.__views = {}
 
     def __getitem__(self, key):
         """
@@ -86,14 +199,51 @@ class ComponentDataController(Controller):
             >>> component_data_controller['a crazy key']
             {}
 
+        The content is a deep copy: its changes (including in nested values) don't change
+        the persisted data. For frequent reads, prefer :meth:`view`.
+
         :param string key:
         :return dict: Content if exist for key informed, else empty `dict`
         """
         try:
-            return dict(self.__data[key])
+            return deepcopy(self.__data[key])
         except KeyError:
             return {}
 
+    def view(self, key):
+        """
+        Returns a read only view of the data for the informed `key`::
+
+            >>> view = component_data_controller.view(key)
+            >>> view
+            FrozenDict({'any key': 'any data'})
+            >>> view['any key'] = 'other data'
+            TypeError: 'FrozenDict' object does not support item assignment
+
+        The view is cached until the `key` content changes, so consecutive
+        reads not allocate new objects.
+
+        :param string key:
+        :return FrozenDict: Content if exist for key informed, else empty :class:`.FrozenDict`
+        """
+        try:
+            return self.__views[key]
+        except KeyError:
+            view = self.__views[key] = FrozenDict(self.__data.get(key, {}))
+            return view
+
+    def update(self, key, function):
+        """
+        Change the `key` identifier content to the value returned by ``function``.
+        ``function`` receives a mutable copy of the current content::
+
+            >>> component_data_controller.update(key, lambda data: dict(data, count=data.get('count', 0) + 1))
+
+        :param string key: Identifier
+        :param function: Function that receives the current content and returns the new content
+        """
+        self[key] = function(self.view(key).copy())
+
     def __setitem__(self, key, value):
         """
         Change the `key` identifier content to `value`::
@@ -103,9 +253,10 @@ class ComponentDataController(Controller):
         :param string key: Identifier
         :param value: Data will be persisted
         """
-        self.__data[key] = value
+        self.__data[key] = value.copy() if isinstance(value, FrozenDict) else deepcopy(value)
+        self.__views.pop(key, None)
 
-        self.dao.save(self.__data)
+        self.dao.save_key(self.__data, key)
 
     def __delitem__(self, key):
         """
@@ -116,5 +267,9 @@ class ComponentDataController(Controller):
         :param string key: Identifier
         """
         del self.__data[key]
+        self.__views.pop(key, None)
+
+        self.dao.delete_key(self.__data, key)
 
-        self.dao.save(self.__data)
+    def close(self):
+        self.dao.close()
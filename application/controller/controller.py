@@ -23,8 +23,21 @@ class Controller(metaclass=ABCMeta):
     the extended class in :class:`Application` (in private ``_load_controllers``
     method)
 
+    The controllers are configured concurrently. If a controller needs that
+    other controllers have been configured before it, informs them in
+    :attr:`dependencies`::
+
+        >>> class CurrentController(Controller):
+        ...     dependencies = (DeviceController, )
+
     :param Application application: :class:`Application` instance
     """
+
+    dependencies = ()
+    """
+    Controllers classes that must be configured before this controller
+    """
+
     def __init__(self, application):
         self.app = application
 
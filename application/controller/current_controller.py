@@ -14,6 +14,8 @@
 
 from application.controller.controller import Controller
 from application.controller.device_controller import DeviceController
+from application.controller.pedalboards_index import PedalboardsIndex
+from application.dao.banks_dao import BanksDao
 from application.dao.current_dao import CurrentDao
 
 
@@ -24,25 +26,55 @@ class CurrentPedalboardError(Exception):
 class CurrentController(Controller):
     """
     Manage the current current :class:`.Pedalboard` and your bank
+
+    For a fast pedalboard change, the neighbours pedalboards of the current
+    pedalboard (in the current bank) can be preloaded in standby on mod-host.
+    ``preload_size`` informs how many neighbours on each side are preloaded::
+
+        >>> device_controller.mod_host.max_standby_pedalboards = 4
+        >>> current_controller.preload_size = 1  # Preloads the next and the before pedalboards
+        >>> current_controller.to_next_pedalboard()  # Only swaps connections and bypass states
+
+    See :class:`.DeviceModHost` for the standby limits.
+
+    For change the current pedalboard by its uuid or names without walk the banks
+    (see :class:`.PedalboardsIndex`) or by a MIDI program change, uses :meth:`set_pedalboard_by`::
+
+        >>> current_controller.set_pedalboard_by(bank_name='Rock', name='Solo')
+        >>> current_controller.set_pedalboard_by(program=3)          # Of the current bank
+        >>> current_controller.set_pedalboard_by(program=3, bank=1)  # After a MIDI bank select
     """
 
+    dependencies = (DeviceController, )
+
     def __init__(self, application):
         super(CurrentController, self).__init__(application)
         self._dao = None
         self._pedalboard = None
 
+        self.preload_size = 0
+
         self._device_controller = None
 
         self._manager = None
 
+        self.pedalboards_index = None
+        """
+        :class:`.PedalboardsIndex` of the banks manager pedalboards
+        """
+
     def configure(self):
         self._device_controller = self.app.controller(DeviceController)
 
         self._dao = self.app.dao(CurrentDao)
         self._manager = self.app.manager
+        self.pedalboards_index = PedalboardsIndex(self._manager)
 
         self._pedalboard = self._load_current_pedalboard()
 
+    def close(self):
+        self._dao.flush()
+
     # ************************
     # Property
     # ************************
@@ -94,6 +126,83 @@ class CurrentController(Controller):
         if notify:
             self.app.components_observer.on_current_pedalboard_changed(self.pedalboard)
 
+        self.preload_neighbours()
+
+    def pedalboard_by(self, uuid=None, bank_name=None, name=None, program=None, bank=None):
+        """
+        Finds a pedalboard by only one identification: ``uuid``, ``bank_name`` and ``name``
+        (searched in the :attr:`pedalboards_index`) or ``program``.
+
+        As a MIDI program change, ``program`` is the pedalboard index in a bank: the bank
+        selected by ``bank`` (MIDI bank select: index of the bank in the banks manager)
+        or, if ``bank`` is ``None``, the current bank.
+
+        :param string uuid: Pedalboard uuid (``pedalboard.data['uuid']``)
+        :param string bank_name: Name of the pedalboard bank
+        :param string name: Pedalboard name
+        :param int program: MIDI program number (index of the pedalboard in the bank)
+        :param int bank: MIDI bank select number (index of the bank) of the ``program``
+        :return Pedalboard: Pedalboard found or ``None``
+        """
+        if uuid is not None:
+            return self.pedalboards_index.by_uuid(uuid)
+        if name is not None:
+            return self.pedalboards_index.by_name(bank_name, name)
+        if program is not None:
+            return self._pedalboard_by_program(program, bank)
+
+        raise ValueError('Informs the pedalboard uuid, bank_name and name or program')
+
+    def _pedalboard_by_program(self, program, bank_index):
+        if bank_index is None:
+            bank = self.bank
+        elif 0 <= bank_index < len(self._manager.banks):
+            bank = self._manager.banks[bank_index]
+        else:
+            bank = None
+
+        if bank is None or not 0 <= program < len(bank.pedalboards):
+            return None
+
+        return bank.pedalboards[program]
+
+    def set_pedalboard_by(self, uuid=None, bank_name=None, name=None, program=None, bank=None, notify=True):
+        """
+        Set the current :class:`.Pedalboard` for the pedalboard found by :meth:`pedalboard_by`.
+        If the pedalboard isn't found, a :class:`.CurrentPedalboardError` is raised
+
+        :param string uuid: Pedalboard uuid (``pedalboard.data['uuid']``)
+        :param string bank_name: Name of the pedalboard bank
+        :param string name: Pedalboard name
+        :param int program: MIDI program number (index of the pedalboard in the bank)
+        :param int bank: MIDI bank select number (index of the bank) of the ``program``
+        :param bool notify: If false, not notify change for :class:`.UpdatesObserver`
+                            instances registered in :class:`.Application`
+        """
+        pedalboard = self.pedalboard_by(uuid=uuid, bank_name=bank_name, name=name, program=program, bank=bank)
+        if pedalboard is None:
+            raise CurrentPedalboardError(
+                'Pedalboard not found (uuid={}, bank_name={}, name={}, program={}, bank={})'.format(
+                    uuid, bank_name, name, program, bank
+                )
+            )
+
+        self.set_pedalboard(pedalboard, notify=notify)
+
+    def assign_uuids(self, bank):
+        """
+        Identifies the bank pedalboards without uuid (see :meth:`.BanksDao.assign_uuids`)
+        and saves the bank, if any uuid was assigned
+
+        :param Bank bank: Bank whose pedalboards will be identified
+        """
+        if not BanksDao.assign_uuids(bank):
+            return
+
+        autosaver = self.app.autosaver
+        if autosaver.auto_save:
+            autosaver.banks_files.save_bank(bank)
+
     @property
     def bank(self):
         """
@@ -124,6 +233,38 @@ class CurrentController(Controller):
 
             self._dao.save(bank_index, pedalboard_index)
 
+    # ************************
+    # Preload
+    # ************************
+    def preload_neighbours(self):
+        """
+        Preloads in standby the ``preload_size`` neighbours of the current pedalboard.
+
+        It's called when the current pedalboard changes.
+        """
+        if not self.preload_size or self.pedalboard is None:
+            return
+
+        self._device_controller.preload(self._neighbours_pedalboards())
+
+    def _neighbours_pedalboards(self):
+        """
+        :return list[Pedalboard]: Neighbours pedalboards of the current pedalboard,
+                                  ordered by the distance
+        """
+        pedalboards = self.bank.pedalboards
+        index = self.pedalboard.index
+
+        neighbours = []
+        for distance in range(1, self.preload_size + 1):
+            for neighbour_index in (index + distance, index - distance):
+                pedalboard = pedalboards[neighbour_index % len(pedalboards)]
+
+                if pedalboard != self.pedalboard and pedalboard not in neighbours:
+                    neighbours.append(pedalboard)
+
+        return neighbours
+
     # ************************
     # Set Current Pedalboard/Bank
     # ************************
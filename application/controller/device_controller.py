@@ -42,3 +42,43 @@ class DeviceController(Controller):
     @pedalboard.setter
     def pedalboard(self, pedalboard):
         self.mod_host.pedalboard = pedalboard
+
+    @property
+    def last_transition(self):
+        """
+        :class:`.PedalboardTransition` of the last pedalboard change. Useful for measure
+        the mod-host operations saved::
+
+            >>> transition = device_controller.last_transition
+            >>> transition.rebuild_operations - transition.operations
+            18
+
+        :return: ``None`` if the last change didn't use a transition
+        """
+        return self.mod_host.last_transition
+
+    @property
+    def feedback(self):
+        """
+        Reader of the mod-host feedback port. The params changed by MIDI controllers
+        or by the hardware are applied in the model as soon as they are received::
+
+            >>> device_controller.feedback.messages
+            128
+            >>> device_controller.feedback.mean_lag
+            0.00005
+
+        :return FeedbackReader: ``None`` if the feedback port is not enabled
+        """
+        return self.mod_host.feedback
+
+    def preload(self, pedalboards):
+        """
+        Loads the pedalboards in standby in mod-host, so that changing the
+        current pedalboard to one of them only swaps connections and bypass states.
+
+        See :class:`.DeviceModHost` for the standby limits.
+
+        :param list[Pedalboard] pedalboards: Pedalboards ordered by priority
+        """
+        self.mod_host.preload(pedalboards)
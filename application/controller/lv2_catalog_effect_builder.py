@@ -0,0 +1,95 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Mapping
+from weakref import WeakValueDictionary
+
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.model.lv2.lv2_plugin import Lv2Plugin
+
+
+class Lv2CatalogPlugins(Mapping):
+    """
+    Read only mapping (uri to :class:`.Lv2Plugin`) of the plugins of a :class:`.PluginsCatalog`.
+
+    The plugin metadata is read from the catalog when it is accessed. The loaded plugins are
+    shared while they are referenced (as by the effects and templates); so, only the metadata
+    of the used plugins is kept in memory.
+
+    :param PluginsCatalog catalog: Plugins catalog
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._loaded = WeakValueDictionary()
+
+    def __getitem__(self, uri):
+        plugin = self._loaded.get(uri)
+        if plugin is not None:
+            return plugin
+
+        data = self.catalog.get(uri)
+        if data is None:
+            raise KeyError(uri)
+
+        plugin = Lv2Plugin(data)
+        self._loaded[uri] = plugin
+
+        return plugin
+
+    def __contains__(self, uri):
+        return uri in self._loaded or self.catalog.contains(uri)
+
+    def __iter__(self):
+        return iter(self.catalog.uris())
+
+    def __len__(self):
+        return self.catalog.count()
+
+
+class Lv2CatalogEffectBuilder(Lv2EffectBuilder):
+    """
+    :class:`.Lv2EffectBuilder` that reads the plugins metadata from a :class:`.PluginsCatalog`
+    instead of keep all the plugins data in memory. :attr:`all` is a :class:`.Lv2CatalogPlugins`.
+
+    The plugins data file is only parsed by :meth:`reload`, that rebuilds the catalog::
+
+        >>> builder = Lv2CatalogEffectBuilder(catalog, plugins_json)
+        >>> if catalog.outdated(plugins_json):
+        ...     builder.reload(Persistence.read(plugins_json))
+        >>> reverb = builder.build('http://calf.sourceforge.net/plugins/Reverb')
+
+    :param PluginsCatalog catalog: Plugins catalog
+    :param Path plugins_json: Plugins json path file that the catalog represents
+    """
+
+    def __init__(self, catalog, plugins_json):
+        # The Lv2EffectBuilder constructor loads all the plugins data
+        self.catalog = catalog
+        self.plugins_json = plugins_json
+        self._plugins = Lv2CatalogPlugins(catalog)
+
+    def reload(self, metadata, ignore_unsupported_plugins=True):
+        """
+        Rebuilds the catalog with the metadata plugins
+
+        :param list metadata: lv2 audio plugins metadata
+        :param bool ignore_unsupported_plugins: Not allows instantiation of uninstalled or unrecognized audio plugins?
+        """
+        if ignore_unsupported_plugins:
+            supported_plugins = set(self._supported_plugins)
+            metadata = [plugin for plugin in metadata if plugin['uri'] in supported_plugins]
+
+        self.catalog.rebuild(metadata, self.plugins_json)
+        self._plugins = Lv2CatalogPlugins(self.catalog)
@@ -0,0 +1,162 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+
+from pluginsmanager.model.lv2.lv2_effect import Lv2Effect
+from pluginsmanager.model.lv2.lv2_input import Lv2Input
+from pluginsmanager.model.lv2.lv2_midi_input import Lv2MidiInput
+from pluginsmanager.model.lv2.lv2_midi_output import Lv2MidiOutput
+from pluginsmanager.model.lv2.lv2_output import Lv2Output
+from pluginsmanager.model.lv2.lv2_param import Lv2Param
+from pluginsmanager.util.dict_tuple import DictTuple
+
+
+class DetachedObserver(object):
+    """
+    Observer of the effects (and your params and ports) that aren't in a pedalboard.
+    It ignores all notifications.
+
+    When the effect is added in a pedalboard, the pedalboard replaces it.
+    """
+
+    def __getattr__(self, name):
+        return self._ignore
+
+    @staticmethod
+    def _ignore(*args, **kwargs):
+        pass
+
+
+class Lv2EffectTemplate(object):
+    """
+    Generates :class:`.Lv2Effect` instances of a lv2 plugin.
+
+    The plugin ports (control, audio and midi) are read from the metadata only once,
+    in the template creation. :meth:`build` only stamps out the effect, its params
+    and ports, equivalent to ``Lv2Effect(plugin)``::
+
+        >>> template = Lv2EffectTemplate(builder.all['http://calf.sourceforge.net/plugins/Reverb'])
+        >>> reverb = template.build()
+        >>> reverb.params[0].effect == reverb
+        True
+
+    The generated effects notifies a :class:`.DetachedObserver` until they are added in
+    a pedalboard.
+
+    .. note::
+
+        The effects, params and ports are built without their constructors, setting
+        the pluginsmanager private attributes. In the template creation, a stamped effect
+        is compared with an effect built by ``Lv2Effect(plugin)``: if the pluginsmanager
+        version sets other attributes, the template isn't :attr:`compatible` and
+        :meth:`build` uses the ``Lv2Effect`` constructor.
+
+    :param Lv2Plugin plugin: Plugin metadata
+    """
+
+    observer = DetachedObserver()
+
+    def __init__(self, plugin):
+        self.plugin = plugin
+
+        ports = plugin['ports']
+        self.params = self._schema(ports['control']['input'])
+        self.inputs = self._schema(ports['audio']['input'])
+        self.outputs = self._schema(ports['audio']['output'])
+        self.midi_inputs = self._schema(ports['midi']['input'])
+        self.midi_outputs = self._schema(ports['midi']['output'])
+
+        self.compatible = self._same_layout(Lv2Effect(plugin), self._stamp())
+        """
+        The stamped effects have the same attributes of the ``Lv2Effect`` constructor effects?
+        """
+
+    @staticmethod
+    def _schema(ports):
+        return tuple((port['symbol'], port) for port in ports)
+
+    def build(self):
+        """
+        :return Lv2Effect: New effect instance
+        """
+        if not self.compatible:
+            return Lv2Effect(self.plugin)
+
+        return self._stamp()
+
+    def _stamp(self):
+        effect = Lv2Effect.__new__(Lv2Effect)
+        effect.pedalboard = None
+        effect._active = True
+        effect._observer = self.observer
+        effect.plugin = self.plugin
+        effect.instance = None
+
+        effect._params = self._dict_tuple(self.params, lambda data: self._param(effect, data))
+        effect._inputs = self._dict_tuple(self.inputs, lambda data: self._port(Lv2Input, effect, data))
+        effect._outputs = self._dict_tuple(self.outputs, lambda data: self._port(Lv2Output, effect, data))
+        effect._midi_inputs = self._dict_tuple(self.midi_inputs, lambda data: self._port(Lv2MidiInput, effect, data))
+        effect._midi_outputs = self._dict_tuple(self.midi_outputs, lambda data: self._port(Lv2MidiOutput, effect, data))
+
+        return effect
+
+    @staticmethod
+    def _dict_tuple(schema, generate):
+        elements = tuple(generate(data) for symbol, data in schema)
+
+        dict_tuple = tuple.__new__(DictTuple, elements)
+        dict_tuple._dict = dict(zip((symbol for symbol, data in schema), elements))
+
+        return dict_tuple
+
+    def _param(self, effect, data):
+        param = Lv2Param.__new__(Lv2Param)
+        param._effect = effect
+        param._value = param._default = data['ranges']['default']
+        param._data = data
+        param.observer = self.observer
+
+        return param
+
+    def _port(self, port_class, effect, data):
+        port = port_class.__new__(port_class)
+        port._effect = effect
+        port._data = data
+        port.observer = self.observer
+
+        return port
+
+    @classmethod
+    def _same_layout(cls, built, stamped):
+        pairs = [(built, stamped)]
+        for group in ('_params', '_inputs', '_outputs', '_midi_inputs', '_midi_outputs'):
+            built_elements = getattr(built, group, None)
+            stamped_elements = getattr(stamped, group)
+            if built_elements is None or len(built_elements) != len(stamped_elements):
+                return False
+
+            pairs.append((built_elements, stamped_elements))
+            pairs.extend(zip(built_elements, stamped_elements))
+
+        return all(
+            type(built_element) is type(stamped_element)
+            and cls._attributes(built_element).keys() == cls._attributes(stamped_element).keys()
+            for built_element, stamped_element in pairs
+        )
+
+    @staticmethod
+    def _attributes(instance):
+        # The pluginsmanager models replaces __dict__ by its json representation
+        return next((referent for referent in gc.get_referents(instance) if isinstance(referent, dict)), {})
@@ -0,0 +1,145 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from application.dao.lazy_bank import LazyBank
+
+
+class PedalboardsIndex(object):
+    """
+    Finds the pedalboards of a :class:`.BanksManager` without walking all the banks::
+
+        >>> index = PedalboardsIndex(manager)
+        >>> index.by_name('Rock', 'Solo')
+        <Pedalboard object as Solo with 3 effects at 0x7fa3bcb49be0>
+        >>> index.by_uuid('6f1e3d0c6a2b4e8f9c1d2b3a4f5e6d7c')
+        <Pedalboard object as Solo with 3 effects at 0x7fa3bcb49be0>
+
+    The pedalboards are indexed by:
+
+     * uuid: ``pedalboard.data['uuid']``, assigned when the pedalboard is loaded or added
+       (see :meth:`.BanksDao.assign_uuids`) and persisted with the bank;
+     * bank name and pedalboard name. With repeated names, the first pedalboard is indexed.
+
+    The index is built in the first search after :meth:`invalidate`, called
+    when the banks or pedalboards are added, replaced or removed (see :class:`.CurrentPedalboardObserver`).
+    A search that doesn't find a pedalboard doesn't rebuild the index.
+
+    The names changes aren't notified by pluginsmanager: a search that finds an outdated pedalboard
+    (as a renamed pedalboard) rebuilds the index and tries again, but the new names are only found
+    after a rebuild. Who renames a bank or a pedalboard should call :meth:`invalidate`.
+
+    The not loaded :class:`.LazyBank` are indexed by their stubs data, without load them.
+
+    :param BanksManager manager: Banks manager whose pedalboards are indexed
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+
+        self.rebuilds = 0
+        """
+        int: Number of index builds
+        """
+
+        self._by_uuid = {}
+        self._by_name = {}
+        self._outdated = True
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        """
+        Informs that the banks or pedalboards changed. The index is rebuilt in the next search
+        """
+        self._outdated = True
+
+    def by_uuid(self, uuid):
+        """
+        :param string uuid: Pedalboard uuid (``pedalboard.data['uuid']``)
+        :return Pedalboard: Pedalboard found or ``None``
+        """
+        return self._find(self._by_uuid, uuid, lambda pedalboard: pedalboard.data.get('uuid') == uuid)
+
+    def by_name(self, bank_name, pedalboard_name):
+        """
+        :param string bank_name: Name of the pedalboard bank
+        :param string pedalboard_name: Pedalboard name
+        :return Pedalboard: Pedalboard found or ``None``
+        """
+        return self._find(
+            self._by_name,
+            (bank_name, pedalboard_name),
+            lambda pedalboard: pedalboard.name == pedalboard_name and pedalboard.bank.name == bank_name
+        )
+
+    def _find(self, index, key, valid):
+        with self._lock:
+            if self._outdated:
+                self._rebuild()
+
+            location = index.get(key)
+            if location is None:
+                return None
+
+            pedalboard = self._resolve(location)
+            if pedalboard is not None and valid(pedalboard):
+                return pedalboard
+
+            # Outdated by changes not notified (as a pedalboard renamed)
+            self._rebuild()
+
+            pedalboard = self._resolve(index.get(key))
+            return pedalboard if pedalboard is not None and valid(pedalboard) else None
+
+    def _resolve(self, location):
+        if location is None:
+            return None
+
+        bank, index = location
+        if bank.manager is not self.manager:
+            return None
+
+        try:
+            return bank.pedalboards[index]
+        except IndexError:
+            return None
+
+    def _rebuild(self):
+        self._by_uuid.clear()
+        self._by_name.clear()
+
+        for bank in self.manager.banks:
+            names, uuids = self._pedalboards_of(bank)
+
+            for index, (name, uuid) in enumerate(zip(names, uuids)):
+                location = (bank, index)
+
+                self._by_name.setdefault((bank.name, name), location)
+                if uuid is not None:
+                    self._by_uuid.setdefault(uuid, location)
+
+        self._outdated = False
+        self.rebuilds += 1
+
+    @staticmethod
+    def _pedalboards_of(bank):
+        if isinstance(bank, LazyBank) and not bank.loaded:
+            return bank.pedalboards_names, bank.pedalboards_uuids
+
+        pedalboards = bank.pedalboards
+        names = [pedalboard.name for pedalboard in pedalboards]
+        uuids = [pedalboard.data.get('uuid') for pedalboard in pedalboards]
+
+        return names, uuids
@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import os
+import threading
 from enum import Enum
 from pathlib import Path
 
 from application.controller.controller import Controller
+from application.controller.lv2_catalog_effect_builder import Lv2CatalogEffectBuilder
+from application.controller.lv2_effect_template import Lv2EffectTemplate
+from application.controller.plugins_search_index import PluginsSearchIndex
 from application.dao.plugins_dao import PluginsDao
 
 from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
@@ -38,37 +44,148 @@ class PluginTechnology(Enum):
 
 
 class PluginsController(Controller):
+    """
+    Manages the audio plugins metadata.
+
+    The lv2 plugins metadata is persisted with a fingerprint of the LV2 bundles
+    directories (:attr:`lv2_path` bundles paths and modification times).
+    :meth:`configure` loads the persisted metadata without wait a plugins scan.
+    If the fingerprint changed (plugins installed, updated or removed),
+    the plugins are scanned in a background thread and, when it finishes,
+    :attr:`lv2_builder` is replaced by a builder with the new metadata::
+
+        >>> plugins_controller.scanning
+        True
+        >>> plugins_controller.scan_thread.join()
+        >>> plugins_controller.lv2_builder  # Updated builder
+
+    The plugins metadata is kept in the :attr:`catalog` (:class:`.PluginsCatalog`), not in memory:
+    :attr:`lv2_builder` (:class:`.Lv2CatalogEffectBuilder`) reads each plugin of the catalog when
+    it is used. The plugins data file is only parsed when the catalog is rebuilt.
+    For list and search the plugins without load all plugins data, uses the catalog queries::
+
+        >>> plugins_controller.catalog.query(category='Reverb', offset=20, limit=20)
+
+    For search the plugins by the typed text (fuzzy and ranked), uses :meth:`search`::
+
+        >>> plugins_controller.search('scream')
+        [<Lv2Plugin object as GxScreamingBird at 0x7f4ff6d2a2e8>, ...]
+
+    The effects are generated by a :class:`.Lv2EffectTemplate` of each plugin
+    (see :meth:`lv2_effect`).
+    """
 
     def __init__(self, application):
         super(PluginsController, self).__init__(application)
         self.lv2_builder = None
+        self.catalog = None
+        """
+        :class:`.PluginsCatalog` of the lv2 plugins available in :attr:`lv2_builder`
+        """
+
+        self.lv2_path = self._default_lv2_path()
+        """
+        Directories where the LV2 bundles are installed
+        """
+        self.scan_thread = None
+        self._lv2_templates = {}
+
+        self.search_index = PluginsSearchIndex()
+        """
+        :class:`.PluginsSearchIndex` of the lv2 plugins available in :attr:`lv2_builder`
+        """
+        self._search_index_builder = None
+        self._search_index_lock = threading.Lock()
 
     def configure(self):
+        self.catalog = self._dao.catalog
         self.lv2_builder = self._configure_lv2_plugins_data()
+        self._lv2_templates = {}
+
+        if self._dao.load_fingerprint() != self.lv2_fingerprint():
+            self.scan_thread = threading.Thread(target=self._scan_lv2_plugins, name='Lv2PluginsScan', daemon=True)
+            self.scan_thread.start()
+
+    def close(self):
+        if self.catalog is not None:
+            self.catalog.close()
 
     @property
     def _dao(self):
         return self.app.dao(PluginsDao)
 
+    @staticmethod
+    def _default_lv2_path():
+        if 'LV2_PATH' in os.environ:
+            return os.environ['LV2_PATH'].split(os.pathsep)
+
+        return ['~/.lv2', '/usr/local/lib/lv2', '/usr/lib/lv2']
+
     def _configure_lv2_plugins_data(self):
         if not self._dao.exists_data:
-            try:
-                self.reload_lv2_plugins_data()
-                self.app.log("Lv2Plugins data - Loaded lv2 plugins data installed")
-            except:
-                self.app.log("Lv2Plugins data - It's not possible reload lv2 plugins data")
-                self.app.log("                  Please install lilv")
-                self.app.log("Lv2Plugins data - Using PluginsManager default lv2 plugins data")
-                print(self._dao.data_path, Lv2EffectBuilder.plugins_json_file)
-                self._dao.save(Persistence.read(Path(Lv2EffectBuilder.plugins_json_file)))
-
-        return Lv2EffectBuilder(plugins_json=self._dao.path)
+            self.app.log("Lv2Plugins data - Using PluginsManager default lv2 plugins data")
+            self._dao.save(Persistence.read(Path(Lv2EffectBuilder.plugins_json_file)))
+
+        builder = Lv2CatalogEffectBuilder(self.catalog, self._dao.path)
+        if self.catalog.outdated(self._dao.path):
+            builder.reload(self._dao.load())
+
+        return builder
+
+    @property
+    def scanning(self):
+        """
+        :return bool: The lv2 plugins are being scanned in background?
+        """
+        return self.scan_thread is not None and self.scan_thread.is_alive()
+
+    def lv2_fingerprint(self):
+        """
+        Identifies the installed lv2 plugins state by the LV2 bundles paths and modification times
+
+        :return string: Fingerprint of the lv2 plugins installed
+        """
+        bundles = []
+        for directory in self.lv2_path:
+            path = Path(directory).expanduser()
+            if not path.is_dir():
+                continue
+
+            for bundle in sorted(path.iterdir()):
+                try:
+                    modified = bundle.stat().st_mtime_ns
+                except OSError:
+                    # Dangling symlink or bundle removed during the listing
+                    continue
+
+                bundles.append('{} {}'.format(bundle, modified))
+
+        return hashlib.sha1('\n'.join(bundles).encode('utf-8')).hexdigest()
+
+    def _scan_lv2_plugins(self):
+        # Changes during the scan will be detected in the next configure
+        fingerprint = self.lv2_fingerprint()
+
+        try:
+            self.reload_lv2_plugins_data()
+        except Exception:
+            self.app.log("Lv2Plugins data - It's not possible reload lv2 plugins data")
+            self.app.log("                  Please install lilv")
+            return
+
+        self._dao.save_fingerprint(fingerprint)
+        self.app.log("Lv2Plugins data - Loaded lv2 plugins data installed")
 
     def by(self, technology):
         """
-        Get the plugins registered in PedalPi by technology
+        Get the plugins registered in PedalPi by technology.
+
+        The lv2 plugins are a read only mapping (uri to :class:`.Lv2Plugin`) over the :attr:`catalog`:
+        the plugins metadata is read when it is accessed. For pages of the plugins summaries,
+        prefer the :attr:`catalog` queries.
 
         :param PluginTechnology technology: PluginTechnology identifier
+        :return Mapping[string, Lv2Plugin]: Plugins by uri
         """
         if technology == PluginTechnology.LV2 \
         or str(technology).upper() == PluginTechnology.LV2.value.upper():
@@ -76,6 +193,35 @@ class PluginsController(Controller):
         else:
             return []
 
+    def search(self, text, limit=20):
+        """
+        Search the lv2 plugins by the words of the name, label, author, categories
+        and ports names. The words can be incomplete or contain typos::
+
+            >>> plugins_controller.search('revreb', limit=3)
+            [<Lv2Plugin object as Calf Reverb at 0x7f4ff6d3c4a8>, ...]
+
+        The :attr:`search_index` is built in the first search. After, it is updated
+        when the plugins data is reloaded.
+
+        :param string text: Search terms
+        :param int limit: Maximum number of plugins returned (``None`` for all)
+        :return list[Lv2Plugin]: Plugins ordered by relevance
+        """
+        builder = self.lv2_builder
+        if self._search_index_builder is not builder:
+            self._update_search_index(builder)
+
+        plugins = builder.all
+        return [plugins[uri] for uri in self.search_index.search(text, limit) if uri in plugins]
+
+    def _update_search_index(self, builder):
+        with self._search_index_lock:
+            if self._search_index_builder is not builder:
+                # Only the new, changed and removed plugins are reindexed
+                self.search_index.update([plugin.json for plugin in builder.all.values()])
+                self._search_index_builder = builder
+
     def lv2_effect(self, lv2_uri):
         """
         Generates a lv2 effect based in lv2_uri.
@@ -103,16 +249,41 @@ class PluginsController(Controller):
 
         .. _Lv2EffectBuilder.lv2_plugins_data(): http://pedalpi-pluginsmanager.readthedocs.io/en/latest/model_lv2.html#pluginsmanager.model.lv2.lv2_effect_builder.Lv2EffectBuilder.lv2_plugins_data
 
+        The plugin ports are read only in the first effect generation of each plugin.
+        The next effects are stamped out by the plugin :class:`.Lv2EffectTemplate`.
+        The templates are discarded when the plugins data is reloaded.
+
         :param string lv2_uri: String thats identifier a effect. Example: `http://guitarix.sourceforge.net/plugins/gx_scream_#_scream_`
 
         :return: :class:`.Lv2Effect`
         """
-        return self.lv2_builder.build(lv2_uri)
+        templates = self._lv2_templates
+        template = templates.get(lv2_uri)
+
+        if template is None:
+            builder = self.lv2_builder
+            if lv2_uri not in builder.all:
+                # Raises Lv2EffectBuilderError
+                return builder.build(lv2_uri)
+
+            template = templates[lv2_uri] = Lv2EffectTemplate(builder.all[lv2_uri])
+
+        return template.build()
 
     def reload_lv2_plugins_data(self):
         """
         Search for LV2 audio plugins in the system and extract the metadata
         needed by pluginsmanager to generate audio plugins.
+        The :attr:`lv2_builder` is replaced by a builder with the new metadata.
         """
         plugins_data = self.lv2_builder.lv2_plugins_data()
         self._dao.save(plugins_data)
+
+        builder = Lv2CatalogEffectBuilder(self.catalog, self._dao.path)
+        builder.reload(plugins_data)
+
+        self.lv2_builder = builder
+        self._lv2_templates = {}
+
+        if self._search_index_builder is not None:
+            self._update_search_index(self.lv2_builder)
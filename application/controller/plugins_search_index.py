@@ -0,0 +1,279 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import re
+import threading
+from collections import Counter
+
+
+class PluginsSearchIndex(object):
+    """
+    In memory full text index of the plugins metadata, with fuzzy matching.
+
+    The plugins are indexed by the words of the name, label, author, categories
+    and ports names. Each word is indexed by its trigrams, then a search
+    term matches the words with similar trigrams (typos and incomplete words)::
+
+        >>> index = PluginsSearchIndex()
+        >>> index.update(plugins)
+        >>> index.search('scream')
+        ['http://guitarix.sourceforge.net/plugins/gx_scream_#_scream_', ...]
+        >>> index.search('calf reverb', limit=2)
+        ['http://calf.sourceforge.net/plugins/Reverb', 'http://calf.sourceforge.net/plugins/RotarySpeaker']
+
+    The results are ranked by the sum of the terms scores. The term score is
+    its similarity with the matched word multiplied by the word field weight
+    (see :attr:`weights`).
+
+    :meth:`update` only reindexes the plugins that were added, changed or removed.
+    """
+
+    weights = {
+        'name': 8,
+        'label': 4,
+        'category': 2,
+        'author': 1,
+        'ports': 1,
+    }
+    """
+    Field weights for the ranking
+    """
+
+    similarity = 0.4
+    """
+    Minimum similarity (0 to 1) between a search term and a indexed word
+    """
+
+    cache_size = 512
+    """
+    Maximum number of search terms whose similar words are cached
+    """
+
+    _separator = re.compile(r'[\W_]+')
+    _camel_case = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._names = {}
+        self._postings = {}
+        self._trigrams = {}
+        self._words_trigrams = {}
+        self._similar_words_cache = {}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, uri):
+        return uri in self._documents
+
+    def update(self, plugins):
+        """
+        Indexes the plugins. The plugins indexed previously that aren't in ``plugins``
+        are removed. Only the new or changed plugins are (re)indexed.
+
+        :param list[dict] plugins: Plugins metadata (lilvlib format)
+        :return tuple(int, int): Number of plugins indexed and removed
+        """
+        documents = {plugin['uri']: self._document(plugin) for plugin in plugins}
+
+        with self._lock:
+            removed = [uri for uri, document in self._documents.items() if documents.get(uri) != document]
+            added = [uri for uri, document in documents.items() if self._documents.get(uri) != document]
+
+            for uri in removed:
+                self._remove(uri)
+
+            for uri in added:
+                self._add(uri, documents[uri])
+
+            if removed or added:
+                self._similar_words_cache = {}
+
+        return len(added), len([uri for uri in removed if uri not in documents])
+
+    def _document(self, plugin):
+        ports = plugin.get('ports', {})
+        ports_names = [
+            port.get('name', '')
+            for kind in ports.values()
+            for ports_list in kind.values()
+            for port in ports_list
+        ]
+
+        fields = (
+            ('name', [plugin.get('name', '')]),
+            ('label', [plugin.get('label', '')]),
+            ('category', plugin.get('category', [])),
+            ('author', [plugin.get('author', {}).get('name', '')]),
+            ('ports', ports_names),
+        )
+
+        words = {}
+        for field, texts in fields:
+            weight = self.weights[field]
+            for text in texts:
+                for word in self._words(text, camel_case=True):
+                    words[word] = max(words.get(word, 0), weight)
+
+        return plugin.get('name', ''), tuple(sorted(words.items()))
+
+    def _add(self, uri, document):
+        name, words = document
+        self._documents[uri] = document
+        self._names[uri] = name.lower()
+
+        for word, weight in words:
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                self._add_word(word)
+
+            postings.setdefault(weight, set()).add(uri)
+
+    def _add_word(self, word):
+        trigrams = self._trigrams_of(word)
+        self._words_trigrams[word] = len(trigrams)
+
+        for trigram in trigrams:
+            self._trigrams.setdefault(trigram, set()).add(word)
+
+    def _remove(self, uri):
+        name, words = self._documents.pop(uri)
+        del self._names[uri]
+
+        for word, weight in words:
+            postings = self._postings[word]
+            postings[weight].discard(uri)
+
+            if not postings[weight]:
+                del postings[weight]
+            if not postings:
+                del self._postings[word]
+                self._remove_word(word)
+
+    def _remove_word(self, word):
+        del self._words_trigrams[word]
+
+        for trigram in self._trigrams_of(word):
+            words = self._trigrams[trigram]
+            words.discard(word)
+            if not words:
+                del self._trigrams[trigram]
+
+    def search(self, text, limit=20):
+        """
+        :param string text: Search terms
+        :param int limit: Maximum number of results (``None`` for all)
+        :return list[string]: Uri of the plugins that matches the terms, ordered by relevance
+        """
+        terms = self._words(text)
+        if not terms:
+            return []
+
+        with self._lock:
+            scores = self._term_scores(terms[0])
+            for term in terms[1:]:
+                for uri, score in self._term_scores(term).items():
+                    scores[uri] = scores.get(uri, 0) + score
+
+            return self._ranking(scores, limit)
+
+    def _term_scores(self, term):
+        groups = []
+        for word, similarity in self._similar_words(term).items():
+            for weight, uris in self._postings[word].items():
+                groups.append((similarity * weight, uris))
+
+        # A plugin can contains many similar words: the best score (the last) is kept
+        groups.sort(key=lambda group: group[0])
+
+        scores = {}
+        for score, uris in groups:
+            scores.update(dict.fromkeys(uris, score))
+
+        return scores
+
+    def _similar_words(self, term):
+        cache = self._similar_words_cache
+
+        words = cache.get(term)
+        if words is None:
+            if len(cache) >= self.cache_size:
+                cache.clear()
+
+            words = cache[term] = self._search_similar_words(term)
+
+        return words
+
+    def _search_similar_words(self, term):
+        trigrams = self._trigrams_of(term)
+
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+
+        words = {}
+        for word, count in shared.items():
+            if word.startswith(term):
+                # Incomplete word, as in the typing
+                similarity = 1 if word == term else 0.9
+            else:
+                # Dice coefficient
+                similarity = 2 * count / (len(trigrams) + self._words_trigrams[word])
+
+            if similarity >= self.similarity:
+                words[word] = similarity
+
+        return words
+
+    def _ranking(self, scores, limit):
+        names = self._names
+        key = lambda uri: (-scores[uri], names[uri], uri)
+
+        if limit is not None and len(scores) > limit:
+            # Only the plugins with the best scores are sorted
+            minimum = heapq.nlargest(limit, scores.values())[-1]
+            candidates = [uri for uri, score in scores.items() if score >= minimum]
+
+            return sorted(candidates, key=key)[:limit]
+
+        return sorted(scores, key=key)[:limit]
+
+    @classmethod
+    def _words(cls, text, camel_case=False):
+        """
+        :param string text: Text
+        :param bool camel_case: Also returns the camel case words parts (``'GxScreamingBird'``: ``'gx'``,
+                                ``'screaming'`` and ``'bird'``)
+        :return list[string]: Lowercase words
+        """
+        words = []
+        for word in cls._separator.split(text):
+            if not word:
+                continue
+
+            words.append(word.lower())
+            if camel_case:
+                parts = cls._camel_case.findall(word)
+                if len(parts) > 1:
+                    words.extend(part.lower() for part in parts)
+
+        return words
+
+    @staticmethod
+    def _trigrams_of(word):
+        padded = '  {} '.format(word)
+        return {padded[index:index + 3] for index in range(len(padded) - 2)}
@@ -0,0 +1,43 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+
+class AtomicPersistence(object):
+    """
+    Saves json data crash safely: the data is written and synced in a temporary
+    file, that replaces the original file with an atomic rename.
+    If the process (or the Raspberry Pi) crashes while saving, the
+    original file remains intact.
+    """
+
+    @staticmethod
+    def save(path, json_data):
+        """
+        Saves json_data in path
+
+        :param Path path: Path that json_data will be persisted
+        :param json_data: Data that will be persisted
+        """
+        path = str(path)
+        temporary_path = path + '.tmp'
+
+        with open(temporary_path, 'w') as file:
+            file.write(json.dumps(json_data))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
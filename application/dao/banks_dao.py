@@ -0,0 +1,215 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from glob import glob
+from pathlib import Path
+from uuid import uuid4
+
+from application.dao.atomic_persistence import AtomicPersistence
+from application.dao.banks_reader import BanksReader
+from application.dao.banks_snapshot import BanksSnapshot
+from application.dao.lazy_bank import LazyBank
+from application.dao.write_behind_autosaver import WriteBehindAutosaver
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class BanksDao(object):
+    """
+    Loads the banks persisted by :class:`.WriteBehindAutosaver`.
+
+    :meth:`load` reads all banks files and builds the full model. With many banks,
+    it's slow. With ``lazy=True``, only the current bank is loaded;
+    the others are :class:`.LazyBank` (name, uuid and pedalboards names),
+    loaded in the first access of their pedalboards::
+
+        >>> manager = dao.load(DeviceController.sys_effect, lazy=True, current_bank=2)
+
+    The stubs data is kept in a summary file (``banks/summary``),
+    updated when a bank file is changed.
+
+    Without ``lazy`` and with ``snapshot=True``, the banks data is read of a :class:`.BanksSnapshot`
+    (``banks/snapshot``): only the banks files changed after the snapshot write are decoded.
+    The snapshot is written again after a successful load, if any bank file changed::
+
+        >>> manager = dao.load(DeviceController.sys_effect, snapshot=True)
+
+    With a :class:`.DataStore`, the banks, their stubs data and the index are records of the store
+    (the banks files are imported in the first load). The summary and the snapshot aren't used.
+
+    The loaded pedalboards without uuid (``pedalboard.data['uuid']``, see :meth:`assign_uuids`)
+    receive one, persisted by the :attr:`autosaver`. With ``lazy``, the banks with these
+    pedalboards are loaded (only once, in the first load after the uuids introduction).
+
+    :param Path data_path: Path where the data is persisted
+    :param DataStore store: Persists the banks in the store instead of the ``banks`` files
+    """
+
+    def __init__(self, data_path, store=None):
+        self.data_path = data_path / Path('banks/')
+        self.summary_path = self.data_path / Path('summary')
+        self.index_path = self.data_path / Path('index_file')
+
+        self.autosaver = WriteBehindAutosaver(str(self.data_path), store=store)
+        self.snapshot = BanksSnapshot(self.data_path / Path('snapshot'))
+
+        self.store = store
+        if store is not None:
+            store.migrate('banks', self._import_files)
+
+    def load(self, system_effect, lazy=False, current_bank=None, snapshot=False):
+        """
+        :param SystemEffect system_effect: SystemEffect used in pedalboards
+        :param bool lazy: Loads the banks on demand?
+        :param int current_bank: Index of the bank loaded eagerly (only for lazy)
+        :param bool snapshot: Uses the :attr:`snapshot` (only without lazy and store)
+        :return BanksManager: Banks manager with the persisted banks, observed by :attr:`autosaver`
+        """
+        if not lazy:
+            return self._load_all(system_effect, snapshot)
+
+        # Shared by the stubs loads: the plugins builder and the effects templates are reused
+        reader = BanksReader(system_effect)
+        if self.store is not None:
+            stubs = self._load_store_stubs(system_effect, reader)
+        else:
+            stubs = self._load_stubs(system_effect, reader)
+
+        banks = self.autosaver.index_file.load(stubs)
+
+        if current_bank is not None and 0 <= current_bank < len(banks):
+            banks[current_bank].load()
+
+        manager = BanksManager()
+        for bank in banks:
+            manager.append(bank)
+
+        # Registered after, because the autosaver rewrites the bank file when it is appended
+        manager.register(self.autosaver)
+        self._assign_uuids(bank for bank in banks if None in bank.pedalboards_uuids)
+
+        return manager
+
+    def _load_all(self, system_effect, use_snapshot):
+        if self.store is not None:
+            return self._build(system_effect, self.store.items('banks'), self.store.get('banks_index', 'index', []))
+
+        files = [Path(file) for file in glob(str(self.data_path) + '/*.json')]
+
+        if use_snapshot:
+            data = self.snapshot.read(files)
+            banks_data = [(file.stem, data[file.name]) for file in files if file.name in data]
+        else:
+            banks_data = [(file.stem, Persistence.read(file)) for file in files]
+
+        manager = self._build(system_effect, banks_data, self._read_index())
+
+        if use_snapshot:
+            self.snapshot.save()
+
+        return manager
+
+    def _build(self, system_effect, banks_data, index_data):
+        reader = BanksReader(system_effect)
+
+        banks = []
+        for uuid, json in banks_data:
+            bank = reader.read(json)
+            bank._uuid = uuid
+            banks.append(bank)
+
+        manager = BanksManager()
+        for bank in self.autosaver.index_file.load_data(index_data, banks):
+            manager.append(bank)
+
+        # Registered after, because the autosaver rewrites the bank file when it is appended
+        manager.register(self.autosaver)
+        self._assign_uuids(banks)
+
+        return manager
+
+    @staticmethod
+    def assign_uuids(bank):
+        """
+        Identifies the bank pedalboards without uuid (``pedalboard.data['uuid']``) with a new one
+
+        :param Bank bank: Bank whose pedalboards will be identified
+        :return bool: Any uuid was assigned?
+        """
+        assigned = False
+        for pedalboard in bank.pedalboards:
+            if pedalboard.data.get('uuid') is None:
+                pedalboard.data['uuid'] = uuid4().hex
+                assigned = True
+
+        return assigned
+
+    def _assign_uuids(self, banks):
+        for bank in banks:
+            if self.assign_uuids(bank):
+                self.autosaver.banks_files.save_bank(bank)
+
+    def _read_index(self):
+        try:
+            return Persistence.read(self.index_path)
+        except (IOError, ValueError):
+            return []
+
+    def _import_files(self):
+        banks = {Path(file).stem: Persistence.read(file) for file in glob(str(self.data_path) + '/*.json')}
+
+        for uuid, json in banks.items():
+            self.store.put('banks_summary', uuid, LazyBank.stub_data(json))
+        self.store.put('banks_index', 'index', self._read_index())
+
+        return banks
+
+    def _load_store_stubs(self, system_effect, reader):
+        return [
+            LazyBank(data['name'], uuid, None, data['pedalboards'], system_effect,
+                     store=self.store, pedalboards_uuids=data.get('uuids'), reader=reader)
+            for uuid, data in self.store.items('banks_summary')
+        ]
+
+    def _load_stubs(self, system_effect, reader):
+        summary = self._read_summary()
+        updated_summary = {}
+
+        banks = []
+        for file in glob(str(self.data_path) + '/*.json'):
+            path = Path(file)
+            uuid = path.stem
+            stat = path.stat()
+
+            data = summary.get(uuid)
+            if data is None or data['mtime'] != stat.st_mtime_ns or data['size'] != stat.st_size \
+            or 'uuids' not in data:
+                data = LazyBank.stub_data(Persistence.read(path))
+                data['mtime'] = stat.st_mtime_ns
+                data['size'] = stat.st_size
+
+            updated_summary[uuid] = data
+            banks.append(LazyBank(data['name'], uuid, path, data['pedalboards'], system_effect,
+                                  pedalboards_uuids=data['uuids'], reader=reader))
+
+        if updated_summary != summary:
+            AtomicPersistence.save(self.summary_path, updated_summary)
+
+        return banks
+
+    def _read_summary(self):
+        try:
+            return Persistence.read(self.summary_path)
+        except (IOError, ValueError):
+            return {}
@@ -0,0 +1,111 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from application.controller.lv2_effect_template import Lv2EffectTemplate
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.util.persistence_decoder import ConnectionReader, PersistenceDecoderError
+
+
+class BanksReader(object):
+    """
+    Reads the banks json data (the :class:`.Autosaver` files format), as the pluginsmanager
+    ``PersistenceDecoder``.
+
+    ``PersistenceDecoder`` creates a ``Lv2EffectBuilder`` (that reads the plugins metadata
+    and lists the installed plugins) for each pedalboard. The reader uses only one builder
+    and stamps out the effects of each plugin from a :class:`.Lv2EffectTemplate`::
+
+        >>> reader = BanksReader(DeviceController.sys_effect)
+        >>> banks = [reader.read(json) for json in banks_json]
+
+    :param SystemEffect system_effect: SystemEffect used in pedalboards
+    :param Lv2EffectBuilder builder: Builder with the plugins metadata. If ``None``, a new
+                                     builder is created in the first effect read
+    """
+
+    def __init__(self, system_effect, builder=None):
+        self.system_effect = system_effect
+        self._builder = builder
+        self._templates = {}
+
+    @property
+    def builder(self):
+        """
+        :return Lv2EffectBuilder: Builder with the plugins metadata
+        """
+        if self._builder is None:
+            self._builder = Lv2EffectBuilder()
+
+        return self._builder
+
+    def read(self, json):
+        """
+        :param dict json: Bank json data
+        :return Bank: Bank read
+        """
+        bank = Bank(json['name'])
+        for pedalboard_json in json['pedalboards']:
+            bank.append(self.read_pedalboard(pedalboard_json))
+
+        return bank
+
+    def read_pedalboard(self, json):
+        """
+        :param dict json: Pedalboard json data
+        :return Pedalboard: Pedalboard read
+        """
+        pedalboard = Pedalboard(json['name'])
+
+        for effect_json in json['effects']:
+            pedalboard.append(self.read_effect(effect_json))
+
+        connection_reader = ConnectionReader(pedalboard, self.system_effect)
+        for connection_json in json['connections']:
+            pedalboard.connect(*connection_reader.read(connection_json))
+
+        if 'data' in json:
+            pedalboard.data = json['data']
+
+        return pedalboard
+
+    def read_effect(self, json):
+        """
+        :param dict json: Effect json data
+        :return Lv2Effect: Effect read
+        """
+        if json['technology'] != 'lv2':
+            raise PersistenceDecoderError('Unknown effect technology: ' + json['technology'])
+
+        effect = self._template(json['plugin']).build()
+
+        for param, param_json in zip(effect.params, json['params']):
+            param.value = param_json['value']
+
+        effect.active = json['active']
+
+        return effect
+
+    def _template(self, uri):
+        template = self._templates.get(uri)
+        if template is None:
+            plugin = self.builder.all.get(uri)
+            if plugin is None:
+                # Raises the Lv2EffectBuilderError
+                self.builder.build(uri)
+
+            template = self._templates[uri] = Lv2EffectTemplate(plugin)
+
+        return template
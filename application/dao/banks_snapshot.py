@@ -0,0 +1,145 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+
+class BanksSnapshot(object):
+    """
+    Precompiled copy of the banks json files in a single binary (pickle) file.
+    The snapshot keeps the decoded data of each file and the hash of the file content.
+
+    :meth:`read` still reads the files (for compare their content hash), but only the files
+    changed (or created) after the snapshot write are decoded as json. :meth:`save` writes
+    the snapshot again only if a file changed::
+
+        >>> snapshot = BanksSnapshot(Path('data/banks/snapshot'))
+        >>> banks_data = snapshot.read(files)
+        >>> banks_data['ebc3e2ee5e6b4e0c9f3b23a02c5b1c1d.json']
+        {'name': 'Bank 1', 'pedalboards': [...]}
+        >>> snapshot.decoded
+        1
+        >>> snapshot.save()
+
+    The snapshot isn't used if its :attr:`version` changes or it's invalid.
+
+    .. note::
+
+        The snapshot is a pickle file: as the banks files, it must be writable only
+        by the application user.
+
+    :param Path path: Snapshot file path
+    """
+
+    version = 3
+    """
+    Snapshot format version
+    """
+
+    protocol = 4
+    """
+    Pickle protocol of the snapshot file
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        self.decoded = 0
+        """
+        int: Number of files decoded (not found in the snapshot) in the last :meth:`read`
+        """
+
+        self._entries = None
+        self._outdated = False
+
+    def read(self, files):
+        """
+        :param list[Path] files: Json files. The files that don't exist are ignored
+        :return dict: Data of each file, by file name
+        """
+        snapshot = self._load()
+
+        entries = {}
+        self.decoded = 0
+        for file in files:
+            try:
+                with open(str(file), 'rb') as stream:
+                    content = stream.read()
+            except FileNotFoundError:
+                continue
+
+            digest = hashlib.sha1(content).digest()
+            entry = snapshot.get(file.name)
+
+            if entry is None or entry[0] != digest:
+                entry = (digest, json.loads(content.decode('utf-8')))
+                self.decoded += 1
+
+            entries[file.name] = entry
+
+        self._entries = entries
+        self._outdated = self.decoded > 0 or len(entries) != len(snapshot)
+
+        return {name: data for name, (digest, data) in entries.items()}
+
+    def _load(self):
+        try:
+            with open(str(self.path), 'rb') as file:
+                data = pickle.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning('Banks snapshot - Invalid snapshot {}: {}'.format(self.path, e))
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            return {}
+
+        return data['files']
+
+    def save(self):
+        """
+        Writes (atomically) the files of the last :meth:`read`, if any file changed
+        """
+        if self._entries is None or not self._outdated:
+            return
+
+        data = {
+            'version': self.version,
+            'files': self._entries,
+        }
+
+        path = str(self.path)
+        temporary_path = path + '.tmp'
+
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(data, file, protocol=self.protocol)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+        self._outdated = False
+
+    def delete(self):
+        """
+        Removes the snapshot file
+        """
+        try:
+            os.remove(str(self.path))
+        except FileNotFoundError:
+            pass
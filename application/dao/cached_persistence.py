@@ -0,0 +1,104 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+
+from application.dao.atomic_persistence import AtomicPersistence
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class CachedPersistence(object):
+    """
+    Keeps in memory the json files read and saved.
+
+    A cached file is only read again if its modification time or size changed
+    (a ``stat``, without open or parse it). The files are saved by :class:`.AtomicPersistence`
+    and the saved data replaces the cached data::
+
+        >>> persistence = CachedPersistence()
+        >>> persistence.read(path)   # Reads the file
+        {'fingerprint': '...'}
+        >>> persistence.read(path)   # Cached
+        {'fingerprint': '...'}
+        >>> persistence.hits, persistence.misses
+        (1, 1)
+
+    The data returned is shared between the reads, so it must not be changed.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        """
+        int: Number of reads returned of the cache
+        """
+        self.misses = 0
+        """
+        int: Number of reads that read the file
+        """
+
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def read(self, path):
+        """
+        :param Path path: Json file path
+        :return: json data
+        """
+        path = str(path)
+        version = self._version(path)
+
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == version:
+                self.hits += 1
+                return cached[1]
+
+        data = Persistence.read(path)
+
+        with self._lock:
+            self.misses += 1
+            self._files[path] = (version, data)
+
+        return data
+
+    def save(self, path, data):
+        """
+        Saves the json data atomically (see :class:`.AtomicPersistence`)
+
+        :param Path path: Json file path
+        :param data: Data that will be persisted
+        """
+        path = str(path)
+        AtomicPersistence.save(path, data)
+
+        with self._lock:
+            self._files[path] = (self._version(path), data)
+
+    def invalidate(self, path=None):
+        """
+        Discards the cached data of a file
+
+        :param Path path: Json file path. If ``None``, all files are discarded
+        """
+        with self._lock:
+            if path is None:
+                self._files.clear()
+            else:
+                self._files.pop(str(path), None)
+
+    @staticmethod
+    def _version(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
@@ -12,18 +12,206 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 from pathlib import Path
+
+from application.dao.atomic_persistence import AtomicPersistence
 from pluginsmanager.observer.autosaver.persistence import Persistence
 
 
 class ComponentDao(object):
+    """
+    Persists and loads the :class:`.ComponentDataController` data.
+
+    By default, any change rewrites all data in ``component.json``.
+    With ``journal`` enabled, each key change is appended in a journal
+    file (``component.journal``), so the change cost depends only on the
+    changed key size. The journal is compacted into ``component.json``
+    after ``compact_after`` changes::
+
+        >>> dao = application.controller(ComponentDataController).dao
+        >>> dao.journal = True
 
-    def __init__(self, data_path):
+    With a :class:`.DataStore`, each key is a record of the ``components`` namespace
+    and only the changed key is written. The journal isn't used.
+
+    :param Path data_path: Path where the data is persisted
+    :param bool journal: Persists the changes in a journal file?
+    :param int compact_after: Journal entries allowed before compact it
+    :param DataStore store: Persists the data in the store instead of ``components/component.json``
+    """
+
+    def __init__(self, data_path, journal=False, compact_after=100, store=None):
         self.data_path = data_path / Path('components/')
         self.path = self.data_path / Path('component.json')
+        self.journal_path = self.data_path / Path('component.journal')
+
+        self._journal = journal
+        self.compact_after = compact_after
+
+        self._journal_file = None
+        self._journal_entries = 0
+        self._data = None
+
+        self.store = store
+        if store is not None:
+            store.migrate('components', self._read_file)
+
+    @property
+    def journal(self):
+        """
+        Persists the changes in a journal file?
+
+        :getter: Journal is enabled
+        :setter: Enables or disables the journal. If disabled, the journal is compacted
+        """
+        return self._journal
+
+    @journal.setter
+    def journal(self, journal):
+        if self._journal and not journal and self._data is not None and self.store is None:
+            self.compact(self._data)
+
+        self._journal = journal
 
     def load(self):
-        return Persistence.read(self.path)
+        if self.store is not None:
+            self._data = dict(self.store.items('components'))
+            return self._data
+
+        data = Persistence.read(self.path)
+
+        if self.journal_path.exists():
+            complete = self._replay(data)
+
+            # An incomplete entry must be discarded before new entries are appended after it.
+            # Without journal, the next saves don't update the journal file, that would be replayed
+            # over them in the next load
+            if not complete or not self.journal:
+                self.compact(data)
+
+        self._data = data
+        return data
+
+    def _read_file(self):
+        try:
+            data = Persistence.read(self.path)
+        except (IOError, ValueError):
+            return {}
+
+        if self.journal_path.exists():
+            self._replay(data)
+            self._journal_entries = 0
+
+        return data
+
+    def _replay(self, data):
+        """
+        Applies the journal entries in the data
+
+        :return bool: All the entries are complete?
+        """
+        with open(str(self.journal_path)) as journal:
+            for line in journal:
+                if not line.endswith('\n'):
+                    # Incomplete entry, written when a crash occurs
+                    return False
+
+                try:
+                    operation, key, value = json.loads(line)
+                except ValueError:
+                    return False
+
+                if operation == 'set':
+                    data[key] = value
+                else:
+                    data.pop(key, None)
+
+                self._journal_entries += 1
+
+        return True
 
     def save(self, data):
-        Persistence.save(self.path, data)
+        self._data = data
+
+        if self.store is not None:
+            with self.store.transaction():
+                self.store.clear('components')
+                for key, value in data.items():
+                    self.store.put('components', key, value)
+        else:
+            # Writes atomically and removes any journal file
+            self.compact(data)
+
+    def save_key(self, data, key):
+        """
+        Persists the ``data[key]`` change
+
+        :param dict data: All the components data
+        :param string key: Key changed
+        """
+        if self.store is not None:
+            self._data = data
+            self.store.put('components', key, data[key])
+            return
+
+        self._change(data, ['set', key, data[key]])
+
+    def delete_key(self, data, key):
+        """
+        Persists the ``key`` removal
+
+        :param dict data: All the components data (without the removed key)
+        :param string key: Key removed
+        """
+        if self.store is not None:
+            self._data = data
+            self.store.delete('components', key)
+            return
+
+        self._change(data, ['delete', key, None])
+
+    def _change(self, data, entry):
+        if not self.journal:
+            self.save(data)
+            return
+
+        self._data = data
+
+        if self._journal_file is None:
+            self._journal_file = open(str(self.journal_path), 'a')
+
+        self._journal_file.write(json.dumps(entry) + '\n')
+        self._journal_file.flush()
+        self._journal_entries += 1
+
+        if self._journal_entries >= self.compact_after:
+            self.compact(data)
+
+    def compact(self, data):
+        """
+        Writes all data in ``component.json`` and clears the journal
+
+        :param dict data: All the components data
+        """
+        AtomicPersistence.save(self.path, data)
+
+        self._close_journal()
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+
+        self._journal_entries = 0
+
+    def close(self):
+        """
+        Compacts the journal (if it has entries) and closes it
+        """
+        if self._journal_entries and self._data is not None:
+            self.compact(self._data)
+
+        self._close_journal()
+
+    def _close_journal(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
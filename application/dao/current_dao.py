@@ -12,19 +12,76 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import threading
+import time
 from pathlib import Path
-from pluginsmanager.observer.autosaver.persistence import Persistence
+
+from application.dao.cached_persistence import CachedPersistence
 
 
 class CurrentDao(object):
+    """
+    Persists and loads the current bank and pedalboard indexes.
+
+    Changing quickly the current pedalboard (as scrolling a bank with a footswitch)
+    would rewrite the file for each change. So the :meth:`save` only keeps the
+    data in memory, and the file is written (by a single flusher thread) after ``delay``
+    seconds without changes or when :meth:`flush` is called. Changing continuously doesn't
+    postpone the write more than ``max_delay`` seconds after the first change not written.
+    The file is written without blocking the :meth:`save` calls.
+
+    The file data is kept in memory (:attr:`persistence`), so :meth:`load` only reads
+    the file again if it is changed by another process.
+
+    :param Path data_path: Path where the data is persisted
+    :param float delay: Quiet period (in seconds) before write the data
+    :param DataStore store: Persists the data in the store (record ``current``)
+                            instead of ``current/current.json``
+    :param float max_delay: Maximum time (in seconds) that a change waits to be written
+    """
 
-    def __init__(self, data_path):
+    def __init__(self, data_path, delay=1, store=None, max_delay=5):
         self.data_path = data_path / Path('current/')
         self.path = self.data_path / Path('current.json')
 
+        self.delay = delay
+        self.max_delay = max_delay
+        self.persistence = CachedPersistence()
+        """
+        :class:`.CachedPersistence` of ``current.json``
+        """
+
+        self.store = store
+        if store is not None:
+            store.migrate('current', self._read_file)
+
+        self._pending = None
+        self._writing = None
+        self._first_change = None
+        self._last_change = None
+        self._flusher = None
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+
     def load(self):
-        data = Persistence.read(self.path)
-        return CurrentData(data)
+        with self._lock:
+            data = self._pending if self._pending is not None else self._writing
+
+        return CurrentData(data if data is not None else self._read())
+
+    def _read(self):
+        if self.store is not None:
+            return self.store.get('current', 'current', {})
+
+        return self.persistence.read(self.path)
+
+    def _read_file(self):
+        try:
+            return {'current': self.persistence.read(self.path)}
+        except (IOError, ValueError):
+            return {}
 
     def save(self, bank_index, pedalboard_index):
         data = {
@@ -32,10 +89,87 @@ class CurrentDao(object):
             "pedalboard": pedalboard_index
         }
 
-        Persistence.save(self.path, data)
+        self._schedule(data)
 
     def save_empty(self):
-        Persistence.save(self.path, {})
+        self._schedule({})
+
+    def _schedule(self, data):
+        with self._lock:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_change = now
+
+            self._pending = data
+            self._last_change = now
+
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name='CurrentDaoFlusher', daemon=True)
+                self._flusher.start()
+
+            self._changed.notify()
+
+    def _run(self):
+        while True:
+            self._wait_deadline()
+
+            try:
+                self.flush()
+            except Exception:
+                logging.exception('Current - Write fails. Next attempt in {}s'.format(self.delay))
+                with self._lock:
+                    self._first_change = self._last_change = time.monotonic()
+
+    def _wait_deadline(self):
+        with self._lock:
+            while True:
+                if self._pending is None:
+                    self._changed.wait()
+                    continue
+
+                deadline = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+
+                self._changed.wait(remaining)
+
+    @property
+    def pending(self):
+        """
+        :return bool: Exists data not written?
+        """
+        return self._pending is not None
+
+    def flush(self):
+        """
+        Writes the pending data immediately
+        """
+        with self._write_lock:
+            with self._lock:
+                data = self._pending
+                if data is None:
+                    return
+
+                self._pending = None
+                self._writing = data
+
+            try:
+                self._write(data)
+            except BaseException:
+                with self._lock:
+                    if self._pending is None:
+                        self._pending = data
+                raise
+            finally:
+                with self._lock:
+                    self._writing = None
+
+    def _write(self, data):
+        if self.store is not None:
+            self.store.put('current', 'current', data)
+        else:
+            self.persistence.save(self.path, data)
 
 
 class CurrentData(object):
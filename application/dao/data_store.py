@@ -0,0 +1,196 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class DataStore(object):
+    """
+    Single file storage (SQLite in WAL mode) used by the daos instead of the json files tree.
+
+    The data is kept as json records, identified by a namespace (as ``'banks'``)
+    and a key (as the bank uuid). Saving a change writes only the changed records,
+    and the records written in a :meth:`transaction` are committed together::
+
+        >>> store = DataStore(Path('data/pedalpi.db'))
+        >>> with store.transaction():
+        ...     store.put('banks', bank.uuid, bank.json)
+        ...     store.put('current', 'current', {'bank': 0, 'pedalboard': 1})
+        >>> store.get('current', 'current')
+        {'bank': 0, 'pedalboard': 1}
+
+    The daos import the data of their json files in their first load (see :meth:`migrate`).
+    The json files aren't changed or removed.
+
+    :param Path path: Store file path
+    """
+
+    synchronous = 'NORMAL'
+    """
+    SQLite ``synchronous`` pragma. With ``NORMAL``, a power loss can discard the last commits,
+    but the store is never corrupted. Use ``FULL`` for sync each commit
+    """
+
+    _schema = 'CREATE TABLE IF NOT EXISTS records (' \
+              '    namespace TEXT NOT NULL,' \
+              '    key TEXT NOT NULL,' \
+              '    value TEXT NOT NULL,' \
+              '    PRIMARY KEY (namespace, key)' \
+              ') WITHOUT ROWID'
+
+    _migrations = 'migrations'
+
+    def __init__(self, path):
+        self.path = path
+
+        self.writes = 0
+        """
+        int: Number of records written or removed
+        """
+        self.commits = 0
+        """
+        int: Number of transactions committed
+        """
+
+        self._connection = None
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups the changes in a single commit. If an exception is raised,
+        all the changes are discarded. A transaction started inside another
+        is part of it.
+
+        The changes of the other threads wait the transaction end.
+        """
+        with self._lock:
+            connection = self._connect()
+            if self._depth == 0:
+                connection.execute('BEGIN IMMEDIATE')
+
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    connection.execute('ROLLBACK')
+                raise
+
+            self._depth -= 1
+            if self._depth == 0:
+                connection.execute('COMMIT')
+                self.commits += 1
+
+    def get(self, namespace, key, default=None):
+        """
+        :param string namespace: Records namespace
+        :param string key: Record key
+        :param default: Returned if the record doesn't exists
+        :return: Record value
+        """
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT value FROM records WHERE namespace = ? AND key = ?',
+                (namespace, key)
+            ).fetchone()
+
+        return default if row is None else json.loads(row[0])
+
+    def items(self, namespace):
+        """
+        :param string namespace: Records namespace
+        :return list[tuple(string, object)]: Keys and values of the namespace records, ordered by key
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT key, value FROM records WHERE namespace = ? ORDER BY key',
+                (namespace, )
+            ).fetchall()
+
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def put(self, namespace, key, value):
+        """
+        Writes a record
+
+        :param string namespace: Records namespace
+        :param string key: Record key
+        :param value: Json serializable value
+        """
+        data = json.dumps(value)
+
+        with self.transaction():
+            self._connection.execute('INSERT OR REPLACE INTO records VALUES (?, ?, ?)', (namespace, key, data))
+            self.writes += 1
+
+    def delete(self, namespace, key):
+        """
+        Removes a record, if it exists
+
+        :param string namespace: Records namespace
+        :param string key: Record key
+        """
+        with self.transaction():
+            self._connection.execute('DELETE FROM records WHERE namespace = ? AND key = ?', (namespace, key))
+            self.writes += 1
+
+    def clear(self, namespace):
+        """
+        Removes all the namespace records
+
+        :param string namespace: Records namespace
+        """
+        with self.transaction():
+            self._connection.execute('DELETE FROM records WHERE namespace = ?', (namespace, ))
+            self.writes += 1
+
+    def migrate(self, namespace, load):
+        """
+        Imports the legacy data of a namespace, only once
+
+        :param string namespace: Records namespace
+        :param function load: Called (without arguments) for get the records (dict key → value) imported
+        :return bool: The data was imported now?
+        """
+        with self.transaction():
+            if self.get(self._migrations, namespace) is not None:
+                return False
+
+            for key, value in load().items():
+                self.put(namespace, key, value)
+
+            self.put(self._migrations, namespace, True)
+            return True
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            # The transactions are controlled by transaction()
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode = WAL')
+            self._connection.execute('PRAGMA synchronous = {}'.format(self.synchronous))
+            self._connection.execute(self._schema)
+
+        return self._connection
@@ -0,0 +1,155 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from application.dao.banks_reader import BanksReader
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class LazyBank(Bank):
+    """
+    :class:`.Bank` persisted whose pedalboards are only read of the file
+    in the first access of :attr:`pedalboards`::
+
+        >>> bank.loaded
+        False
+        >>> bank.pedalboards_names
+        ['Shows', 'Shows 2']
+        >>> bank.pedalboards[0]
+        <Pedalboard object as Shows with 2 effects at 0x7fa3bcb49be0>
+        >>> bank.loaded
+        True
+
+    The pedalboards loading doesn't notify the observers.
+
+    :param string name: Bank name
+    :param string uuid: Bank uuid (persisted file name)
+    :param Path path: Bank file path
+    :param list[string] pedalboards_names: Names of the persisted pedalboards
+    :param SystemEffect system_effect: SystemEffect used in pedalboards
+    :param DataStore store: If informed, the bank is read of the store (``banks`` record) instead of ``path``
+    :param list[string] pedalboards_uuids: Uuids (``pedalboard.data['uuid']``) of the persisted pedalboards
+    :param BanksReader reader: Reader of the pedalboards, usually shared by the banks (as the one
+                               of the :class:`.BanksDao`) for reuse its plugins builder and effects
+                               templates. If ``None``, a new reader is created in the load
+    """
+
+    def __init__(self, name, uuid, path, pedalboards_names, system_effect, store=None, pedalboards_uuids=None,
+                 reader=None):
+        # Bank.__init__ creates the (empty) pedalboards list
+        self._loaded = True
+        super(LazyBank, self).__init__(name)
+        self._loaded = False
+
+        self._uuid = uuid
+        self.path = path
+        self._pedalboards_names = list(pedalboards_names)
+        if pedalboards_uuids is None:
+            pedalboards_uuids = [None] * len(self._pedalboards_names)
+        self._pedalboards_uuids = list(pedalboards_uuids)
+        self._system_effect = system_effect
+        self._store = store
+        self._reader = reader
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stub_data(json):
+        """
+        :param dict json: Bank json data
+        :return dict: Data required for create the bank stub (name, pedalboards names and uuids)
+        """
+        return {
+            'name': json['name'],
+            'pedalboards': [pedalboard['name'] for pedalboard in json['pedalboards']],
+            'uuids': [pedalboard.get('data', {}).get('uuid') for pedalboard in json['pedalboards']],
+        }
+
+    @property
+    def loaded(self):
+        """
+        :return bool: The pedalboards has been read of the file?
+        """
+        return self._loaded
+
+    @property
+    def pedalboards_names(self):
+        """
+        Names of the pedalboards, without load them
+
+        :return list[string]: Pedalboards names
+        """
+        if self._loaded:
+            return [pedalboard.name for pedalboard in self._pedalboards]
+
+        return list(self._pedalboards_names)
+
+    @property
+    def pedalboards_uuids(self):
+        """
+        Uuids of the pedalboards (``pedalboard.data['uuid']``, ``None`` if undefined), without load them
+
+        :return list[string]: Pedalboards uuids
+        """
+        if self._loaded:
+            return [pedalboard.data.get('uuid') for pedalboard in self._pedalboards]
+
+        return list(self._pedalboards_uuids)
+
+    @property
+    def pedalboards(self):
+        if not self._loaded:
+            self.load()
+
+        return self._pedalboards
+
+    @pedalboards.setter
+    def pedalboards(self, pedalboards):
+        self._pedalboards = pedalboards
+
+    @property
+    def observer(self):
+        return self._observer
+
+    @observer.setter
+    def observer(self, observer):
+        self._observer = observer
+
+        if self._loaded:
+            for pedalboard in self._pedalboards:
+                pedalboard.observer = observer
+
+    def load(self):
+        """
+        Reads the pedalboards of the file. It's called automatically in the first
+        access of :attr:`pedalboards`
+        """
+        with self._lock:
+            if self._loaded:
+                return
+
+            if self._store is not None:
+                data = self._store.get('banks', self.uuid)
+            else:
+                data = Persistence.read(self.path)
+
+            reader = self._reader if self._reader is not None else BanksReader(self._system_effect)
+            pedalboards = [reader.read_pedalboard(json) for json in data['pedalboards']]
+
+            self._pedalboards.real_list.extend(pedalboards)
+            for pedalboard in pedalboards:
+                self._init_pedalboard(pedalboard)
+
+            self._loaded = True
@@ -0,0 +1,326 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+
+
+class PluginsCatalog(object):
+    """
+    Compact and indexed catalog of the plugins metadata, persisted in a SQLite file.
+
+    Each plugin is a fixed record (uri, name, label, interned author, brand
+    and categories, and ports count) indexed by uri, name, category, author and
+    ports count. The complete metadata is kept compressed and it is only
+    decompressed by :meth:`get`.
+
+    The queries return only a page of plugins summaries::
+
+        >>> catalog.query(category='Reverb', prefix='calf', limit=10)
+        [{'uri': 'http://calf.sourceforge.net/plugins/Reverb', 'name': 'Calf Reverb', ...}]
+        >>> catalog.count(category='Reverb')
+        26
+        >>> catalog.get('http://calf.sourceforge.net/plugins/Reverb')['ports']['control']['input'][0]
+        {'name': 'Decay time', ...}
+
+    :param Path path: Catalog file path
+    """
+
+    _schema = (
+        'CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)',
+        'CREATE TABLE strings (id INTEGER PRIMARY KEY, value TEXT UNIQUE NOT NULL)',
+        'CREATE TABLE plugins ('
+        '    id INTEGER PRIMARY KEY,'
+        '    uri TEXT UNIQUE NOT NULL,'
+        '    name TEXT NOT NULL COLLATE NOCASE,'
+        '    label TEXT,'
+        '    author INTEGER REFERENCES strings (id),'
+        '    brand INTEGER REFERENCES strings (id),'
+        '    audio_inputs INTEGER,'
+        '    audio_outputs INTEGER,'
+        '    control_inputs INTEGER,'
+        '    control_outputs INTEGER,'
+        '    ports INTEGER,'
+        '    data BLOB'
+        ')',
+        'CREATE TABLE plugins_categories ('
+        '    category INTEGER REFERENCES strings (id),'
+        '    plugin INTEGER REFERENCES plugins (id),'
+        '    PRIMARY KEY (category, plugin)'
+        ') WITHOUT ROWID',
+        'CREATE INDEX plugins_name ON plugins (name COLLATE NOCASE)',
+        'CREATE INDEX plugins_author ON plugins (author)',
+        'CREATE INDEX plugins_audio_ports ON plugins (audio_inputs, audio_outputs)',
+        'CREATE INDEX plugins_ports ON plugins (ports)',
+        'CREATE INDEX plugins_categories_plugin ON plugins_categories (plugin)',
+    )
+
+    _summary = 'SELECT plugins.id, uri, name, label, author.value, brand.value, ' \
+               'audio_inputs, audio_outputs, control_inputs, control_outputs ' \
+               'FROM plugins ' \
+               'LEFT JOIN strings AS author ON author.id = plugins.author ' \
+               'LEFT JOIN strings AS brand ON brand.id = plugins.brand'
+
+    mmap_size = 16 * 1024 * 1024
+    """
+    Maximum bytes of the catalog file read by memory mapping
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def exists(self):
+        return self.path.exists()
+
+    def outdated(self, source_path):
+        """
+        :param Path source_path: Plugins metadata file used for build the catalog
+        :return bool: The catalog doesn't exists or it was built with an older version of ``source_path``?
+        """
+        if not self.exists:
+            return True
+
+        try:
+            with self._lock:
+                row = self._connect().execute("SELECT value FROM meta WHERE key = 'source_mtime'").fetchone()
+        except sqlite3.DatabaseError:
+            return True
+
+        return row is None or int(row[0]) != source_path.stat().st_mtime_ns
+
+    def rebuild(self, plugins, source_path=None):
+        """
+        Replaces the catalog data. The new catalog is written in a temporary file,
+        that replaces the catalog file atomically
+
+        :param list[dict] plugins: Plugins metadata (lilvlib format)
+        :param Path source_path: Plugins metadata file (see :meth:`outdated`)
+        """
+        temporary_path = Path(str(self.path) + '.tmp')
+        if temporary_path.exists():
+            temporary_path.unlink()
+
+        connection = sqlite3.connect(str(temporary_path))
+        try:
+            for statement in self._schema:
+                connection.execute(statement)
+
+            strings = {}
+            for plugin in plugins:
+                self._insert(connection, strings, plugin)
+
+            if source_path is not None:
+                connection.execute(
+                    "INSERT INTO meta VALUES ('source_mtime', ?)",
+                    (str(source_path.stat().st_mtime_ns), )
+                )
+
+            connection.commit()
+        finally:
+            connection.close()
+
+        with self._lock:
+            self._close()
+            os.replace(str(temporary_path), str(self.path))
+
+    def _insert(self, connection, strings, plugin):
+        ports = plugin['ports']
+        cursor = connection.execute(
+            'INSERT INTO plugins VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                plugin['uri'],
+                plugin['name'],
+                plugin.get('label', ''),
+                self._intern(connection, strings, plugin.get('author', {}).get('name', '')),
+                self._intern(connection, strings, plugin.get('brand', '')),
+                len(ports['audio']['input']),
+                len(ports['audio']['output']),
+                len(ports['control']['input']),
+                len(ports['control']['output']),
+                sum(len(ports_list) for kind in ports.values() for ports_list in kind.values()),
+                zlib.compress(json.dumps(plugin).encode('utf-8')),
+            )
+        )
+
+        for category in plugin.get('category', []):
+            connection.execute(
+                'INSERT OR IGNORE INTO plugins_categories VALUES (?, ?)',
+                (self._intern(connection, strings, category), cursor.lastrowid)
+            )
+
+    @staticmethod
+    def _intern(connection, strings, value):
+        if value not in strings:
+            strings[value] = connection.execute('INSERT INTO strings VALUES (NULL, ?)', (value, )).lastrowid
+
+        return strings[value]
+
+    def query(self, category=None, author=None, prefix=None, audio_inputs=None, audio_outputs=None,
+              offset=0, limit=20):
+        """
+        Search the plugins by the informed filters
+
+        :param string category: Plugins category (as ``'Reverb'``)
+        :param string author: Plugins author name
+        :param string prefix: Name prefix (case insensitive)
+        :param int audio_inputs: Number of audio inputs
+        :param int audio_outputs: Number of audio outputs
+        :param int offset: Number of plugins skipped (pagination)
+        :param int limit: Maximum number of plugins returned (``None`` for all)
+        :return list[dict]: Plugins summaries, ordered by name
+        """
+        where, params = self._where(category, author, prefix, audio_inputs, audio_outputs)
+        sql = '{} {} ORDER BY name LIMIT ? OFFSET ?'.format(self._summary, where)
+        params += [-1 if limit is None else limit, offset]
+
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(sql, params).fetchall()
+            categories = self._categories_of(connection, [row[0] for row in rows])
+
+        return [self._summary_of(row, categories.get(row[0], [])) for row in rows]
+
+    def count(self, category=None, author=None, prefix=None, audio_inputs=None, audio_outputs=None):
+        """
+        :return int: Number of plugins that satisfies the filters (see :meth:`query`)
+        """
+        where, params = self._where(category, author, prefix, audio_inputs, audio_outputs)
+        sql = 'SELECT COUNT(*) FROM plugins {}'.format(where)
+
+        with self._lock:
+            return self._connect().execute(sql, params).fetchone()[0]
+
+    def get(self, uri):
+        """
+        :param string uri: Plugin uri
+        :return dict: Complete plugin metadata or ``None`` if the catalog doesn't contains it
+        """
+        with self._lock:
+            row = self._connect().execute('SELECT data FROM plugins WHERE uri = ?', (uri, )).fetchone()
+
+        return None if row is None else json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def contains(self, uri):
+        """
+        :param string uri: Plugin uri
+        :return bool: The catalog contains the plugin?
+        """
+        with self._lock:
+            return self._connect().execute('SELECT 1 FROM plugins WHERE uri = ?', (uri, )).fetchone() is not None
+
+    def uris(self):
+        """
+        :return list[string]: Uri of all plugins, ordered by name
+        """
+        with self._lock:
+            return [row[0] for row in self._connect().execute('SELECT uri FROM plugins ORDER BY name')]
+
+    def categories(self):
+        """
+        :return list[tuple(string, int)]: Categories and the number of plugins of each one
+        """
+        sql = 'SELECT value, COUNT(*) FROM plugins_categories ' \
+              'JOIN strings ON strings.id = plugins_categories.category ' \
+              'GROUP BY value ORDER BY value'
+
+        with self._lock:
+            return self._connect().execute(sql).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    @staticmethod
+    def _where(category, author, prefix, audio_inputs, audio_outputs):
+        conditions = []
+        params = []
+
+        if category is not None:
+            conditions.append(
+                'plugins.id IN (SELECT plugin FROM plugins_categories '
+                'JOIN strings ON strings.id = plugins_categories.category WHERE value = ?)'
+            )
+            params.append(category)
+
+        if author is not None:
+            conditions.append('plugins.author = (SELECT id FROM strings WHERE value = ?)')
+            params.append(author)
+
+        if prefix is not None:
+            escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params.append(escaped + '%')
+
+        if audio_inputs is not None:
+            conditions.append('audio_inputs = ?')
+            params.append(audio_inputs)
+
+        if audio_outputs is not None:
+            conditions.append('audio_outputs = ?')
+            params.append(audio_outputs)
+
+        where = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
+        return where, params
+
+    @staticmethod
+    def _categories_of(connection, plugins_ids):
+        if not plugins_ids:
+            return {}
+
+        sql = 'SELECT plugin, value FROM plugins_categories ' \
+              'JOIN strings ON strings.id = plugins_categories.category ' \
+              'WHERE plugin IN ({})'.format(', '.join('?' * len(plugins_ids)))
+
+        categories = {}
+        for plugin, category in connection.execute(sql, plugins_ids):
+            categories.setdefault(plugin, []).append(category)
+
+        return categories
+
+    @staticmethod
+    def _summary_of(row, categories):
+        _, uri, name, label, author, brand, audio_inputs, audio_outputs, control_inputs, control_outputs = row
+
+        return {
+            'uri': uri,
+            'name': name,
+            'label': label,
+            'author': author,
+            'brand': brand,
+            'category': categories,
+            'ports': {
+                'audio': {'input': audio_inputs, 'output': audio_outputs},
+                'control': {'input': control_inputs, 'output': control_outputs},
+            }
+        }
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            # Reads the catalog pages by memory mapping
+            self._connection.execute('PRAGMA mmap_size = {}'.format(self.mmap_size))
+
+        return self._connection
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
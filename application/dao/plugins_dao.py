@@ -13,27 +13,76 @@
 # limitations under the License.
 
 from pathlib import Path
+
+from application.dao.atomic_persistence import AtomicPersistence
+from application.dao.cached_persistence import CachedPersistence
+from application.dao.plugins_catalog import PluginsCatalog
 from pluginsmanager.observer.autosaver.persistence import Persistence
 
 
 class PluginsDao(object):
     """
     Persists and loads Lv2Plugins data
+
+    The plugins data is kept in a json file (lilvlib format), only read for rebuild the :attr:`catalog`.
+    It is large, so it isn't kept in memory. With a :class:`.DataStore`, only the fingerprint
+    is persisted in the store.
+
+    The fingerprint file data is kept in memory (:attr:`persistence`) and only read again if the file changes.
     """
 
-    def __init__(self, data_path):
+    def __init__(self, data_path, store=None):
         """
         :param Path data_path:
+        :param DataStore store: Persists the fingerprint in the store
         """
         self.data_path = data_path
         self.path = self.data_path / Path('plugins_lv2.json')
+        self.fingerprint_path = self.data_path / Path('plugins_lv2_fingerprint.json')
+        self.catalog = PluginsCatalog(self.data_path / Path('plugins_lv2.catalog'))
+
+        self.persistence = CachedPersistence()
+        """
+        :class:`.CachedPersistence` of the fingerprint file
+        """
+
+        self.store = store
+        if store is not None:
+            store.migrate('plugins', self._read_fingerprint_file)
 
     def load(self):
+        """
+        :return list: Plugins data
+        """
         return Persistence.read(self.path)
 
     def save(self, data):
-        Persistence.save(self.path, data)
+        # Persistence.save requires an asyncio event loop, that only exists in the main thread
+        AtomicPersistence.save(self.path, data)
 
     @property
     def exists_data(self):
         return self.path.exists()
+
+    def load_fingerprint(self):
+        """
+        :return string: Fingerprint of the lv2 plugins installed when the data was saved
+                        or ``None`` if it is unknown
+        """
+        if self.store is not None:
+            return self.store.get('plugins', 'fingerprint')
+
+        return self._read_fingerprint_file().get('fingerprint')
+
+    def _read_fingerprint_file(self):
+        try:
+            return {'fingerprint': self.persistence.read(self.fingerprint_path)['fingerprint']}
+        except (IOError, ValueError, KeyError):
+            return {}
+
+    def save_fingerprint(self, fingerprint):
+        if self.store is not None:
+            self.store.put('plugins', 'fingerprint', fingerprint)
+            return
+
+        self.persistence.save(self.fingerprint_path, {'fingerprint': fingerprint})
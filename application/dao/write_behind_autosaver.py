@@ -0,0 +1,293 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from glob import glob
+
+from application.dao.atomic_persistence import AtomicPersistence
+from application.dao.banks_reader import BanksReader
+from application.dao.lazy_bank import LazyBank
+from pluginsmanager.observer.autosaver.autosaver import Autosaver
+from pluginsmanager.observer.autosaver.banks_files import BanksFiles
+from pluginsmanager.observer.autosaver.index_file import IndexFile
+
+
+class WriteBehindAutosaver(Autosaver):
+    """
+    :class:`.Autosaver` that doesn't rewrite the bank file in each change.
+
+    Sweeping a knob changes a param many times per second, and the :class:`.Autosaver`
+    rewrites the whole bank file for each change. This autosaver only marks the
+    bank as dirty; the dirty banks are written (:class:`.AtomicPersistence`)
+    ``interval`` seconds after the first change, or when :meth:`flush` is called::
+
+        >>> autosaver = WriteBehindAutosaver('data/banks', interval=1)
+        >>> for value in range(100):
+        ...     param.value = value
+        >>> autosaver.flush()
+        >>> autosaver.banks_files.writes, autosaver.banks_files.writes_avoided
+        (1, 99)
+
+    The banks removal and the manual :meth:`save` are applied immediately.
+    A removal writes the dirty banks before, then a replaced bank is removed only
+    after its replacement is written.
+
+    With a :class:`.DataStore`, the banks (namespace ``banks``) and the index (``banks_index``)
+    are persisted in the store and the dirty banks of a flush are written in a single transaction.
+
+    :param string data_path: Path that banks will be saved (each bank in one file)
+    :param float interval: Maximum time (in seconds) that a change waits to be written
+    :param bool auto_save: Auto save any change?
+    :param DataStore store: Persists the banks in the store instead of the ``data_path`` files
+    """
+
+    def __init__(self, data_path, interval=1, auto_save=True, store=None):
+        super(WriteBehindAutosaver, self).__init__(data_path, auto_save)
+
+        self.banks_files = WriteBehindBanksFiles(self.data_path, interval, store)
+        """
+        :class:`.WriteBehindBanksFiles` with the write-behind counters
+        """
+
+        if store is not None:
+            self.index_file = StoreIndexFile(store)
+
+    def load(self, system_effect):
+        manager = super(WriteBehindAutosaver, self).load(system_effect)
+
+        # The banks appended in the load are equals to their files
+        self.banks_files.discard()
+
+        return manager
+
+    def save(self, banks_manager):
+        super(WriteBehindAutosaver, self).save(banks_manager)
+        self.flush()
+
+    def flush(self):
+        """
+        Writes the dirty banks immediately
+        """
+        self.banks_files.flush()
+
+
+class WriteBehindBanksFiles(BanksFiles):
+    """
+    :class:`.BanksFiles` used by :class:`.WriteBehindAutosaver`: :meth:`save_bank`
+    marks the bank as dirty, written in the next :meth:`flush`.
+
+    The bank is serialized by :meth:`save_bank`, in the thread that changed it; :meth:`flush`
+    (called by a timer thread) only writes the serialized data, so it doesn't read the
+    banks while they are changed. The files are written out of the lock used by
+    :meth:`save_bank`: a slow write (fsync) doesn't block the banks changes.
+
+    :param Path data_path: Path that contains the banks
+    :param float interval: Maximum time (in seconds) that a dirty bank waits to be written
+    :param DataStore store: Persists the banks (and their :meth:`.LazyBank.stub_data`) in the store
+    """
+
+    def __init__(self, data_path, interval=1, store=None):
+        super(WriteBehindBanksFiles, self).__init__(data_path)
+        self.interval = interval
+        self.store = store
+
+        self.requests = 0
+        """
+        int: Number of bank saves requested
+        """
+        self.writes = 0
+        """
+        int: Number of bank files written
+        """
+        self.flushes = 0
+        """
+        int: Number of flushes that wrote files
+        """
+        self.last_flush_duration = 0
+        """
+        float: Duration (in seconds) of the last flush that wrote files
+        """
+        self.max_flush_duration = 0
+        """
+        float: Maximum flush duration (in seconds)
+        """
+
+        self._dirty = OrderedDict()
+        self._timer = None
+        self._lock = threading.RLock()
+        # Serializes the writes and removals, so a bank is never removed before an older write
+        self._write_lock = threading.RLock()
+
+    @property
+    def dirty(self):
+        """
+        :return tuple(Bank): Banks with changes not written
+        """
+        with self._lock:
+            return tuple(bank for bank, json in self._dirty.values())
+
+    @property
+    def writes_avoided(self):
+        """
+        :return int: Number of bank saves requested that didn't need a file write
+        """
+        return self.requests - self.writes - len(self._dirty)
+
+    def load(self, system_effect):
+        if self.store is None:
+            return super(WriteBehindBanksFiles, self).load(system_effect)
+
+        reader = BanksReader(system_effect)
+
+        banks = []
+        for uuid, json in self.store.items('banks'):
+            bank = reader.read(json)
+            bank._uuid = uuid
+            banks.append(bank)
+
+        return banks
+
+    def save_bank(self, bank):
+        json = bank.json
+
+        with self._lock:
+            self.requests += 1
+            self._dirty[bank.uuid] = (bank, json)
+
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def delete_bank(self, bank):
+        """
+        Removes the bank file (or store records). The other dirty banks are written before:
+        a replaced bank (``manager.banks[index] = new_bank``) is only removed after its
+        replacement is persisted.
+
+        :param Bank bank: Removed bank
+        """
+        with self._write_lock:
+            with self._lock:
+                self._dirty.pop(bank.uuid, None)
+
+            if self.store is not None:
+                with self.store.transaction():
+                    self.flush()
+                    self.store.delete('banks', bank.uuid)
+                    self.store.delete('banks_summary', bank.uuid)
+            else:
+                self.flush()
+                self._delete(self._bank_path(bank))
+
+    def delete_all_banks(self):
+        with self._write_lock:
+            with self._lock:
+                self._dirty.clear()
+
+            if self.store is not None:
+                with self.store.transaction():
+                    self.store.clear('banks')
+                    self.store.clear('banks_summary')
+            else:
+                for file in glob(str(self.data_path) + "/*.json"):
+                    self._delete(file)
+
+    def discard(self):
+        """
+        Discards the changes not written
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            self._dirty.clear()
+
+    @staticmethod
+    def _delete(path):
+        try:
+            os.remove(str(path))
+        except FileNotFoundError:
+            pass
+
+    def flush(self):
+        """
+        Writes the dirty banks
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+                dirty, self._dirty = self._dirty, OrderedDict()
+
+            if not dirty:
+                return
+
+            start = time.perf_counter()
+            try:
+                if self.store is not None:
+                    self._write_store(dirty)
+                else:
+                    self._write_files(dirty)
+            except Exception:
+                self._restore(dirty)
+                raise
+
+            duration = time.perf_counter() - start
+            self.flushes += 1
+            self.last_flush_duration = duration
+            self.max_flush_duration = max(self.max_flush_duration, duration)
+
+    def _restore(self, dirty):
+        with self._lock:
+            # The banks changed during the write are newer
+            for uuid, (bank, json) in dirty.items():
+                if uuid not in self._dirty:
+                    self._dirty[uuid] = (bank, json)
+
+    def _write_files(self, dirty):
+        for bank, json in dirty.values():
+            AtomicPersistence.save(self._bank_path(bank), json)
+            self.writes += 1
+
+    def _write_store(self, dirty):
+        with self.store.transaction():
+            for bank, json in dirty.values():
+                self.store.put('banks', bank.uuid, json)
+                self.store.put('banks_summary', bank.uuid, LazyBank.stub_data(json))
+                self.writes += 1
+
+
+class StoreIndexFile(IndexFile):
+    """
+    Banks index (``IndexFile``) persisted in a :class:`.DataStore` (record ``banks_index``)
+
+    :param DataStore store: Store where the index is persisted
+    """
+
+    def __init__(self, store):
+        super(StoreIndexFile, self).__init__(None)
+        self.store = store
+
+    def load(self, indexables):
+        return self.load_data(self.store.get('banks_index', 'index', []), indexables)
+
+    def save(self, indexables):
+        self.store.put('banks_index', 'index', self.generate_data(indexables))
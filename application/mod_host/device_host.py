@@ -0,0 +1,79 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from application.mod_host.feedback_reader import FeedbackReader
+from application.mod_host.pipelined_connection import PipelinedConnection
+from pluginsmanager.observer.mod_host.host import Host
+
+
+class DeviceHost(Host):
+    """
+    :class:`.Host` used by :class:`.DeviceModHost`. The commands are sent by
+    a :class:`.PipelinedConnection`::
+
+        >>> with host.pipeline():
+        ...     host.add(reverb)
+        ...     host.connect(connection)
+
+    The feedback port (``port + 1``) is drained by a :class:`.FeedbackReader` (:attr:`connection_fd`).
+
+    :param string address: mod-host address
+    :param int port: mod-host commands port
+    :param function feedback_listener: Function called with each feedback message
+    """
+
+    def __init__(self, address='localhost', port=5555, feedback_listener=None):
+        self.connection = None
+        self.connection_fd = None
+        self.feedback_listener = feedback_listener
+
+        try:
+            self.connection = PipelinedConnection(port, address)
+        except ConnectionRefusedError as e:
+            raise ConnectionRefusedError(str(e) + '. Do you starts mod-host?') from e
+
+        self.connection_fd = self._connect_feedback(address, port+1)
+
+        self.instance_index = 0
+
+    def _connect_feedback(self, address, port):
+        try:
+            return FeedbackReader(port, address, self.feedback_listener)
+        except ConnectionRefusedError:
+            logging.info('Mod-host - Feedback socket is not enabled')
+            logging.info('           Try start Mod-host using: mod-host -f {}'.format(port))
+            return None
+
+    def reconnect(self):
+        """
+        Opens again the connections with a (restarted) mod-host.
+        The instances numbers are restarted
+
+        :raises OSError: If mod-host isn't reachable
+        """
+        self.connection.connect()
+
+        if self.connection_fd is not None:
+            self.connection_fd.close()
+        self.connection_fd = self._connect_feedback(self.connection.address, self.connection.port + 1)
+
+        self.instance_index = 0
+
+    def pipeline(self):
+        """
+        Pipelines the commands sent in the ``with`` block (see :meth:`.PipelinedConnection.pipeline`)
+        """
+        return self.connection.pipeline()
@@ -0,0 +1,409 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from application.mod_host.device_host import DeviceHost
+from application.mod_host.pedalboard_transition import PedalboardTransition
+from pluginsmanager.observer.mod_host.mod_host import ModHost
+from pluginsmanager.observer.update_type import UpdateType
+
+
+class DeviceModHost(ModHost):
+    """
+    :class:`.ModHost` specialization used by :class:`.DeviceController`.
+
+    Besides the current pedalboard, it can keep other pedalboards in *standby*:
+    their effects are loaded in mod-host with the params applied, but they are
+    bypassed and without connections. Changing the current pedalboard to a
+    standby pedalboard only swaps the connections and the bypass states,
+    instead of removing and adding all the effects::
+
+        >>> mod_host.max_standby_pedalboards = 4
+        >>> mod_host.preload([next_pedalboard, before_pedalboard])
+        >>> mod_host.pedalboard = next_pedalboard  # Only connections and bypass changes
+
+    When the current pedalboard changes, the old current pedalboard is kept in standby.
+    The standby pedalboards are evicted by the least recently used policy, bounded by
+    :attr:`max_standby_pedalboards` and :attr:`max_standby_instances`.
+
+    If ``max_standby_pedalboards == 0`` (default), the standby mode is disabled.
+    In this case, the pedalboard change applies only the differences between the
+    pedalboards, planned by :class:`.PedalboardTransition`::
+
+        >>> mod_host.pedalboard = new_pedalboard
+        >>> mod_host.last_transition.operations
+        3
+
+    The commands of a pedalboard change and of a preload are pipelined
+    (see :meth:`pipeline`).
+
+    The params changed by MIDI controllers or by the hardware, informed by the
+    mod-host feedback port, are applied in the model (see :meth:`on_feedback`).
+
+    The pedalboard changes, the pipelined commands (see :meth:`pipeline`), the reconnection
+    restore and the feedback changes are serialized by :attr:`lock`.
+
+    :param string address: Computer mod-host process address (IP)
+    :param int port: Socket port on which mod-host should be running
+    """
+
+    def __init__(self, address='localhost', port=5555):
+        super(DeviceModHost, self).__init__(address, port)
+
+        self.max_standby_pedalboards = 0
+        """
+        Maximum number of pedalboards kept in standby (the current pedalboard is not included)
+        """
+        self.max_standby_instances = 32
+        """
+        Maximum number of effects instances loaded by the standby pedalboards
+        """
+
+        self._standby = OrderedDict()
+
+        self.lock = threading.RLock()
+        """
+        Lock held while the current and standby pedalboards are changed or read
+        by the commands and by the feedback. Reentrant
+        """
+
+        self.last_transition = None
+        """
+        :class:`.PedalboardTransition` used in the last pedalboard change
+        (``None`` if the last change doesn't use a transition)
+        """
+
+    @property
+    def standby(self):
+        """
+        :return tuple(Pedalboard): Pedalboards in standby, ordered from the least to the most recently used
+        """
+        return tuple(self._standby.keys())
+
+    @property
+    def standby_instances(self):
+        """
+        :return int: Total of effects instances loaded by the standby pedalboards
+        """
+        return sum(len(pedalboard.effects) for pedalboard in self._standby)
+
+    @property
+    def feedback(self):
+        """
+        :return FeedbackReader: Reader of the mod-host feedback port (with the throughput and lag metrics).
+                                ``None`` if the feedback port is not enabled
+        """
+        if not isinstance(self.host, DeviceHost):
+            return None
+
+        return self.host.connection_fd
+
+    def connect(self):
+        self.host = DeviceHost(self.address, self.port, self.on_feedback)
+
+    def on_feedback(self, message):
+        """
+        Applies a mod-host feedback message. A param change (``param_set <instance> <symbol> <value>``)
+        of a loaded effect changes the param value in the model. The change is notified
+        for the observers (as :class:`.ComponentsObserver`), except for this mod-host.
+
+        It's called by the feedback reader thread, that holds :attr:`lock` while the
+        change is applied and notified. Then the observers are notified in the feedback
+        reader thread: they must not block or wait another thread that changes the
+        pedalboards (use an asynchronous observer, see :meth:`.Application.register_observer`).
+
+        :param string message: Feedback message
+        """
+        arguments = message.split()
+        if len(arguments) != 4 or arguments[0] != 'param_set':
+            return
+
+        with self.lock:
+            self._apply_feedback(*arguments[1:])
+
+    def _apply_feedback(self, instance, symbol, value):
+        effect = self._loaded_effect(int(instance))
+        if effect is None or symbol not in effect.params:
+            return
+
+        param = effect.params[symbol]
+        value = min(max(float(value), param.minimum), param.maximum)
+
+        bank = effect.pedalboard.bank
+        manager = bank.manager if bank is not None else None
+        if manager is None:
+            param.value = value
+            return
+
+        manager.enter_scope(self)
+        try:
+            param.value = value
+        finally:
+            manager.exit_scope()
+
+    def _loaded_effect(self, instance):
+        pedalboards = list(self._standby)
+        if self.pedalboard is not None:
+            pedalboards.append(self.pedalboard)
+
+        for pedalboard in pedalboards:
+            for effect in pedalboard.effects:
+                if effect.instance == instance:
+                    return effect
+
+        return None
+
+    def restore(self, pedalboard):
+        """
+        Loads the pedalboard again in mod-host, after a reconnection
+        (see :class:`.ModHostSupervisor`). The instances of a restarted mod-host
+        are lost, then all are removed and the standby pedalboards are discarded.
+
+        :param Pedalboard pedalboard: Current pedalboard
+        """
+        with self.pipeline():
+            self.host.connection.send('remove -1')
+            self.host.instance_index = 0
+
+            self._standby.clear()
+            self._pedalboard = None
+            self.last_transition = None
+
+            self.pedalboard = pedalboard
+
+    @contextmanager
+    def pipeline(self):
+        """
+        The mod-host commands sent in the ``with`` block are pipelined:
+        sent back-to-back, without wait each response (see :class:`.PipelinedConnection`)::
+
+            >>> with mod_host.pipeline():
+            ...     pedalboard.append(reverb)
+            ...     pedalboard.connect(reverb.outputs[0], sys_effect.inputs[0])
+
+        :attr:`lock` is held in the ``with`` block.
+        """
+        with self.lock:
+            pipeline = getattr(self.host, 'pipeline', None)
+            if pipeline is None:
+                yield
+                return
+
+            with pipeline():
+                yield
+
+    def preload(self, pedalboards):
+        """
+        Loads the pedalboards in standby. The pedalboards are informed by priority:
+        the pedalboards that exceed the standby limits are ignored.
+
+        :param list[Pedalboard] pedalboards: Pedalboards that will be loaded in standby
+        """
+        if not self.max_standby_pedalboards:
+            return
+
+        wanted = []
+        instances = 0
+        for pedalboard in pedalboards:
+            if pedalboard is None or pedalboard == self.pedalboard or pedalboard in wanted:
+                continue
+
+            instances += len(pedalboard.effects)
+            if len(wanted) == self.max_standby_pedalboards or instances > self.max_standby_instances:
+                break
+
+            wanted.append(pedalboard)
+
+        with self.pipeline():
+            # The most priority will be the most recently used
+            for pedalboard in reversed(wanted):
+                if pedalboard in self._standby:
+                    self._standby.move_to_end(pedalboard)
+                else:
+                    self._load_standby(pedalboard)
+
+            self._evict()
+
+    def close(self):
+        if self.host is not None:
+            with self.pipeline():
+                self._unload_all_standby()
+
+        super(DeviceModHost, self).close()
+
+    ####################################
+    # Observer
+    ####################################
+    def on_current_pedalboard_changed(self, pedalboard, **kwargs):
+        with self.pipeline():
+            self._change_current_pedalboard(pedalboard, **kwargs)
+
+    def _change_current_pedalboard(self, pedalboard, **kwargs):
+        self.last_transition = None
+
+        if not self.max_standby_pedalboards or pedalboard is None:
+            self._unload_all_standby()
+            super(DeviceModHost, self).on_current_pedalboard_changed(pedalboard, **kwargs)
+            return
+
+        current = self.pedalboard
+        if current is not None:
+            self._deactivate(current)
+
+        if pedalboard in self._standby:
+            del self._standby[pedalboard]
+            for effect in pedalboard.effects:
+                self._set_effect_status(effect)
+        else:
+            for effect in pedalboard.effects:
+                self._load_effect(effect)
+                self._set_effect_status(effect)
+
+        self._pedalboard = pedalboard
+        for connection in pedalboard.connections:
+            self._connect(connection)
+
+        self._evict()
+
+    def on_bank_updated(self, bank, update_type, **kwargs):
+        with self.lock:
+            self._evict_detached()
+            super(DeviceModHost, self).on_bank_updated(bank, update_type, **kwargs)
+
+    def on_pedalboard_updated(self, pedalboard, update_type, **kwargs):
+        with self.lock:
+            self._evict_detached()
+            super(DeviceModHost, self).on_pedalboard_updated(pedalboard, update_type, **kwargs)
+
+    def on_effect_updated(self, effect, update_type, index, origin, **kwargs):
+        with self.pipeline():
+            self._update_effect(effect, update_type, index, origin, **kwargs)
+
+    def _update_effect(self, effect, update_type, index, origin, **kwargs):
+        if origin not in self._standby:
+            super(DeviceModHost, self).on_effect_updated(effect, update_type, index, origin, **kwargs)
+
+        elif update_type == UpdateType.CREATED:
+            self._load_effect(effect)
+            self._bypass(effect)
+
+        elif update_type == UpdateType.DELETED:
+            self._remove_effect(effect)
+
+    def on_param_value_changed(self, param, **kwargs):
+        with self.lock:
+            if param.effect.pedalboard in self._standby:
+                self._set_param_value(param)
+            else:
+                super(DeviceModHost, self).on_param_value_changed(param, **kwargs)
+
+    ####################################
+    # Private methods
+    ####################################
+    def _replace_pedalboard(self, current, pedalboard):
+        transition = PedalboardTransition(current, pedalboard)
+
+        for connection in transition.connections_to_disconnect:
+            self._disconnect(connection)
+
+        for effect in transition.effects_to_remove:
+            self._remove_effect(effect)
+
+        for current_effect, new_effect in transition.pairs:
+            new_effect.instance = current_effect.instance
+
+        for param in transition.params_to_set:
+            self._set_param_value(param)
+
+        for effect in transition.effects_to_toggle:
+            self._set_effect_status(effect)
+
+        # Changes are only updated if self._pedalboard = pedalboard
+        self._pedalboard = pedalboard
+
+        for effect in transition.effects_to_add:
+            self._load_effect(effect)
+            self._set_effect_status(effect)
+
+        for connection in transition.connections_to_connect:
+            self._connect(connection)
+
+        self.last_transition = transition
+
+    def _remove_pedalboard(self, pedalboard):
+        effects = set(pedalboard.effects)
+        self._remove_effects(pedalboard.effects)
+
+        # mod-host removes the connections of the removed effects with the effect instance
+        for connection in pedalboard.connections:
+            if connection.output.effect not in effects and connection.input.effect not in effects:
+                self.on_connection_updated(connection, UpdateType.DELETED, pedalboard=pedalboard)
+
+    ####################################
+    # Standby
+    ####################################
+    def _load_effect(self, effect):
+        self._add_effect(effect)
+        self._load_params_of(effect)
+
+    def _bypass(self, effect):
+        # Same value convention used by ProtocolParser.bypass for a not active effect
+        self.host.connection.send('bypass {} {}'.format(effect.instance, 0))
+
+    def _deactivate(self, pedalboard):
+        """
+        Moves the pedalboard to standby
+        """
+        for connection in pedalboard.connections:
+            self._disconnect(connection)
+
+        for effect in pedalboard.effects:
+            self._bypass(effect)
+
+        self._standby[pedalboard] = True
+
+    def _load_standby(self, pedalboard):
+        for effect in pedalboard.effects:
+            self._load_effect(effect)
+            self._bypass(effect)
+
+        self._standby[pedalboard] = True
+
+    def _unload_standby(self, pedalboard):
+        for effect in pedalboard.effects:
+            self._remove_effect(effect)
+
+        del self._standby[pedalboard]
+
+    def _unload_all_standby(self):
+        for pedalboard in self.standby:
+            self._unload_standby(pedalboard)
+
+    def _evict(self):
+        while self._standby \
+        and (len(self._standby) > self.max_standby_pedalboards
+             or self.standby_instances > self.max_standby_instances):
+            least_recently_used = next(iter(self._standby))
+            self._unload_standby(least_recently_used)
+
+    def _evict_detached(self):
+        """
+        Unload the standby pedalboards removed of the banks manager
+        """
+        for pedalboard in self.standby:
+            if pedalboard.bank is None or pedalboard.bank.manager is None:
+                self._unload_standby(pedalboard)
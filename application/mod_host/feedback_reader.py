@@ -0,0 +1,139 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+
+
+class FeedbackReader(object):
+    """
+    Drains the `mod-host`_ feedback port (``mod-host -f <port>``) in a dedicated thread.
+
+    mod-host sends by the feedback port the changes that don't come from the commands
+    port, as the params changed by a MIDI controller (``param_set 0 gain 2.5``) and the
+    output ports monitoring (``output_set 0 level 0.8``). Each message is informed
+    to the ``listener``, in the reader thread, as soon as it is received
+    (:meth:`.DeviceModHost.on_feedback` synchronizes the model changes)::
+
+        >>> reader = FeedbackReader(5556, 'localhost', listener=print)
+        param_set 0 gain 2.5
+        >>> reader.messages, reader.throughput, reader.max_lag
+        (1, 25000.0, 0.00004)
+
+    The lag of a message is the time between its receiving and the end of its
+    listener call. A burst of messages received together increases the lag of the last ones.
+
+    :param int socket_port: mod-host feedback port
+    :param string address: mod-host address
+    :param function listener: Function called with each message (string)
+
+    .. _mod-host: https://github.com/moddevices/mod-host
+    """
+
+    def __init__(self, socket_port=5556, address='localhost', listener=None):
+        self.listener = listener
+
+        self.messages = 0
+        """
+        int: Number of messages received
+        """
+        self.last_lag = 0
+        """
+        float: Lag (seconds) of the last message
+        """
+        self.max_lag = 0
+        """
+        float: Maximum lag (seconds)
+        """
+        self._total_lag = 0
+        self._busy = 0
+
+        self.client = socket.create_connection((address, socket_port))
+
+        self._thread = threading.Thread(target=self._run, name='FeedbackReader', daemon=True)
+        self._thread.start()
+
+    @property
+    def mean_lag(self):
+        """
+        :return float: Mean lag (seconds) of the messages
+        """
+        return self._total_lag / self.messages if self.messages else 0
+
+    @property
+    def throughput(self):
+        """
+        :return float: Messages handled by second (only the time spent handling the messages is considered)
+        """
+        return self.messages / self._busy if self._busy else 0
+
+    def _run(self):
+        # The pluginsmanager autosaver (Persistence.save) requires an asyncio event loop in the thread
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        buffer = b''
+
+        while True:
+            try:
+                data = self.client.recv(4096)
+            except OSError:
+                break
+
+            if not data:
+                break
+
+            received = time.perf_counter()
+            *messages, buffer = (buffer + data).split(b'\0')
+
+            for message in messages:
+                if message:
+                    self._handle(message.decode('utf-8'), received)
+
+        loop.close()
+        logging.info('Mod-host - Feedback socket closed')
+
+    def _handle(self, message, received):
+        start = time.perf_counter()
+
+        try:
+            if self.listener is not None:
+                self.listener(message)
+        except Exception:
+            logging.exception('Mod-host - Feedback message "{}" fails'.format(message))
+
+        end = time.perf_counter()
+        lag = end - received
+
+        self.messages += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self._total_lag += lag
+        self._busy += end - start
+
+    def close(self):
+        """
+        Closes the feedback socket and waits the reader thread
+        """
+        try:
+            self.client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.client.close()
+
+        if self._thread is not threading.current_thread():
+            self._thread.join()
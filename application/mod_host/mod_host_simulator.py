@@ -0,0 +1,448 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runs a mod-host simulator in a terminal::
+
+    python3 -m application.mod_host.mod_host_simulator --port 5555 --latency 0.002
+"""
+
+import argparse
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+
+
+class ModHostSimulator(object):
+    """
+    Local `mod-host`_ replacement that speaks the mod-host socket protocol,
+    without JACK and audio plugins. It keeps a model of the loaded
+    :attr:`instances`, :attr:`connections` and params values::
+
+        >>> simulator = ModHostSimulator(port=5555, latency=0.002)
+        >>> simulator.start()
+        >>> application = Application(path_data='data/', address='localhost', port=simulator.port)
+        >>> application.start()
+        >>> simulator.instances
+        {0: {'uri': 'http://calf.sourceforge.net/plugins/Reverb', 'bypass': 1, 'params': {}}, ...}
+        >>> simulator.statistics
+        Counter({'add': 3, 'connect': 4, 'bypass': 3})
+
+    The commands are processed one at a time (as mod-host), each one spending
+    the configured latency. Then the throughput is ``1 / latency`` commands per second::
+
+        >>> simulator.latency = 0.001
+        >>> simulator.latencies['add'] = 0.020  # Plugin instantiation
+
+    The commands can be sent one by one (waiting each response) or pipelined,
+    terminated by ``\\0``. The network is simulated by the :attr:`round_trip` time:
+    each response is sent ``round_trip`` seconds after the command is processed::
+
+        >>> simulator.round_trip = 0.005
+
+    The feedback port (``port + 1``) sends the messages informed in :meth:`feedback`
+    to the connected clients.
+
+    :meth:`restart` simulates a mod-host restart (as after a crash): the clients
+    are disconnected and the instances are lost.
+
+    :param string address: Address that the simulator listens
+    :param int port: Commands socket port. If ``None``, uses the first pair of free ports
+                     (``port`` and ``port + 1``) from ``15555``
+    :param float latency: Processing time of each command (in seconds)
+    :param float round_trip: Network round trip time (in seconds)
+    :param bool record: Records each command received in :attr:`commands`
+
+    .. _mod-host: https://github.com/moddevices/mod-host
+    """
+
+    SUCCESS = 0
+    ERR_INSTANCE_INVALID = -1
+    ERR_INSTANCE_ALREADY_EXISTS = -2
+    ERR_INSTANCE_NON_EXISTS = -3
+    ERR_LV2_INVALID_PARAM_SYMBOL = -103
+    ERR_JACK_PORT_CONNECTION = -205
+    ERR_JACK_PORT_DISCONNECTION = -206
+    ERR_INVALID_OPERATION = -902
+
+    def __init__(self, address='localhost', port=5555, latency=0, round_trip=0, record=True):
+        self.address = address
+        self.latency = latency
+        self.round_trip = round_trip
+        self.latencies = {}
+        """
+        dict: Processing time of specific commands (as ``{'add': 0.02}``). The others uses :attr:`latency`
+        """
+        self.record = record
+
+        self.instances = {}
+        """
+        dict: Loaded instances by the instance number: ``{'uri': uri, 'bypass': value, 'params': {symbol: value}}``.
+        Only the params changed by ``param_set`` are in ``params``
+        """
+        self.connections = set()
+        """
+        set of tuple(string, string): Connected ports (origin, destination)
+        """
+        self.commands = []
+        """
+        list of tuple(float, string): Commands received and their ``time.perf_counter()`` time
+        (if :attr:`record`)
+        """
+        self.statistics = Counter()
+        """
+        Counter: Number of commands received by command name
+        """
+
+        self._lock = threading.Lock()
+        self._commands_clients = []
+        self._feedback_clients = []
+
+        self.port, self._servers = self._bind(port)
+
+    ####################################
+    # Server
+    ####################################
+    def _bind(self, port):
+        ports = range(15555, 16555, 2) if port is None else [port]
+
+        for port in ports:
+            try:
+                commands = self._server(port, self._commands_handler())
+            except OSError:
+                continue
+
+            try:
+                feedback = self._server(port + 1, self._feedback_handler())
+            except OSError:
+                commands.server_close()
+                continue
+
+            return port, (commands, feedback)
+
+        raise OSError('There is no free port for the mod-host simulator')
+
+    def _server(self, port, handler):
+        server = socketserver.ThreadingTCPServer((self.address, port), handler, bind_and_activate=False)
+        server.daemon_threads = True
+        server.allow_reuse_address = True
+        try:
+            server.server_bind()
+            server.server_activate()
+        except OSError:
+            server.server_close()
+            raise
+
+        return server
+
+    def start(self):
+        """
+        Starts to listen the commands and feedback ports in background threads
+        """
+        for server in self._servers:
+            # Short poll interval for a fast stop
+            threading.Thread(
+                target=server.serve_forever, kwargs={'poll_interval': 0.05}, name='ModHostSimulator', daemon=True
+            ).start()
+
+    def stop(self):
+        """
+        Closes the ports
+        """
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+        self._disconnect_clients()
+
+    def restart(self):
+        """
+        Simulates a mod-host restart: closes the clients connections
+        and removes all instances and connections
+        """
+        self._disconnect_clients()
+
+        with self._lock:
+            self.instances.clear()
+            self.connections.clear()
+
+    def _disconnect_clients(self):
+        with self._lock:
+            clients = self._commands_clients + self._feedback_clients
+
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.close()
+
+    def _commands_handler(self):
+        simulator = self
+
+        class CommandsHandler(socketserver.BaseRequestHandler):
+
+            def handle(self):
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with simulator._lock:
+                    simulator._commands_clients.append(self.request)
+
+                responses = queue.Queue()
+                sender = threading.Thread(target=self.send_responses, args=(responses, ), daemon=True)
+                sender.start()
+
+                try:
+                    self.receive_commands(responses)
+                except OSError:
+                    pass
+                finally:
+                    responses.put(None)
+                    with simulator._lock:
+                        simulator._commands_clients.remove(self.request)
+
+            def receive_commands(self, responses):
+                buffer = b''
+                terminated = False
+                while True:
+                    data = self.request.recv(4096)
+                    if not data:
+                        return
+
+                    buffer += data
+                    if b'\0' in buffer:
+                        terminated = True
+                        *messages, buffer = buffer.split(b'\0')
+                    elif terminated:
+                        continue
+                    else:
+                        # A client that doesn't terminate the messages sends one by one
+                        messages, buffer = [buffer], b''
+
+                    for message in messages:
+                        if message:
+                            response = simulator.process(message.decode('utf-8'))
+                            responses.put((time.perf_counter() + simulator.round_trip, response))
+
+            def send_responses(self, responses):
+                # The responses are delayed by the round trip without delay the next commands processing
+                while True:
+                    item = responses.get()
+                    if item is None:
+                        return
+
+                    due, response = item
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                    try:
+                        self.request.sendall('{}\0'.format(response).encode('utf-8'))
+                    except OSError:
+                        return
+
+        return CommandsHandler
+
+    def _feedback_handler(self):
+        simulator = self
+
+        class FeedbackHandler(socketserver.BaseRequestHandler):
+
+            def handle(self):
+                with simulator._lock:
+                    simulator._feedback_clients.append(self.request)
+
+                try:
+                    while self.request.recv(1024):
+                        pass
+                except OSError:
+                    pass
+                finally:
+                    with simulator._lock:
+                        simulator._feedback_clients.remove(self.request)
+
+        return FeedbackHandler
+
+    def feedback(self, message):
+        """
+        Sends a message (as ``'param_set 0 gain 2.5'``) for the clients
+        connected in the feedback port
+
+        :param string message: Feedback message
+        """
+        data = '{}\0'.format(message).encode('utf-8')
+
+        with self._lock:
+            clients = list(self._feedback_clients)
+
+        for client in clients:
+            client.sendall(data)
+
+    ####################################
+    # Protocol
+    ####################################
+    def process(self, message):
+        """
+        Processes a command, spending its latency
+
+        :param string message: Command (as ``'add http://calf.sourceforge.net/plugins/Reverb 0'``)
+        :return string: Response (as ``'resp 0'``)
+        """
+        arguments = message.split()
+        command = arguments[0] if arguments else ''
+
+        with self._lock:
+            received = time.perf_counter()
+
+            latency = self.latencies.get(command, self.latency)
+            if latency:
+                time.sleep(latency)
+
+            if self.record:
+                self.commands.append((received, message))
+            self.statistics[command] += 1
+
+            method = getattr(self, '_command_' + command, None)
+            if method is None:
+                return self._response(self.ERR_INVALID_OPERATION)
+
+            try:
+                return method(*arguments[1:])
+            except (TypeError, ValueError):
+                return self._response(self.ERR_INVALID_OPERATION)
+
+    @staticmethod
+    def _response(status, value=None):
+        if value is None:
+            return 'resp {}'.format(status)
+
+        return 'resp {} {}'.format(status, value)
+
+    def _command_add(self, uri, instance):
+        instance = int(instance)
+        if instance < 0:
+            return self._response(self.ERR_INSTANCE_INVALID)
+        if instance in self.instances:
+            return self._response(self.ERR_INSTANCE_ALREADY_EXISTS)
+
+        self.instances[instance] = {'uri': uri, 'bypass': 0, 'params': {}}
+        return self._response(instance)
+
+    def _command_remove(self, instance):
+        instance = int(instance)
+
+        if instance == -1:
+            self.instances.clear()
+            self.connections.clear()
+            return self._response(self.SUCCESS)
+
+        if instance not in self.instances:
+            return self._response(self.ERR_INSTANCE_NON_EXISTS)
+
+        del self.instances[instance]
+
+        prefix = 'effect_{}:'.format(instance)
+        self.connections = {
+            connection for connection in self.connections
+            if not connection[0].startswith(prefix) and not connection[1].startswith(prefix)
+        }
+
+        return self._response(self.SUCCESS)
+
+    def _command_connect(self, origin, destination):
+        if not self._port_exists(origin) or not self._port_exists(destination):
+            return self._response(self.ERR_JACK_PORT_CONNECTION)
+
+        self.connections.add((origin, destination))
+        return self._response(self.SUCCESS)
+
+    def _command_disconnect(self, origin, destination):
+        if (origin, destination) not in self.connections:
+            return self._response(self.ERR_JACK_PORT_DISCONNECTION)
+
+        self.connections.remove((origin, destination))
+        return self._response(self.SUCCESS)
+
+    def _command_bypass(self, instance, value):
+        instance = int(instance)
+        if instance not in self.instances:
+            return self._response(self.ERR_INSTANCE_NON_EXISTS)
+
+        self.instances[instance]['bypass'] = int(value)
+        return self._response(self.SUCCESS)
+
+    def _command_param_set(self, instance, symbol, value):
+        instance = int(instance)
+        if instance not in self.instances:
+            return self._response(self.ERR_INSTANCE_NON_EXISTS)
+
+        self.instances[instance]['params'][symbol] = float(value)
+        return self._response(self.SUCCESS)
+
+    def _command_param_get(self, instance, symbol):
+        instance = int(instance)
+        if instance not in self.instances:
+            return self._response(self.ERR_INSTANCE_NON_EXISTS)
+
+        params = self.instances[instance]['params']
+        if symbol not in params:
+            return self._response(self.ERR_LV2_INVALID_PARAM_SYMBOL)
+
+        return self._response(self.SUCCESS, params[symbol])
+
+    def _command_cpu_load(self):
+        return self._response(self.SUCCESS, 0.0)
+
+    def _command_quit(self):
+        return self._response(self.SUCCESS)
+
+    def _port_exists(self, port):
+        client, _, symbol = port.partition(':')
+        if not symbol:
+            return False
+
+        if not client.startswith('effect_'):
+            # JACK clients, as the system capture and playback
+            return True
+
+        try:
+            return int(client[len('effect_'):]) in self.instances
+        except ValueError:
+            return False
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='mod-host simulator')
+    parser.add_argument('--address', default='localhost', help='Address that the simulator listens')
+    parser.add_argument('--port', type=int, default=5555, help='Commands socket port (feedback uses port + 1)')
+    parser.add_argument('--latency', type=float, default=0, help='Processing time of each command (in seconds)')
+    parser.add_argument('--round-trip', type=float, default=0, help='Network round trip time (in seconds)')
+    args = parser.parse_args(args)
+
+    simulator = ModHostSimulator(args.address, args.port, latency=args.latency, round_trip=args.round_trip,
+                                 record=False)
+    simulator.start()
+    print('mod-host simulator listening {}:{}'.format(args.address, simulator.port))
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
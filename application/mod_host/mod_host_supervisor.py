@@ -0,0 +1,180 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+
+
+class ModHostSupervisor(object):
+    """
+    Supervises the :class:`.DeviceModHost` connection in a background thread.
+
+    A heartbeat command checks if mod-host is alive each :attr:`heartbeat` seconds.
+    When the connection fails (in the heartbeat or in any command), the supervisor
+    tries to reconnect with exponential backoff (:attr:`backoff` doubling
+    until :attr:`max_backoff`). After the reconnection, ``restore`` is called
+    for load the current pedalboard again. If ``restore`` raises an exception or the
+    connection is lost during it, the attempt fails and the next one waits the backoff::
+
+        >>> supervisor = ModHostSupervisor(mod_host, lambda: mod_host.restore(current_controller.pedalboard))
+        >>> supervisor.start()
+        >>> # mod-host restarts
+        >>> supervisor.reconnections
+        1
+        >>> supervisor.last_reconnect_time
+        0.21
+
+    The commands sent while disconnected are queued (see :attr:`.PipelinedConnection.queued`)
+    and discarded in the reconnection: the restored pedalboard already contains their changes.
+
+    :param DeviceModHost mod_host: Supervised mod-host
+    :param function restore: Called (without arguments) after each reconnection
+    :param float heartbeat: Interval between the heartbeats (seconds)
+    :param float backoff: Interval until the second reconnection attempt (seconds)
+    :param float max_backoff: Maximum interval between the reconnection attempts (seconds)
+    """
+
+    def __init__(self, mod_host, restore, heartbeat=1, backoff=0.05, max_backoff=5):
+        self.mod_host = mod_host
+        self.restore = restore
+
+        self.heartbeat = heartbeat
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.reconnections = 0
+        """
+        int: Number of successful reconnections
+        """
+        self.attempts = 0
+        """
+        int: Number of reconnection attempts
+        """
+        self.last_reconnect_time = None
+        """
+        float: Seconds from the last connection failure detection until its pedalboard restore
+        """
+        self.total_reconnect_time = 0
+        """
+        float: Sum of the reconnections time (seconds)
+        """
+        self.discarded_commands = 0
+        """
+        int: Number of commands sent while disconnected (see :attr:`queued_commands`)
+        """
+
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def connection(self):
+        """
+        :return PipelinedConnection: mod-host commands connection
+        """
+        return self.mod_host.host.connection
+
+    @property
+    def connected(self):
+        """
+        :return bool: mod-host is connected?
+        """
+        return self.connection.connected
+
+    @property
+    def queued_commands(self):
+        """
+        :return int: Number of commands sent since the connection was lost
+        """
+        return len(self.connection.queued)
+
+    def start(self):
+        """
+        Starts the supervision thread
+        """
+        self._stopped.clear()
+        self.connection.on_disconnected = self._wake.set
+
+        self._thread = threading.Thread(target=self._run, name='ModHostSupervisor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the supervision thread
+        """
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+
+        self.connection.on_disconnected = None
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self.connected:
+                self._wake.wait(self.heartbeat)
+                self._wake.clear()
+
+                if not self._stopped.is_set():
+                    self.connection.ping()
+            else:
+                self._reconnect()
+
+    def _reconnect(self):
+        delay = self.backoff
+
+        while not self._stopped.is_set():
+            self.attempts += 1
+            queued = self.queued_commands
+
+            failure = self._attempt()
+            if failure is not None:
+                logging.warning('Mod-host - Reconnection fails ({}). Next attempt in {:.2f}s'.format(failure, delay))
+                self._stopped.wait(delay)
+                delay = min(delay * 2, self.max_backoff)
+                continue
+
+            reconnect_time = time.perf_counter() - self.connection.disconnected_at
+
+            self.reconnections += 1
+            self.last_reconnect_time = reconnect_time
+            self.total_reconnect_time += reconnect_time
+            self.discarded_commands += queued
+
+            logging.info('Mod-host - Reconnected in {:.3f}s ({} commands discarded)'.format(reconnect_time, queued))
+            return
+
+    def _attempt(self):
+        """
+        :return: Failure reason, or ``None`` if mod-host was reconnected and the pedalboard restored
+        """
+        try:
+            self.mod_host.host.reconnect()
+        except OSError as e:
+            return e
+
+        try:
+            self.restore()
+        except Exception:
+            logging.exception('Mod-host - Pedalboard restore fails')
+            return 'restore error'
+
+        if not self.connected:
+            return 'disconnected in the restore'
+
+        return None
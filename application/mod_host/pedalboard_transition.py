@@ -0,0 +1,131 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pluginsmanager.util.pairs_list import PairsList
+
+
+class PedalboardTransition(object):
+    """
+    Plans the minimal set of mod-host operations for change the loaded
+    pedalboard ``current`` to ``pedalboard``:
+
+     * Effects with the same plugin uri (in the same order) keep the mod-host instance;
+     * Only the changed params values and effects status of these effects are sent;
+     * Only the changed connections are disconnected and connected;
+     * The other effects are removed or added.
+
+    ::
+
+        >>> transition = PedalboardTransition(mod_host.pedalboard, new_pedalboard)
+        >>> transition.operations
+        3
+        >>> transition.rebuild_operations
+        21
+
+    .. note::
+
+        The connections of removed effects are not disconnected:
+        mod-host removes them with the effect instance.
+
+    :param Pedalboard current: Pedalboard loaded in mod-host
+    :param Pedalboard pedalboard: Pedalboard that will be loaded
+    """
+
+    pairs_list = PairsList(lambda effect: effect.plugin['uri'])
+
+    def __init__(self, current, pedalboard):
+        self.current = current
+        self.pedalboard = pedalboard
+
+        result = self.pairs_list.calculate(current.effects, pedalboard.effects)
+
+        self.pairs = result.pairs
+        """
+        list of tuple(Effect, Effect): Current effect and the new effect that will use its instance
+        """
+        self.effects_to_remove = result.elements_not_added_a
+        self.effects_to_add = result.elements_not_added_b
+
+        self.params_to_set = []
+        self.effects_to_toggle = []
+        for current_effect, new_effect in self.pairs:
+            for current_param, new_param in zip(current_effect.params, new_effect.params):
+                if current_param.value != new_param.value:
+                    self.params_to_set.append(new_param)
+
+            if current_effect.active != new_effect.active:
+                self.effects_to_toggle.append(new_effect)
+
+        self.connections_to_disconnect, self.connections_to_connect = self._connections_diff()
+
+    def _connections_diff(self):
+        removed = set(self.effects_to_remove)
+
+        # Identifies each effect by the effect whose mod-host instance it will use
+        slots = {new_effect: current_effect for current_effect, new_effect in self.pairs}
+
+        current = {self._key(connection, {}): connection for connection in self.current.connections}
+        new = {self._key(connection, slots): connection for connection in self.pedalboard.connections}
+
+        to_disconnect = [
+            connection for key, connection in current.items()
+            if key not in new
+            and connection.output.effect not in removed
+            and connection.input.effect not in removed
+        ]
+        to_connect = [connection for key, connection in new.items() if key not in current]
+
+        return to_disconnect, to_connect
+
+    def _key(self, connection, slots):
+        return self._port_key(connection.output, slots), self._port_key(connection.input, slots)
+
+    @staticmethod
+    def _port_key(port, slots):
+        effect = port.effect
+        if effect.use_real_identifier:
+            return effect, str(port)
+
+        return slots.get(effect, effect), port.symbol
+
+    @property
+    def operations(self):
+        """
+        :return int: Total of mod-host operations planned
+        """
+        return len(self.connections_to_disconnect) \
+            + len(self.effects_to_remove) \
+            + len(self.params_to_set) \
+            + len(self.effects_to_toggle) \
+            + sum(self._load_operations(effect) for effect in self.effects_to_add) \
+            + len(self.connections_to_connect)
+
+    @property
+    def rebuild_operations(self):
+        """
+        :return int: Total of mod-host operations needed for remove all ``current``
+                     and load all ``pedalboard``, without reuse
+        """
+        return len(self.current.connections) \
+            + len(self.current.effects) \
+            + sum(self._load_operations(effect) for effect in self.pedalboard.effects) \
+            + len(self.pedalboard.connections)
+
+    @staticmethod
+    def _load_operations(effect):
+        """
+        Add, set the params changed and set the status
+        """
+        changed_params = [param for param in effect.params if param.value != param.default]
+        return 1 + len(changed_params) + 1
@@ -0,0 +1,279 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PipelinedConnection(object):
+    """
+    Commands connection with `mod-host`_ that can pipeline the commands.
+
+    Out of a :meth:`pipeline` block, each command waits for its response (as the
+    pluginsmanager ``Connection``). Inside it, the commands are sent back-to-back,
+    without wait the responses. The responses are matched with the commands
+    by the order (mod-host processes the commands in the received order) and
+    they are received in the end of the block::
+
+        >>> with connection.pipeline():
+        ...     connection.send('add http://calf.sourceforge.net/plugins/Reverb 0')
+        ...     connection.send('param_set 0 decay_time 3')
+        ...     connection.send('connect system:capture_1 effect_0:in_l')
+        >>> connection.round_trips
+        2
+
+    A command that depends on the previous responses is a barrier: it is only sent
+    after the previous responses are received. The ``connect`` and ``disconnect``
+    commands wait the ``add`` responses (the ports exist only after the plugin instantiation).
+
+    The pipelined commands failures (negative status) are logged and counted in :attr:`errors`.
+
+    If the socket fails (mod-host restarts or stops responding), the connection is closed
+    and :attr:`on_disconnected` is called. Until :meth:`connect` is called again, the commands
+    are only kept in :attr:`queued`.
+
+    :param int socket_port: mod-host commands port
+    :param string address: mod-host address
+    :param int window: Maximum number of commands waiting response
+    :param int max_queued: Maximum number of commands kept in :attr:`queued`
+
+    .. _mod-host: https://github.com/moddevices/mod-host
+    """
+
+    barriers = {
+        'connect': ('add', ),
+        'disconnect': ('add', ),
+    }
+    """
+    Commands that wait the responses of the pending commands informed
+    """
+
+    heartbeat = 'cpu_load'
+    """
+    Command sent by :meth:`ping`. Any response (also an invalid command status) means mod-host is alive
+    """
+
+    def __init__(self, socket_port=5555, address='localhost', window=64, max_queued=1024):
+        self.address = address
+        self.port = socket_port
+        self.window = window
+
+        self.client = None
+        self.on_disconnected = None
+        """
+        Function called (without arguments) when the connection fails
+        """
+        self.disconnected_at = None
+        """
+        float: ``time.perf_counter()`` time of the last connection failure
+        """
+        self.queued = deque(maxlen=max_queued)
+        """
+        deque of string: Last commands sent while disconnected
+        """
+
+        self.sent = 0
+        """
+        int: Number of commands sent
+        """
+        self.round_trips = 0
+        """
+        int: Number of waits for responses
+        """
+        self.errors = 0
+        """
+        int: Number of pipelined commands that fails
+        """
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._pending = deque()
+        self._buffer = b''
+
+        self.connect()
+
+    def connect(self):
+        """
+        Opens the socket connection. The commands sent while disconnected are
+        discarded (:attr:`queued` is cleared)
+
+        :raises OSError: If mod-host isn't reachable
+        """
+        with self._lock:
+            client = socket.create_connection((self.address, self.port))
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client.settimeout(5)
+
+            self.client = client
+            self.queued.clear()
+
+    @property
+    def connected(self):
+        """
+        :return bool: The socket connection is open?
+        """
+        return self.client is not None
+
+    @property
+    def pipelining(self):
+        """
+        :return bool: The commands are being pipelined?
+        """
+        return self._depth > 0
+
+    @contextmanager
+    def pipeline(self):
+        """
+        The commands sent in the ``with`` block are pipelined. The block
+        ends when all responses are received. The blocks can be nested
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self.flush()
+
+    def send(self, message):
+        """
+        Sends a command for mod-host.
+
+        :param string message: Command (as ``'add http://calf.sourceforge.net/plugins/Reverb 0'``)
+        :return bytes: Command response. ``None`` if the command is pipelined or the connection is closed
+        """
+        with self._lock:
+            if not self.connected:
+                self.queued.append(message)
+                return None
+
+            try:
+                return self._send(message)
+            except OSError as e:
+                self._fail(e)
+                self.queued.append(message)
+                return None
+
+    def _send(self, message):
+        if not self.pipelining:
+            self._flush()
+            self._write(message)
+            return self._read_response()[1]
+
+        if self._is_barrier(message):
+            self._flush()
+        elif len(self._pending) >= self.window:
+            self._check(*self._read_response())
+
+        self._write(message)
+        return None
+
+    def flush(self):
+        """
+        Waits the responses of all pipelined commands
+        """
+        with self._lock:
+            if not self.connected:
+                return
+
+            try:
+                self._flush()
+            except OSError as e:
+                self._fail(e)
+
+    def _flush(self):
+        if self._pending:
+            self.round_trips += 1
+
+        while self._pending:
+            self._check(*self._read_response(count=False))
+
+    def ping(self):
+        """
+        Sends the :attr:`heartbeat` command, waiting its response
+
+        :return bool: mod-host responds?
+        """
+        with self._lock:
+            if not self.connected:
+                return False
+
+            try:
+                self._send(self.heartbeat)
+                return True
+            except OSError as e:
+                self._fail(e)
+                return False
+
+    def _is_barrier(self, message):
+        dependencies = self.barriers.get(message.split(' ', 1)[0])
+        if not dependencies:
+            return False
+
+        return any(pending.split(' ', 1)[0] in dependencies for pending in self._pending)
+
+    def _write(self, message):
+        self.client.sendall(message.encode('utf-8') + b'\0')
+        self._pending.append(message)
+        self.sent += 1
+
+    def _read_response(self, count=True):
+        if count:
+            self.round_trips += 1
+
+        while b'\0' not in self._buffer:
+            data = self.client.recv(1024)
+            if not data:
+                raise ConnectionResetError('mod-host closed the connection')
+            self._buffer += data
+
+        response, self._buffer = self._buffer.split(b'\0', 1)
+        return self._pending.popleft(), response
+
+    def _check(self, message, response):
+        try:
+            status = int(response.split()[1])
+        except (IndexError, ValueError):
+            return
+
+        # A successful add responds the instance number
+        if status < 0:
+            self.errors += 1
+            logging.warning('Mod-host - "{}" fails with status {}'.format(message, status))
+
+    def _fail(self, error):
+        logging.error('Mod-host - Connection lost: {}'.format(error))
+
+        self.disconnected_at = time.perf_counter()
+        self.close()
+
+        if self.on_disconnected is not None:
+            self.on_disconnected()
+
+    def close(self):
+        """
+        Closes socket connection. The responses of the pipelined commands are discarded
+        """
+        with self._lock:
+            if self.client is not None:
+                self.client.close()
+
+            self.client = None
+            self._pending.clear()
+            self._buffer = b''
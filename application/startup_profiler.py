@@ -0,0 +1,216 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the :class:`.Application` startup breakdown for a data directory::
+
+    python3 -m application.startup_profiler data/ --test
+    python3 -m application.startup_profiler data/ --address 192.168.0.10 --json
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupPhase(object):
+    """
+    Duration of a startup phase
+
+    :param string name: Phase name
+    :param string group: Group of similar phases (as ``'controller'`` or ``'component'``) or ``None``
+    :param float start: Start time (in seconds), relative to the profiler creation
+    :param float end: End time (in seconds), relative to the profiler creation
+    """
+
+    def __init__(self, name, group, start, end):
+        self.name = name
+        self.group = group
+        self.start = start
+        self.end = end
+
+    @property
+    def duration(self):
+        """
+        :return float: Phase duration (in seconds)
+        """
+        return self.end - self.start
+
+    @property
+    def json(self):
+        """
+        Get a json decodable representation of this phase
+
+        :return dict: json representation
+        """
+        return {
+            'name': self.name,
+            'group': self.group,
+            'start': self.start,
+            'end': self.end,
+            'duration': self.duration,
+        }
+
+    def __repr__(self):
+        return "<{} '{}' with {:.3f}s at 0x{:x}>".format(self.__class__.__name__, self.name, self.duration, id(self))
+
+
+class StartupProfiler(object):
+    """
+    Measures the duration of the :class:`.Application` startup phases
+    (mod-host connection, data initialization, banks load, each controller
+    configuration, each component initialization, ...) with monotonic timestamps::
+
+        >>> application = Application(path_data='data/')
+        >>> application.start()
+        >>> application.startup_profiler.phases
+        [<StartupPhase 'mod-host connection' with 0.002s at 0x7f1d80b0f208>, ...]
+        >>> application.startup_profiler.json['total']
+        1.8473
+        >>> print(application.startup_profiler)
+
+    :param bool log: Logs each phase duration when it finishes
+    :param clock: Monotonic clock function
+    """
+
+    def __init__(self, log=False, clock=time.monotonic):
+        self.log = log
+        self.clock = clock
+        self.phases = []
+        """
+        list[StartupPhase]: Finished phases, by the finish order
+        """
+
+        self._origin = clock()
+
+    @contextmanager
+    def phase(self, name, group=None):
+        """
+        Measures the duration of the code executed in the ``with`` block::
+
+            >>> with profiler.phase('banks load'):
+            ...     manager = autosaver.load(system_effect)
+
+        :param string name: Phase name
+        :param string group: Group of similar phases
+        """
+        start = self.clock() - self._origin
+        try:
+            yield
+        finally:
+            phase = StartupPhase(name, group, start, self.clock() - self._origin)
+            self.phases.append(phase)
+
+            if self.log:
+                self._log(phase)
+
+    @property
+    def total(self):
+        """
+        :return float: Time (in seconds) from the profiler creation until the end of the last phase
+        """
+        return max((phase.end for phase in self.phases), default=0)
+
+    @property
+    def groups(self):
+        """
+        :return dict: Total duration of each group of phases
+        """
+        groups = {}
+        for phase in self.phases:
+            if phase.group is not None:
+                groups[phase.group] = groups.get(phase.group, 0) + phase.duration
+
+        return groups
+
+    @property
+    def json(self):
+        """
+        Get a json decodable representation of the startup report
+
+        :return dict: json representation
+        """
+        return {
+            'total': self.total,
+            'groups': self.groups,
+            'phases': [phase.json for phase in self.phases],
+        }
+
+    def __str__(self):
+        lines = ['{:<48} {:>10} {:>10}'.format('Phase', 'Start (ms)', 'Time (ms)')]
+
+        for phase in self.phases:
+            name = phase.name if phase.group is None else '{} - {}'.format(phase.group, phase.name)
+            lines.append('{:<48} {:10.1f} {:10.1f}'.format(name, phase.start * 1000, phase.duration * 1000))
+
+        lines.append('{:<48} {:>10} {:10.1f}'.format('Total', '', self.total * 1000))
+        return '\n'.join(lines)
+
+    def _log(self, phase):
+        name = phase.name if phase.group is None else '{} - {}'.format(phase.group, phase.name)
+        logging.info('Startup - {} - {:.1f} ms'.format(name, phase.duration * 1000))
+
+
+def main(args=None):
+    # Application imports this module
+    from application.application import Application
+
+    parser = argparse.ArgumentParser(
+        description='Prints the Application startup breakdown. The application is started and stopped: '
+                    'without --test, the current mod-host session is replaced by the data_path pedalboard'
+    )
+    parser.add_argument('path_data', help='Path where the data is persisted')
+    parser.add_argument('--address', default='localhost', help='mod-host address')
+    parser.add_argument('--port', type=int, default=5555, help='mod-host port')
+    parser.add_argument('--test', action='store_true',
+                        help='Simulates the mod-host connection. Without it, the running mod-host is used '
+                             'and its pedalboard is replaced')
+    parser.add_argument('--lazy-banks', action='store_true', help='Loads the banks on demand')
+    parser.add_argument('--banks-snapshot', action='store_true', help='Reads the banks of the banks snapshot')
+    parser.add_argument('--data-store', action='store_true', help='Persists the data in a single file')
+    parser.add_argument('--json', action='store_true',
+                        help='Prints the report as json (the application log is printed in stderr)')
+    args = parser.parse_args(args)
+
+    if args.json:
+        _log_to_stderr()
+
+    application = Application(
+        path_data=args.path_data,
+        address=args.address,
+        port=args.port,
+        test=args.test,
+        lazy_banks=args.lazy_banks,
+        banks_snapshot=args.banks_snapshot,
+        data_store=args.data_store
+    )
+    application.start()
+    application.stop()
+
+    profiler = application.startup_profiler
+    print(json.dumps(profiler.json, indent=4) if args.json else profiler)
+
+
+def _log_to_stderr():
+    # Application logs in stdout
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream in (sys.stdout, sys.__stdout__):
+            handler.stream = sys.stderr
+
+
+if __name__ == '__main__':
+    main()
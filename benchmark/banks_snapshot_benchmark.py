@@ -0,0 +1,175 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the banks load of the startup (:meth:`.BanksDao.load`) with 500 banks:
+
+ * pluginsmanager ``PersistenceDecoder`` (used by ``Autosaver.load``). It is slow, so
+   it's measured with the first ``--baseline-banks`` banks and scaled;
+ * json files read by the :class:`.BanksReader`;
+ * json files read and the :class:`.BanksSnapshot` written (first startup);
+ * :class:`.BanksSnapshot` read, with all the banks files unchanged and with one changed.
+
+The banks data read (files read and decoded) is also measured without the banks building
+(best of 3): the snapshot only reduces the read, the banks building is the same.
+
+::
+
+    python3 -m benchmark.banks_snapshot_benchmark
+    python3 -m benchmark.banks_snapshot_benchmark --banks 1000
+
+The pedalboards have uuids and the autosaver of each load is flushed out of the measurements,
+so the banks files only change when the benchmark changes them. The files are in the
+operating system cache, so the disk reads aren't measured.
+"""
+
+import argparse
+import gc
+import shutil
+import tempfile
+import time
+from glob import glob
+from pathlib import Path
+
+from application.controller.device_controller import DeviceController
+from application.dao.banks_dao import BanksDao
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.observer.autosaver.persistence import Persistence
+from pluginsmanager.util.persistence_decoder import PersistenceDecoder
+
+PEDALBOARDS = 3
+EFFECTS = 4
+
+
+def generate_banks(banks_number):
+    builder = Lv2EffectBuilder()
+    uris = [
+        uri for uri, plugin in sorted(builder.all.items())
+        if plugin['ports']['audio']['input'] and plugin['ports']['audio']['output']
+    ][:50]
+
+    sys_effect = DeviceController.sys_effect
+
+    manager = BanksManager()
+    for bank_index in range(banks_number):
+        bank = Bank('Bank {}'.format(bank_index))
+
+        for pedalboard_index in range(PEDALBOARDS):
+            pedalboard = Pedalboard('Pedalboard {}'.format(pedalboard_index))
+
+            output = sys_effect.outputs[0]
+            for effect_index in range(EFFECTS):
+                effect = builder.build(uris[(bank_index + pedalboard_index + effect_index) % len(uris)])
+                pedalboard.append(effect)
+                pedalboard.connect(output, effect.inputs[0])
+                output = effect.outputs[0]
+
+            pedalboard.connect(output, sys_effect.inputs[0])
+            bank.append(pedalboard)
+
+        BanksDao.assign_uuids(bank)
+        manager.append(bank)
+
+    return manager
+
+
+def measure(function, repeat=1):
+    durations = []
+    for _ in range(repeat):
+        # The garbage of the previous loads isn't collected during the measurement
+        gc.collect()
+
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+def measure_load(data_path, snapshot):
+    dao = BanksDao(data_path)
+    duration = measure(lambda: dao.load(DeviceController.sys_effect, snapshot=snapshot))
+
+    # Out of the measurement: a pending write would change the files of the next load
+    dao.autosaver.flush()
+    dao.autosaver.banks_files.discard()
+    if dao.autosaver.banks_files.writes:
+        raise RuntimeError('The banks load changed the banks files')
+
+    return duration
+
+
+def measure_read(data_path, snapshot):
+    dao = BanksDao(data_path)
+    files = [Path(file) for file in glob(str(dao.data_path) + '/*.json')]
+
+    if snapshot:
+        return measure(lambda: dao.snapshot.read(files), repeat=3)
+
+    return measure(lambda: [Persistence.read(file) for file in files], repeat=3)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Banks load with and without the snapshot')
+    parser.add_argument('--banks', type=int, default=500, help='Number of banks')
+    parser.add_argument('--baseline-banks', type=int, default=10, help='Banks read by the PersistenceDecoder')
+    args = parser.parse_args(args)
+
+    data_path = Path(tempfile.mkdtemp())
+    try:
+        (data_path / Path('banks')).mkdir()
+
+        manager = generate_banks(args.banks)
+        dao = BanksDao(data_path)
+        dao.autosaver.save(manager)
+        dao.autosaver.index_file.save(manager)
+
+        system_effect = DeviceController.sys_effect
+        banks_json = [bank.json for bank in manager.banks[:args.baseline_banks]]
+        decoder = PersistenceDecoder(system_effect)
+
+        baseline = measure(lambda: [decoder.read(json) for json in banks_json])
+        baseline *= args.banks / len(banks_json)
+
+        json = measure_load(data_path, snapshot=False)
+        first = measure_load(data_path, snapshot=True)
+        snapshot = measure_load(data_path, snapshot=True)
+
+        manager.banks[0].append(Pedalboard('Changed'))
+        dao.autosaver.flush()
+        changed = measure_load(data_path, snapshot=True)
+
+        json_read = measure_read(data_path, snapshot=False)
+        snapshot_read = measure_read(data_path, snapshot=True)
+
+        print('{} banks x {} pedalboards x {} effects'.format(args.banks, PEDALBOARDS, EFFECTS))
+        print('  Load (read and build)')
+        print('    {:<44} {:9.3f} s'.format('PersistenceDecoder (scaled)', baseline))
+        print('    {:<44} {:9.3f} s'.format('json + BanksReader', json))
+        print('    {:<44} {:9.3f} s'.format('json + BanksReader + snapshot write', first))
+        print('    {:<44} {:9.3f} s'.format('snapshot + BanksReader', snapshot))
+        print('    {:<44} {:9.3f} s'.format('snapshot (1 bank changed) + BanksReader', changed))
+        print('  Read only')
+        print('    {:<44} {:9.3f} s'.format('json', json_read))
+        print('    {:<44} {:9.3f} s'.format('snapshot', snapshot_read))
+
+    finally:
+        shutil.rmtree(str(data_path))
+
+
+if __name__ == '__main__':
+    main()
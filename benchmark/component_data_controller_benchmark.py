@@ -0,0 +1,88 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the :class:`.ComponentDataController` reads: ``controller[key]`` (copy)
+with ``controller.view(key)`` (cached read only view), by time and memory allocated::
+
+    python3 -m benchmark.component_data_controller_benchmark
+"""
+
+import shutil
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from application.controller.component_data_controller import ComponentDataController
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+KEY = 'display'
+READS = 100000
+
+
+def generate_data():
+    return {
+        KEY: {
+            'pedalboard': 3,
+            'lines': ['Bank 1', 'Pedalboard 3'],
+            'effects': [{'name': 'Effect {}'.format(index), 'position': [index, index]} for index in range(10)],
+            'settings': {'setting {}'.format(index): index for index in range(20)},
+        }
+    }
+
+
+def allocated_per_read(function):
+    function()
+
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    results = [function() for _ in range(1000)]
+    allocated = tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+    tracemalloc.stop()
+
+    del results
+    return sum(stat.size_diff for stat in allocated) / 1000
+
+
+def main():
+    data_path = Path(tempfile.mkdtemp())
+    try:
+        (data_path / Path('components')).mkdir()
+        Persistence.save(data_path / Path('components/component.json'), generate_data())
+
+        application = SimpleNamespace(dao=lambda dao: dao(data_path))
+        controller = ComponentDataController(application)
+        controller.configure()
+
+        benchmarks = [
+            ('controller[key]', lambda: controller[KEY]),
+            ('controller.view(key)', lambda: controller.view(KEY)),
+        ]
+
+        for name, function in benchmarks:
+            seconds = min(timeit.repeat(function, number=READS, repeat=5))
+            print('{:<24} {:8.1f} ns/read {:8.1f} bytes/read'.format(
+                name,
+                seconds / READS * 10 ** 9,
+                allocated_per_read(function)
+            ))
+
+    finally:
+        shutil.rmtree(str(data_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the :class:`.ComponentsObserver` notification with 50 observers:
+the linear scan (all observers, scope checked by each observer) with the routing
+by event (only 5 observers care about param changes)::
+
+    python3 -m benchmark.components_observer_benchmark
+"""
+
+import timeit
+
+from application.component.application_observer import ApplicationObserver
+from application.component.components_observer import ComponentsObserver
+from pluginsmanager.banks_manager import BanksManager
+
+OBSERVERS = 50
+PARAM_OBSERVERS = 5
+NOTIFICATIONS = 10000
+
+
+class EmptyObserver(ApplicationObserver):
+
+    def on_current_pedalboard_changed(self, pedalboard, **kwargs):
+        pass
+
+    def on_bank_updated(self, bank, update_type, index, origin, **kwargs):
+        pass
+
+    def on_pedalboard_updated(self, pedalboard, update_type, index, origin, **kwargs):
+        pass
+
+    def on_effect_updated(self, effect, update_type, index, origin, **kwargs):
+        pass
+
+    def on_effect_status_toggled(self, effect, **kwargs):
+        pass
+
+    def on_param_value_changed(self, param, **kwargs):
+        pass
+
+    def on_connection_updated(self, connection, update_type, pedalboard, **kwargs):
+        pass
+
+
+class LinearComponentsObserver(ComponentsObserver):
+    """
+    The notification before the routing by event
+    """
+
+    def on_param_value_changed(self, param, **kwargs):
+        for observer in self.observers:
+            if observer != self.scope:
+                observer.on_param_value_changed(param, **kwargs)
+
+    def on_current_pedalboard_changed(self, pedalboard, **kwargs):
+        for observer in self.observers:
+            if observer != self.scope:
+                observer.on_current_pedalboard_changed(pedalboard, **kwargs)
+
+
+def generate(components_observer_class, routing):
+    components_observer = components_observer_class(BanksManager())
+
+    for index in range(OBSERVERS):
+        events = None
+        if routing and index >= PARAM_OBSERVERS:
+            events = [event for event in ComponentsObserver.events if event != 'on_param_value_changed']
+
+        components_observer.register(EmptyObserver(), events=events)
+
+    return components_observer
+
+
+def main():
+    benchmarks = [
+        ('linear', generate(LinearComponentsObserver, routing=False)),
+        ('routing (all events)', generate(ComponentsObserver, routing=False)),
+        ('routing (by event)', generate(ComponentsObserver, routing=True)),
+    ]
+
+    for name, components_observer in benchmarks:
+        param = min(timeit.repeat(
+            lambda: components_observer.on_param_value_changed('param'),
+            number=NOTIFICATIONS,
+            repeat=3
+        ))
+        pedalboard = min(timeit.repeat(
+            lambda: components_observer.on_current_pedalboard_changed('pedalboard'),
+            number=NOTIFICATIONS,
+            repeat=3
+        ))
+
+        print('{:<22} on_param_value_changed {:7.1f} us   on_current_pedalboard_changed {:7.1f} us'.format(
+            name,
+            param / NOTIFICATIONS * 10 ** 6,
+            pedalboard / NOTIFICATIONS * 10 ** 6
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the json files with the :class:`.DataStore` (``Application(data_store=True)``):
+
+ * Write-behind flush of ``--dirty`` changed banks (:meth:`.WriteBehindAutosaver.flush`);
+ * Change of a key of the components data with ``--keys`` keys (:meth:`.ComponentDao.save_key`);
+ * Banks load (:meth:`.BanksDao.load`, without snapshot).
+
+::
+
+    python3 -m benchmark.data_store_benchmark
+    python3 -m benchmark.data_store_benchmark --banks 500 --dirty 10
+
+The json files are synced in each write (:class:`.AtomicPersistence`); the store
+is synced in its checkpoints (see :attr:`.DataStore.synchronous`).
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from application.controller.device_controller import DeviceController
+from application.dao.banks_dao import BanksDao
+from application.dao.component_dao import ComponentDao
+from application.dao.data_store import DataStore
+from benchmark.banks_snapshot_benchmark import generate_banks
+
+
+def measure(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def flush(dao, manager, dirty):
+    for bank in manager.banks[:dirty]:
+        dao.autosaver.banks_files.save_bank(bank)
+    dao.autosaver.flush()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Json files and data store writes')
+    parser.add_argument('--banks', type=int, default=200, help='Number of banks')
+    parser.add_argument('--dirty', type=int, default=5, help='Banks changed in each flush')
+    parser.add_argument('--keys', type=int, default=100, help='Number of components data keys')
+    parser.add_argument('--repeat', type=int, default=20, help='Measures of each write')
+    args = parser.parse_args(args)
+
+    data_path = Path(tempfile.mkdtemp())
+    store = DataStore(data_path / Path('pedalpi.db'))
+    try:
+        (data_path / Path('banks')).mkdir()
+        (data_path / Path('components')).mkdir()
+
+        manager = generate_banks(args.banks)
+        BanksDao(data_path).autosaver.save(manager)
+
+        files_dao = BanksDao(data_path)
+        store_dao = BanksDao(data_path, store=store)
+
+        system_effect = DeviceController.sys_effect
+        load_files = measure(lambda: files_dao.load(system_effect), 1)
+        load_store = measure(lambda: store_dao.load(system_effect), 1)
+
+        flush_files = measure(lambda: flush(files_dao, manager, args.dirty), args.repeat)
+        flush_store = measure(lambda: flush(store_dao, manager, args.dirty), args.repeat)
+
+        data = {'component {}'.format(index): {'value': list(range(20))} for index in range(args.keys)}
+        ComponentDao(data_path).save(data)
+
+        components_file = ComponentDao(data_path)
+        components_journal = ComponentDao(data_path, journal=True)
+        components_store = ComponentDao(data_path, store=store)
+
+        save_key = lambda dao: dao.save_key(data, 'component 0')
+        key_file = measure(lambda: save_key(components_file), args.repeat)
+        key_journal = measure(lambda: save_key(components_journal), args.repeat)
+        key_store = measure(lambda: save_key(components_store), args.repeat)
+        components_journal.close()
+
+        print('{} banks, {} dirty banks by flush, {} components keys'.format(args.banks, args.dirty, args.keys))
+        print('    {:<44} {:9.3f} ms'.format('Banks flush - json files', flush_files * 1000))
+        print('    {:<44} {:9.3f} ms'.format('Banks flush - data store', flush_store * 1000))
+        print('    {:<44} {:9.3f} ms'.format('Component key save - json file', key_file * 1000))
+        print('    {:<44} {:9.3f} ms'.format('Component key save - journal', key_journal * 1000))
+        print('    {:<44} {:9.3f} ms'.format('Component key save - data store', key_store * 1000))
+        print('    {:<44} {:9.3f} s'.format('Banks load - json files', load_files))
+        print('    {:<44} {:9.3f} s'.format('Banks load - data store', load_store))
+
+    finally:
+        store.close()
+        shutil.rmtree(str(data_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the mod-host feedback reader (:class:`.FeedbackReader`) throughput and lag
+in a MIDI controller sweep: the :class:`.ModHostSimulator` sends a burst of ``param_set``
+feedback messages of the current pedalboard, applied in the :class:`.Application` model::
+
+    python3 -m benchmark.feedback_reader_benchmark
+    python3 -m benchmark.feedback_reader_benchmark --messages 5000
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from application.application import Application
+from application.controller.current_controller import CurrentController
+from application.controller.device_controller import DeviceController
+from application.mod_host.mod_host_simulator import ModHostSimulator
+
+
+def sweep(simulator, param, messages):
+    values = (param.minimum, param.maximum)
+
+    for index in range(messages):
+        simulator.feedback('param_set {} {} {}'.format(param.effect.instance, param.symbol, values[index % 2]))
+
+
+def benchmark(simulator, messages):
+    data_path = Path(tempfile.mkdtemp())
+    application = Application(path_data=str(data_path / Path('data')), port=simulator.port)
+    try:
+        application.start()
+
+        feedback = application.controller(DeviceController).feedback
+        pedalboard = application.controller(CurrentController).pedalboard
+        param = next(effect.params[0] for effect in pedalboard.effects if effect.params)
+
+        start = time.perf_counter()
+        sweep(simulator, param, messages)
+        while feedback.messages < messages:
+            time.sleep(0.001)
+
+        return time.perf_counter() - start, feedback
+
+    finally:
+        application.stop()
+        shutil.rmtree(str(data_path))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='mod-host feedback reader throughput and lag')
+    parser.add_argument('--messages', type=int, default=1000, help='param_set feedback messages sent')
+    args = parser.parse_args(args)
+
+    logging.disable(logging.INFO)
+
+    simulator = ModHostSimulator(port=None)
+    simulator.start()
+    try:
+        # pluginsmanager prints each mod-host command
+        with contextlib.redirect_stdout(io.StringIO()):
+            duration, feedback = benchmark(simulator, args.messages)
+    finally:
+        simulator.stop()
+
+    print('{} messages in {:.3f} s'.format(feedback.messages, duration))
+    print('    throughput {:10.1f} messages/s'.format(feedback.throughput))
+    print('    lag        mean {:8.3f} ms   max {:8.3f} ms'.format(feedback.mean_lag * 1000, feedback.max_lag * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the latency felt by the user in a footswitch press: the time from
+the :class:`.CurrentController` (or param) change until the last command
+received by mod-host.
+
+The :class:`.Application` is connected to a :class:`.ModHostSimulator`,
+that records the time of each command received. The operations are measured
+with synthetic banks of different sizes::
+
+    python3 -m benchmark.footswitch_latency_benchmark
+    python3 -m benchmark.footswitch_latency_benchmark --iterations 200 --json > footswitch.json
+    python3 -m benchmark.footswitch_latency_benchmark --latency 0.0005 --round-trip 0.001
+
+The json output contains, by banks size and operation, the latency percentiles
+(p50 and p99, in milliseconds) and the mod-host commands count.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from application.application import Application
+from application.controller.current_controller import CurrentController
+from application.controller.device_controller import DeviceController
+from application.controller.plugins_controller import PluginsController
+from application.mod_host.mod_host_simulator import ModHostSimulator
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+
+SIZES = (
+    # (banks, pedalboards by bank, effects by pedalboard)
+    (3, 4, 2),
+    (3, 16, 4),
+    (3, 32, 8),
+)
+
+
+def generate_banks(plugins_controller, banks, pedalboards, effects):
+    uris = [
+        plugin['uri']
+        for plugin in plugins_controller.lv2_builder.all.values()
+        if plugin['ports']['audio']['input'] and plugin['ports']['audio']['output']
+        and plugin['ports']['control']['input']
+    ][:effects * 2]
+
+    sys_effect = DeviceController.sys_effect
+
+    generated = []
+    for bank_index in range(banks):
+        bank = Bank('Footswitch {}'.format(bank_index))
+
+        for pedalboard_index in range(pedalboards):
+            pedalboard = Pedalboard('Pedalboard {}'.format(pedalboard_index))
+
+            output = sys_effect.outputs[0]
+            for effect_index in range(effects):
+                # Neighbours pedalboards share part of the plugins.
+                # The first pedalboards of the banks doesn't share plugins
+                uri = uris[(bank_index * effects + pedalboard_index + effect_index) % len(uris)]
+                effect = plugins_controller.lv2_effect(uri)
+                pedalboard.append(effect)
+
+                param = effect.params[0]
+                param.value = param.minimum if (pedalboard_index + effect_index) % 2 else param.maximum
+
+                pedalboard.connect(output, effect.inputs[0])
+                output = effect.outputs[0]
+
+            pedalboard.connect(output, sys_effect.inputs[0])
+            bank.append(pedalboard)
+
+        generated.append(bank)
+
+    return generated
+
+
+def toggle_param(current):
+    param = current.pedalboard.effects[0].params[0]
+    param.value = param.minimum if param.value != param.minimum else param.maximum
+
+
+def operations(current, banks):
+    other_bank = {banks[0]: banks[1], banks[1]: banks[0]}
+
+    return (
+        ('to_next_pedalboard', current.to_next_pedalboard),
+        ('to_before_pedalboard', current.to_before_pedalboard),
+        ('to_next_bank', current.to_next_bank),
+        ('to_before_bank', current.to_before_bank),
+        ('set_bank(try_preserve_index=True)',
+         lambda: current.set_bank(other_bank.get(current.bank, banks[0]), try_preserve_index=True)),
+        ('param change', lambda: toggle_param(current)),
+    )
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def commands_since(simulator, start):
+    return [command for command in simulator.commands if command[0] >= start]
+
+
+def measure(simulator, operation, iterations):
+    latencies = []
+    commands = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        end = time.perf_counter()
+
+        received = commands_since(simulator, start)
+        latencies.append((received[-1][0] if received else end) - start)
+        commands.append(len(received))
+
+    return {
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'commands': sum(commands) / iterations,
+        'commands_max': max(commands),
+    }
+
+
+def benchmark(simulator, size, iterations):
+    banks_number, pedalboards_number, effects_number = size
+
+    data_path = Path(tempfile.mkdtemp())
+    application = Application(path_data=str(data_path / Path('data')), port=simulator.port)
+    try:
+        application.start()
+
+        manager = application.manager
+        current = application.controller(CurrentController)
+        banks = generate_banks(
+            application.controller(PluginsController),
+            banks_number, pedalboards_number, effects_number
+        )
+
+        # Only the synthetic banks
+        for bank in banks:
+            manager.append(bank)
+        current.set_bank(banks[0])
+        for bank in [bank for bank in manager.banks if bank not in banks]:
+            manager.banks.remove(bank)
+
+        return {
+            name: measure(simulator, operation, iterations)
+            for name, operation in operations(current, banks)
+        }
+
+    finally:
+        application.stop()
+        shutil.rmtree(str(data_path))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Footswitch to mod-host latency')
+    parser.add_argument('--iterations', type=int, default=50, help='Measures by operation')
+    parser.add_argument('--latency', type=float, default=0, help='mod-host processing time of each command (s)')
+    parser.add_argument('--round-trip', type=float, default=0, help='Network round trip time (s)')
+    parser.add_argument('--json', action='store_true', help='Prints the report as json')
+    args = parser.parse_args(args)
+
+    logging.disable(logging.INFO)
+
+    simulator = ModHostSimulator(port=None, latency=args.latency, round_trip=args.round_trip)
+    simulator.start()
+
+    report = []
+    try:
+        for size in SIZES:
+            # pluginsmanager prints each mod-host command
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = benchmark(simulator, size, args.iterations)
+
+            report.append({
+                'banks': size[0],
+                'pedalboards': size[1],
+                'effects': size[2],
+                'operations': results,
+            })
+    finally:
+        simulator.stop()
+
+    if args.json:
+        print(json.dumps({
+            'iterations': args.iterations,
+            'latency': args.latency,
+            'round_trip': args.round_trip,
+            'results': report
+        }, indent=4))
+        return
+
+    for result in report:
+        print('{banks} banks x {pedalboards} pedalboards x {effects} effects'.format(**result))
+        for name, operation in result['operations'].items():
+            print('    {:<36} p50 {:7.3f} ms   p99 {:7.3f} ms   commands {:6.1f} (max {})'.format(
+                name, operation['p50'], operation['p99'], operation['commands'], operation['commands_max']
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the :class:`.Lv2Effect` generation by the plugin metadata
+(``Lv2EffectBuilder.build``) with the generation by a :class:`.Lv2EffectTemplate`::
+
+    python3 -m benchmark.lv2_effect_template_benchmark
+"""
+
+import timeit
+from pathlib import Path
+
+from application.controller.lv2_effect_template import Lv2EffectTemplate
+from pluginsmanager.model.lv2.lv2_effect import Lv2Effect
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.model.lv2.lv2_plugin import Lv2Plugin
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+PLUGINS = (
+    'http://calf.sourceforge.net/plugins/Reverb',
+    'http://calf.sourceforge.net/plugins/MultiChorus',
+    'http://guitarix.sourceforge.net/plugins/gx_scream_#_scream_',
+)
+EFFECTS = 1000
+
+
+def main():
+    metadata = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+    plugins = {plugin['uri']: Lv2Plugin(plugin) for plugin in metadata if plugin['uri'] in PLUGINS}
+
+    for uri, plugin in sorted(plugins.items()):
+        template = Lv2EffectTemplate(plugin)
+
+        builder = min(timeit.repeat(lambda: Lv2Effect(plugin), number=EFFECTS, repeat=3))
+        stamp = min(timeit.repeat(template.build, number=EFFECTS, repeat=3))
+
+        print('{:<40} ports {:3d}   builder {:8.1f} us   template {:8.1f} us'.format(
+            str(plugin),
+            len(template.params + template.inputs + template.outputs + template.midi_inputs + template.midi_outputs),
+            builder / EFFECTS * 10 ** 6,
+            stamp / EFFECTS * 10 ** 6
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compares the pedalboard search by bank and pedalboard names walking the banks
+(as the setlists handlers did) with the :class:`.PedalboardsIndex` in 1000 banks
+with 10 pedalboards each. The index build and the searches of unknown pedalboards
+(that don't rebuild the index) are measured separately::
+
+    python3 -m benchmark.pedalboards_index_benchmark
+"""
+
+import random
+import time
+import timeit
+
+from application.controller.pedalboards_index import PedalboardsIndex
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+
+BANKS = 1000
+PEDALBOARDS = 10
+SEARCHES = 1000
+
+
+def generate_manager():
+    manager = BanksManager()
+    for bank_index in range(BANKS):
+        bank = Bank('Bank {}'.format(bank_index))
+        for pedalboard_index in range(PEDALBOARDS):
+            bank.append(Pedalboard('Pedalboard {}'.format(pedalboard_index)))
+
+        manager.append(bank)
+
+    return manager
+
+
+def linear_search(manager, bank_name, pedalboard_name):
+    for bank in manager.banks:
+        if bank.name != bank_name:
+            continue
+
+        for pedalboard in bank.pedalboards:
+            if pedalboard.name == pedalboard_name:
+                return pedalboard
+
+    return None
+
+
+def main():
+    manager = generate_manager()
+    index = PedalboardsIndex(manager)
+
+    random.seed(0)
+    names = [
+        ('Bank {}'.format(random.randrange(BANKS)), 'Pedalboard {}'.format(random.randrange(PEDALBOARDS)))
+        for _ in range(SEARCHES)
+    ]
+
+    start = time.perf_counter()
+    index.by_name('Bank 0', 'Pedalboard 0')
+    build = time.perf_counter() - start
+
+    linear = timeit.timeit(lambda: [linear_search(manager, *name) for name in names], number=1) / SEARCHES
+    indexed = timeit.timeit(lambda: [index.by_name(*name) for name in names], number=1) / SEARCHES
+    unknown = timeit.timeit(lambda: [index.by_name(bank, 'Unknown') for bank, _ in names], number=1) / SEARCHES
+
+    print('{} banks x {} pedalboards'.format(BANKS, PEDALBOARDS))
+    print('    {:<30} {:9.3f} ms'.format('Index build', build * 1000))
+    print('    {:<30} {:9.3f} us'.format('Linear search by name', linear * 10 ** 6))
+    print('    {:<30} {:9.3f} us'.format('Index search by name', indexed * 10 ** 6))
+    print('    {:<30} {:9.3f} us'.format('Index search of unknown', unknown * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measures the :class:`.PluginsSearchIndex` with a catalog of 2000 plugins
+(the PluginsManager plugins metadata replicated): the index build, an update
+without changes and the searches (without and with the similar words cached)::
+
+    python3 -m benchmark.plugins_search_index_benchmark
+"""
+
+import time
+import timeit
+from pathlib import Path
+
+from application.controller.plugins_search_index import PluginsSearchIndex
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+PLUGINS = 2000
+SEARCHES = 300
+TEXTS = ('scream', 'scre', 'revreb', 'calf reverb', 'compressor gain', 'gx')
+
+
+def generate_plugins():
+    metadata = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+
+    plugins = []
+    for index in range(PLUGINS):
+        plugin = dict(metadata[index % len(metadata)])
+        copy = index // len(metadata)
+        if copy:
+            plugin['uri'] = '{}#{}'.format(plugin['uri'], copy)
+            plugin['name'] = '{} {}'.format(plugin['name'], copy)
+
+        plugins.append(plugin)
+
+    return plugins
+
+
+def measure(function, number=1):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    plugins = generate_plugins()
+    index = PluginsSearchIndex()
+
+    start = time.perf_counter()
+    index.update(plugins)
+    print('{:<24} {:8.1f} ms'.format('build', (time.perf_counter() - start) * 1000))
+    print('{:<24} {:8.1f} ms'.format('update (not changed)', measure(lambda: index.update(plugins)) * 1000))
+
+    for text in TEXTS:
+        def search_not_cached():
+            index._similar_words_cache.clear()
+            index.search(text)
+
+        print('{:<24} {:8.3f} ms   cached {:8.3f} ms'.format(
+            "search '{}'".format(text),
+            measure(search_not_cached, SEARCHES) * 1000,
+            measure(lambda: index.search(text), SEARCHES) * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
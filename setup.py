@@ -43,6 +43,7 @@ setup(
         'application/component',
         'application/controller',
         'application/dao',
+        'application/mod_host',
 
         'application/data',
         'application/data/banks',
@@ -0,0 +1,72 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from application.controller.controller import Controller
+from application.controller.current_controller import CurrentController
+from application.controller.plugins_controller import PluginsController
+from application.dao.banks_dao import BanksDao
+from application.dao.current_dao import CurrentDao
+from application.dao.plugins_dao import PluginsDao
+from test.controller.controller_test import ControllerTest
+
+
+class FirstController(Controller):
+    dependencies = ()
+
+    def configure(self):
+        pass
+
+
+class SecondController(Controller):
+    dependencies = (FirstController, )
+
+    def configure(self):
+        pass
+
+
+class ApplicationTest(ControllerTest):
+
+    def test_controllers_configured_after_dependencies(self):
+        phases = {
+            phase.name: phase
+            for phase in self.application.startup_profiler.phases
+            if phase.group == 'controller'
+        }
+
+        self.assertGreaterEqual(phases['CurrentController'].start, phases['DeviceController'].end)
+
+    def test_controllers_by_dependencies(self):
+        first = FirstController(self.application)
+        second = SecondController(self.application)
+
+        controllers = {'SecondController': second, 'FirstController': first}
+
+        self.assertEqual([first, second], self.application._controllers_by_dependencies(controllers))
+
+    def test_controllers_cyclic_dependencies(self):
+        class CyclicController(Controller):
+            def configure(self):
+                pass
+
+        CyclicController.dependencies = (CyclicController, )
+        controllers = {'CyclicController': CyclicController(self.application)}
+
+        with self.assertRaises(ValueError):
+            self.application._controllers_by_dependencies(controllers)
+
+    def test_dao_shared(self):
+        self.assertIs(self.application.dao(CurrentDao), self.application.dao(CurrentDao))
+        self.assertIs(self.application.controller(CurrentController)._dao, self.application.dao(CurrentDao))
+        self.assertIs(self.application.controller(PluginsController)._dao, self.application.dao(PluginsDao))
+        self.assertIs(self.application.autosaver, self.application.dao(BanksDao).autosaver)
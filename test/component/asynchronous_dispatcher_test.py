@@ -0,0 +1,135 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+from unittest.mock import call
+
+from application.component.asynchronous_dispatcher import AsynchronousDispatcher, BackPressure
+from application.component.components_observer import ComponentsObserver
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.observer.update_type import UpdateType
+from test.mock_observer import MockObserver
+
+
+class SlowObserver(MockObserver):
+    """
+    Blocks the first notification until ``release`` is set
+    """
+
+    def __init__(self):
+        super(SlowObserver, self).__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.on_param_value_changed.side_effect = self._wait
+
+    def _wait(self, *args, **kwargs):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(1)
+
+
+class AsynchronousDispatcherTest(unittest.TestCase):
+
+    def test_delivery_order(self):
+        observer = MockObserver()
+        dispatcher = AsynchronousDispatcher(observer)
+
+        dispatcher.on_param_value_changed('param 1')
+        dispatcher.on_param_value_changed('param 2')
+        dispatcher.close()
+
+        observer.on_param_value_changed.assert_has_calls([call('param 1'), call('param 2')])
+        self.assertEqual(2, dispatcher.delivered)
+        self.assertEqual(0, dispatcher.pending)
+
+    def test_drop_oldest(self):
+        observer = SlowObserver()
+        dispatcher = AsynchronousDispatcher(observer, max_size=2, back_pressure=BackPressure.DROP_OLDEST)
+
+        dispatcher.on_param_value_changed('param 0')
+        observer.started.wait(1)
+        for index in range(1, 5):
+            dispatcher.on_param_value_changed('param {}'.format(index))
+
+        self.assertEqual(2, dispatcher.pending)
+        self.assertEqual(2, dispatcher.dropped)
+
+        observer.release.set()
+        dispatcher.close()
+
+        observer.on_param_value_changed.assert_has_calls([call('param 0'), call('param 3'), call('param 4')])
+        self.assertGreater(dispatcher.max_lag, 0)
+
+    def test_coalesce(self):
+        observer = SlowObserver()
+        dispatcher = AsynchronousDispatcher(observer, max_size=2, back_pressure=BackPressure.COALESCE)
+
+        dispatcher.on_param_value_changed('param 0')
+        observer.started.wait(1)
+        for value in range(3):
+            dispatcher.on_param_value_changed('param 1', value=value)
+
+        self.assertEqual(1, dispatcher.pending)
+        self.assertEqual(2, dispatcher.coalesced)
+        self.assertEqual(0, dispatcher.dropped)
+
+        observer.release.set()
+        dispatcher.close()
+
+        observer.on_param_value_changed.assert_called_with('param 1', value=2)
+        self.assertEqual(2, dispatcher.delivered)
+
+    def test_block(self):
+        observer = SlowObserver()
+        dispatcher = AsynchronousDispatcher(observer, max_size=1, back_pressure=BackPressure.BLOCK)
+
+        dispatcher.on_param_value_changed('param 0')
+        observer.started.wait(1)
+        dispatcher.on_param_value_changed('param 1')
+
+        producer = threading.Thread(target=dispatcher.on_param_value_changed, args=('param 2', ))
+        producer.start()
+        producer.join(0.1)
+        self.assertTrue(producer.is_alive())
+
+        observer.release.set()
+        producer.join(1)
+        dispatcher.close()
+
+        self.assertEqual(0, dispatcher.dropped)
+        self.assertEqual(3, dispatcher.delivered)
+
+    def test_components_observer_asynchronous(self):
+        observer = MockObserver()
+
+        manager = BanksManager()
+        components_observer = ComponentsObserver(manager)
+        manager.register(components_observer)
+        components_observer.register(observer, asynchronous=True)
+
+        bank = Bank('test_components_observer_asynchronous')
+        manager.append(bank)
+        with observer:
+            manager.banks.remove(bank)
+
+        dispatcher = components_observer.dispatcher(observer)
+        components_observer.close()
+
+        observer.on_bank_updated.assert_called_once_with(bank, UpdateType.CREATED, index=0, origin=manager)
+        self.assertEqual(1, dispatcher.delivered)
+
+        components_observer.unregister(observer)
+        self.assertEqual([], components_observer.observers)
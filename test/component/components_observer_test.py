@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
+from unittest.mock import MagicMock, call
+
 from application.component.components_observer import ComponentsObserver
 from test.mock_observer import MockObserver
 from pluginsmanager.banks_manager import BanksManager
@@ -61,3 +65,96 @@ class ComponentsObserverTest(ControllerTest):
             manager.append(bank)
 
         observer.on_bank_updated.assert_not_called()
+
+    def test_param_coalescing(self):
+        observer = MockObserver()
+        calls = MagicMock()
+        calls.attach_mock(observer.on_param_value_changed, 'on_param_value_changed')
+        calls.attach_mock(observer.on_current_pedalboard_changed, 'on_current_pedalboard_changed')
+
+        components_observer = ComponentsObserver(BanksManager(), param_window=10)
+        components_observer.register(observer)
+
+        for value in range(4):
+            components_observer.on_param_value_changed('param', value=value)
+        components_observer.on_current_pedalboard_changed('pedalboard')
+
+        calls.assert_has_calls([
+            call.on_param_value_changed('param', value=0),
+            call.on_param_value_changed('param', value=3),
+            call.on_current_pedalboard_changed('pedalboard'),
+        ])
+        self.assertEqual(2, components_observer.params_coalesced)
+
+        components_observer.close()
+
+    def test_param_coalescing_window(self):
+        observer = MockObserver()
+
+        components_observer = ComponentsObserver(BanksManager(), param_window=0.01)
+        components_observer.register(observer)
+
+        components_observer.on_param_value_changed('param', value=0)
+        components_observer.on_param_value_changed('param', value=1)
+        components_observer.on_param_value_changed('param', value=2)
+        self.assertEqual(1, observer.on_param_value_changed.call_count)
+
+        time.sleep(0.1)
+
+        self.assertEqual(2, observer.on_param_value_changed.call_count)
+        observer.on_param_value_changed.assert_called_with('param', value=2)
+
+        components_observer.close()
+
+    def test_param_window_delivery_order(self):
+        events = []
+        delivering = threading.Event()
+
+        def on_param_value_changed(param, **kwargs):
+            if threading.current_thread() is not threading.main_thread():
+                # The Timer thread already took the pending change
+                delivering.set()
+                time.sleep(0.1)
+            events.append(kwargs['value'])
+
+        observer = MockObserver()
+        observer.on_param_value_changed.side_effect = on_param_value_changed
+        observer.on_current_pedalboard_changed.side_effect = lambda pedalboard: events.append(pedalboard)
+
+        components_observer = ComponentsObserver(BanksManager(), param_window=0.01)
+        components_observer.register(observer)
+
+        components_observer.on_param_value_changed('param', value=0)
+        components_observer.on_param_value_changed('param', value=1)
+        self.assertTrue(delivering.wait(5))
+        components_observer.on_current_pedalboard_changed('pedalboard')
+
+        self.assertEqual([0, 1, 'pedalboard'], events)
+
+        components_observer.close()
+
+    def test_events_routing(self):
+        display = MockObserver()
+        observer = MockObserver()
+
+        components_observer = ComponentsObserver(BanksManager())
+        components_observer.register(display, events=['on_current_pedalboard_changed'])
+        components_observer.register(observer)
+
+        components_observer.on_param_value_changed('param')
+        components_observer.on_current_pedalboard_changed('pedalboard')
+
+        display.on_param_value_changed.assert_not_called()
+        display.on_current_pedalboard_changed.assert_called_once_with('pedalboard')
+        observer.on_param_value_changed.assert_called_once_with('param')
+        observer.on_current_pedalboard_changed.assert_called_once_with('pedalboard')
+
+        components_observer.unregister(display)
+        components_observer.on_current_pedalboard_changed('pedalboard')
+        display.on_current_pedalboard_changed.assert_called_once_with('pedalboard')
+
+    def test_events_invalid(self):
+        components_observer = ComponentsObserver(BanksManager())
+
+        with self.assertRaises(ValueError):
+            components_observer.register(MockObserver(), events=['on_pedalboard_changed'])
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from application.controller.component_data_controller import ComponentDataController
+from application.controller.component_data_controller import ComponentDataController, FrozenDict
 
 from test.controller.controller_test import ControllerTest
 
@@ -62,6 +62,18 @@ class ComponentDataControllerTest(ControllerTest):
 
         del self.controller[self.key]
 
+    def test_nested_changes_not_works(self):
+        self.controller[self.key] = {'test': 'test_nested_changes_not_works', 'list': [{'a': 1}]}
+
+        data = self.controller[self.key]
+        data['list'][0]['a'] = 2
+        data['list'].append(3)
+
+        self.assertEqual([{'a': 1}], self.controller[self.key]['list'])
+        self.assertEqual([{'a': 1}], self.controller.view(self.key)['list'])
+
+        del self.controller[self.key]
+
     def test_delete_content(self):
         data = {'test': 'test_delete_content'}
 
@@ -70,3 +82,72 @@ class ComponentDataControllerTest(ControllerTest):
         del self.controller[self.key]
 
         self.assertEqual(self.controller[self.key], {})
+
+    def test_view(self):
+        data = {'test': 'test_view', 'list': [{'a': 1}]}
+        self.controller[self.key] = data
+
+        view = self.controller.view(self.key)
+        self.assertIsInstance(view, FrozenDict)
+        self.assertEqual(data, view)
+        self.assertIs(view, self.controller.view(self.key))
+        self.assertIs(view['list'], view['list'])
+
+        del self.controller[self.key]
+
+    def test_view_empty(self):
+        self.assertEqual({}, self.controller.view(self.key))
+
+    def test_view_immutable(self):
+        self.controller[self.key] = {'test': 'test_view_immutable', 'list': [{'a': 1}]}
+        view = self.controller.view(self.key)
+
+        with self.assertRaises(TypeError):
+            view['new-key'] = 'new value'
+        with self.assertRaises(TypeError):
+            view['list'][0]['a'] = 2
+        with self.assertRaises(AttributeError):
+            view['list'].append(3)
+
+        del self.controller[self.key]
+
+    def test_view_list_indexes(self):
+        self.controller[self.key] = {'list': [{'a': 1}, {'b': 2}]}
+        frozen = self.controller.view(self.key)['list']
+
+        self.assertEqual({'b': 2}, frozen[-1])
+        self.assertIs(frozen[1], frozen[-1])
+        self.assertEqual({'a': 1}, frozen[-2])
+        with self.assertRaises(IndexError):
+            frozen[-3]
+        with self.assertRaises(IndexError):
+            frozen[2]
+
+        del self.controller[self.key]
+
+    def test_view_changes_after_set(self):
+        data = {'test': 'test_view_changes_after_set', 'list': []}
+        self.controller[self.key] = data
+        view = self.controller.view(self.key)
+
+        data['list'].append(1)
+        self.assertEqual([], self.controller.view(self.key)['list'])
+
+        self.controller[self.key] = data
+        self.assertIsNot(view, self.controller.view(self.key))
+        self.assertEqual([1], self.controller.view(self.key)['list'])
+
+        del self.controller[self.key]
+
+    def test_update(self):
+        self.controller[self.key] = {'count': 1, 'list': [1]}
+
+        def increment(data):
+            data['count'] += 1
+            data['list'].append(2)
+            return data
+
+        self.controller.update(self.key, increment)
+        self.assertEqual({'count': 2, 'list': [1, 2]}, self.controller[self.key])
+
+        del self.controller[self.key]
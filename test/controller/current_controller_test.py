@@ -13,10 +13,12 @@
 # limitations under the License.
 
 import unittest
+from pathlib import Path
 
 from application.controller.current_controller import CurrentController, CurrentPedalboardError
 from pluginsmanager.model.bank import Bank
 from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.observer.autosaver.persistence import Persistence
 from test.controller.controller_test import ControllerTest
 from test.mock_observer import MockObserver
 
@@ -259,6 +261,28 @@ class CurrentControllerTest(ControllerTest):
 
         self.manager.banks.remove(bank)
 
+    def test_preload_neighbours(self):
+        mod_host = self.application.mod_host
+        mod_host.max_standby_pedalboards = 2
+        self._current.preload_size = 1
+
+        bank = Bank('Preload bank')
+        for index in range(4):
+            bank.append(Pedalboard('Preload pedalboard {}'.format(index)))
+        self.manager.append(bank)
+
+        self._current.set_pedalboard(bank.pedalboards[0])
+        self.assertEqual((bank.pedalboards[3], bank.pedalboards[1]), mod_host.standby)
+
+        self._current.to_next_pedalboard()
+        self.assertEqual(bank.pedalboards[1], mod_host.pedalboard)
+        self.assertEqual((bank.pedalboards[0], bank.pedalboards[2]), mod_host.standby)
+
+        self._current.preload_size = 0
+        mod_host.max_standby_pedalboards = 0
+        self._current.set_pedalboard(self._first_pedalboard)
+        self.manager.banks.remove(bank)
+
     @unittest.skip
     def test_load_wrong_pedalboard_index_error(self):
         """
@@ -266,3 +290,56 @@ class CurrentControllerTest(ControllerTest):
         (The file informs bank index and pedalboard index).
         """
         assert False
+
+    def test_set_pedalboard_by(self):
+        bank = self.bank_with_pedalboard
+        self.manager.append(bank)
+        pedalboard = bank.pedalboards[0]
+
+        self._current.set_pedalboard_by(bank_name='A bank', name='A pedalboard')
+        self.assertEqual(pedalboard, self._current.pedalboard)
+
+        self._current.set_pedalboard_by(program=0, bank=0)
+        self.assertEqual(self._first_pedalboard, self._current.pedalboard)
+
+        self._current.set_pedalboard_by(uuid=pedalboard.data['uuid'])
+        self.assertEqual(pedalboard, self._current.pedalboard)
+
+        # Program of the current bank
+        self._current.set_pedalboard_by(program=0)
+        self.assertEqual(pedalboard, self._current.pedalboard)
+
+        with self.assertRaises(CurrentPedalboardError):
+            self._current.set_pedalboard_by(program=1)
+        with self.assertRaises(CurrentPedalboardError):
+            self._current.set_pedalboard_by(program=0, bank=len(self.manager.banks))
+
+        self._current.pedalboard = self._first_pedalboard
+        self.manager.banks.remove(bank)
+
+        with self.assertRaises(CurrentPedalboardError):
+            self._current.set_pedalboard_by(uuid=pedalboard.data['uuid'])
+
+    def test_added_pedalboards_uuid(self):
+        bank = self.bank_with_pedalboard
+        self.manager.append(bank)
+
+        pedalboard = Pedalboard('Other pedalboard')
+        bank.append(pedalboard)
+
+        autosaver = self.application.autosaver
+        autosaver.flush()
+
+        data = Persistence.read(Path(autosaver.data_path) / Path('{}.json'.format(bank.uuid)))
+        uuids = [pedalboard['data']['uuid'] for pedalboard in data['pedalboards']]
+        self.assertEqual([pedalboard.data['uuid'] for pedalboard in bank.pedalboards], uuids)
+        self.assertNotIn(None, uuids)
+        self.assertEqual(2, len(set(uuids)))
+
+        self.manager.banks.remove(bank)
+        autosaver.flush()
+
+    def test_set_pedalboard_by_without_identification(self):
+        with self.assertRaises(ValueError):
+            self._current.set_pedalboard_by()
+
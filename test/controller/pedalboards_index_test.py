@@ -0,0 +1,99 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from application.controller.device_controller import DeviceController
+from application.controller.pedalboards_index import PedalboardsIndex
+from application.dao.lazy_bank import LazyBank
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+
+
+class PedalboardsIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = BanksManager()
+        for bank_index in range(3):
+            bank = Bank('Bank {}'.format(bank_index))
+            for pedalboard_index in range(2):
+                pedalboard = Pedalboard('Pedalboard {}'.format(pedalboard_index))
+                pedalboard.data = {'uuid': 'uuid-{}-{}'.format(bank_index, pedalboard_index)}
+                bank.append(pedalboard)
+
+            self.manager.append(bank)
+
+        self.index = PedalboardsIndex(self.manager)
+
+    def pedalboard(self, bank, pedalboard):
+        return self.manager.banks[bank].pedalboards[pedalboard]
+
+    def test_search(self):
+        self.assertEqual(self.pedalboard(1, 0), self.index.by_name('Bank 1', 'Pedalboard 0'))
+        self.assertEqual(self.pedalboard(2, 1), self.index.by_uuid('uuid-2-1'))
+
+        self.assertIsNone(self.index.by_name('Bank 1', 'Pedalboard 5'))
+        self.assertIsNone(self.index.by_uuid('unknown'))
+
+    def test_index_built_once(self):
+        for _ in range(10):
+            self.index.by_name('Bank 1', 'Pedalboard 0')
+            self.index.by_uuid('uuid-0-1')
+
+        self.assertEqual(1, self.index.rebuilds)
+
+    def test_miss_doesnt_rebuild(self):
+        for index in range(10):
+            self.assertIsNone(self.index.by_uuid('unknown {}'.format(index)))
+            self.assertIsNone(self.index.by_name('Bank 1', 'Unknown {}'.format(index)))
+
+        self.assertEqual(1, self.index.rebuilds)
+
+    def test_invalidate(self):
+        self.index.by_uuid('uuid-0-0')
+
+        self.manager.banks.remove(self.manager.banks[0])
+        self.index.invalidate()
+
+        self.assertEqual(self.pedalboard(0, 0), self.index.by_uuid('uuid-1-0'))
+        self.assertIsNone(self.index.by_uuid('uuid-0-0'))
+        self.assertEqual(2, self.index.rebuilds)
+
+    def test_changes_not_notified(self):
+        self.index.by_uuid('uuid-0-0')
+
+        self.pedalboard(1, 0).name = 'Renamed'
+
+        # Outdated hit: rebuilds
+        self.assertIsNone(self.index.by_name('Bank 1', 'Pedalboard 0'))
+        self.assertEqual(2, self.index.rebuilds)
+        self.assertEqual(self.pedalboard(1, 0), self.index.by_name('Bank 1', 'Renamed'))
+
+        self.pedalboard(1, 0).name = 'Renamed again'
+        self.assertIsNone(self.index.by_name('Bank 1', 'Renamed again'))
+
+        self.index.invalidate()
+        self.assertEqual(self.pedalboard(1, 0), self.index.by_name('Bank 1', 'Renamed again'))
+
+    def test_lazy_bank_not_loaded(self):
+        bank = LazyBank('Lazy', 'lazy-uuid', None, ['Lazy 0', 'Lazy 1'], DeviceController.sys_effect,
+                        pedalboards_uuids=['lazy-0', None])
+        self.manager.append(bank)
+
+        self.index.by_uuid('uuid-0-0')
+
+        self.assertFalse(bank.loaded)
+        self.assertEqual((bank, 1), self.index._by_name[('Lazy', 'Lazy 1')])
+        self.assertEqual((bank, 0), self.index._by_uuid['lazy-0'])
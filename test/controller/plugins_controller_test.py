@@ -0,0 +1,227 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from application.controller.lv2_catalog_effect_builder import Lv2CatalogPlugins
+from application.controller.lv2_effect_template import Lv2EffectTemplate
+from application.controller.plugins_controller import PluginsController, PluginTechnology
+from pluginsmanager.model.lv2.lv2_effect import Lv2Effect
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder, Lv2EffectBuilderError
+from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.observer.autosaver.persistence import Persistence
+from test.controller.controller_test import ControllerTest
+
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class PluginsControllerTest(ControllerTest):
+
+    def setUp(self):
+        self.lv2_path = Path(tempfile.mkdtemp())
+        (self.lv2_path / Path('calf.lv2')).mkdir()
+
+        self.controller = PluginsController(self.application)
+        self.controller.lv2_path = [str(self.lv2_path)]
+
+    def tearDown(self):
+        shutil.rmtree(str(self.lv2_path))
+
+    def test_fingerprint(self):
+        fingerprint = self.controller.lv2_fingerprint()
+        self.assertEqual(fingerprint, self.controller.lv2_fingerprint())
+
+        (self.lv2_path / Path('gx_scream.lv2')).mkdir()
+        self.assertNotEqual(fingerprint, self.controller.lv2_fingerprint())
+
+    def test_fingerprint_dangling_symlink(self):
+        fingerprint = self.controller.lv2_fingerprint()
+
+        (self.lv2_path / Path('removed.lv2')).symlink_to(self.lv2_path / Path('not-exists.lv2'))
+        self.assertEqual(fingerprint, self.controller.lv2_fingerprint())
+
+    def test_background_scan(self):
+        plugins_data = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+
+        with patch.object(Lv2EffectBuilder, 'lv2_plugins_data', return_value=plugins_data) as lv2_plugins_data:
+            self.controller.configure()
+            builder = self.controller.lv2_builder
+
+            self.controller.scan_thread.join(5)
+
+            lv2_plugins_data.assert_called_once_with()
+            self.assertFalse(self.controller.scanning)
+            self.assertIsNot(builder, self.controller.lv2_builder)
+
+            # Not changed: not rescan
+            self.controller.scan_thread = None
+            self.controller.configure()
+            self.assertIsNone(self.controller.scan_thread)
+
+    def test_background_scan_error(self):
+        with patch.object(Lv2EffectBuilder, 'lv2_plugins_data', side_effect=ImportError()):
+            self.controller.configure()
+            builder = self.controller.lv2_builder
+
+            self.controller.scan_thread.join(5)
+
+        self.assertIs(builder, self.controller.lv2_builder)
+        self.assertNotEqual(self.controller.lv2_fingerprint(), self.controller._dao.load_fingerprint())
+
+    def test_plugins_from_catalog(self):
+        plugins = self.application.controller(PluginsController)
+        lv2_plugins = plugins.by(PluginTechnology.LV2)
+
+        self.assertIsInstance(lv2_plugins, Lv2CatalogPlugins)
+        self.assertEqual(plugins.catalog.count(), len(lv2_plugins))
+        self.assertIn(REVERB, lv2_plugins)
+        self.assertNotIn('http://not/installed', lv2_plugins)
+        self.assertEqual(plugins.catalog.get(REVERB), lv2_plugins[REVERB].json)
+
+        # Only the referenced plugins are kept in memory
+        lv2_plugins = Lv2CatalogPlugins(plugins.catalog)
+        reverb = Lv2Effect(lv2_plugins[REVERB])
+        self.assertIs(reverb.plugin, lv2_plugins[REVERB])
+
+        del reverb
+        gc.collect()
+        self.assertNotIn(REVERB, lv2_plugins._loaded)
+
+    def test_lv2_effect_template(self):
+        plugins = self.application.controller(PluginsController)
+
+        reverb = plugins.lv2_effect(REVERB)
+        other = plugins.lv2_effect(REVERB)
+
+        self.assertIsInstance(reverb, Lv2Effect)
+        self.assertEqual(Lv2Effect(plugins.lv2_builder.all[REVERB]).json, reverb.json)
+        self.assertEqual(len(reverb.params), len(reverb.plugin['ports']['control']['input']))
+
+        for param, other_param in zip(reverb.params, other.params):
+            self.assertIs(reverb, param.effect)
+            self.assertIsNot(param, other_param)
+            self.assertIs(param, reverb.params[param.symbol])
+
+        for port in reverb.inputs + reverb.outputs + reverb.midi_inputs + reverb.midi_outputs:
+            self.assertIs(reverb, port.effect)
+
+        reverb.params[0].value = reverb.params[0].maximum
+        self.assertEqual(other.params[0].default, other.params[0].value)
+
+        pedalboard = Pedalboard('Templates')
+        pedalboard.append(reverb)
+        self.assertIs(pedalboard.observer, reverb.params[0].observer)
+
+        with self.assertRaises(Lv2EffectBuilderError):
+            plugins.lv2_effect('http://not/installed')
+
+    def test_lv2_effect_template_attributes(self):
+        """
+        Lv2EffectTemplate builds the effects without the pluginsmanager constructors.
+        The template must set the same attributes
+        """
+        plugins = self.application.controller(PluginsController)
+        self.assertTrue(Lv2EffectTemplate(plugins.lv2_builder.all[REVERB]).compatible)
+
+        built = plugins.lv2_builder.build(REVERB)
+        template = plugins.lv2_effect(REVERB)
+
+        groups = ('_params', '_inputs', '_outputs', '_midi_inputs', '_midi_outputs')
+        self.assertEqual(type(built), type(template))
+        self.assertAttributesEqual(built, template, ignore=('_observer', ) + groups)
+
+        for group in groups:
+            built_elements = getattr(built, group)
+            template_elements = getattr(template, group)
+
+            self.assertEqual(type(built_elements), type(template_elements))
+            self.assertEqual(self.attributes(built_elements).keys(), self.attributes(template_elements).keys())
+            self.assertEqual(list(built_elements._dict), list(template_elements._dict))
+            self.assertEqual(len(built_elements), len(template_elements))
+
+            for built_element, template_element in zip(built_elements, template_elements):
+                self.assertEqual(type(built_element), type(template_element))
+                self.assertIs(built, built_element.effect)
+                self.assertIs(template, template_element.effect)
+                self.assertIs(template_element, template_elements[template_element.symbol])
+                self.assertAttributesEqual(built_element, template_element, ignore=('_effect', 'observer'))
+
+    def test_lv2_effect_template_other_layout(self):
+        plugin = self.application.controller(PluginsController).lv2_builder.all[REVERB]
+        constructor = Lv2Effect.__init__
+
+        def other_layout(effect, plugin):
+            constructor(effect, plugin)
+            effect._other_attribute = None
+
+        with patch.object(Lv2Effect, '__init__', other_layout):
+            template = Lv2EffectTemplate(plugin)
+            effect = template.build()
+
+        self.assertFalse(template.compatible)
+        self.assertIn('_other_attribute', self.attributes(effect))
+        self.assertEqual(Lv2Effect(plugin).json, effect.json)
+
+    def assertAttributesEqual(self, built, template, ignore):
+        built_attributes = self.attributes(built)
+        template_attributes = self.attributes(template)
+
+        self.assertEqual(sorted(built_attributes), sorted(template_attributes))
+        for name, value in built_attributes.items():
+            if name not in ignore:
+                self.assertEqual(value, template_attributes[name], name)
+
+    @staticmethod
+    def attributes(instance):
+        # The pluginsmanager models replaces __dict__ by its json representation
+        return next(referent for referent in gc.get_referents(instance) if isinstance(referent, dict))
+
+    def test_lv2_effect_templates_reload(self):
+        plugins_data = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+
+        with patch.object(Lv2EffectBuilder, 'lv2_plugins_data', return_value=plugins_data):
+            self.controller.configure()
+            self.controller.scan_thread.join(5)
+
+            self.controller.lv2_effect(REVERB)
+            template = self.controller._lv2_templates[REVERB]
+            self.controller.lv2_effect(REVERB)
+            self.assertIs(template, self.controller._lv2_templates[REVERB])
+
+            self.controller.reload_lv2_plugins_data()
+
+        self.assertNotIn(REVERB, self.controller._lv2_templates)
+        self.assertIs(self.controller.lv2_builder.all[REVERB], self.controller.lv2_effect(REVERB).plugin)
+
+    def test_search(self):
+        plugins_data = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+        self.addCleanup(self.controller._dao.save, plugins_data)
+
+        with patch.object(Lv2EffectBuilder, 'lv2_plugins_data', return_value=plugins_data):
+            self.controller.configure()
+            self.controller.scan_thread.join(5)
+
+            self.assertIs(self.controller.lv2_builder.all[REVERB], self.controller.search('calf reverb')[0])
+
+            plugins_data = [plugin for plugin in plugins_data if plugin['uri'] != REVERB]
+            Lv2EffectBuilder.lv2_plugins_data.return_value = plugins_data
+            self.controller.reload_lv2_plugins_data()
+
+        self.assertNotIn(REVERB, self.controller.search_index)
+        self.assertEqual(len(plugins_data), len(self.controller.search_index))
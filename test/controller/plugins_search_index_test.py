@@ -0,0 +1,62 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from pathlib import Path
+
+from application.controller.plugins_search_index import PluginsSearchIndex
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+SCREAM = 'http://guitarix.sourceforge.net/plugins/gx_scream_#_scream_'
+
+
+class PluginsSearchIndexTest(unittest.TestCase):
+    plugins = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.plugins = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+
+    def setUp(self):
+        self.index = PluginsSearchIndex()
+        self.assertEqual((len(self.plugins), 0), self.index.update(self.plugins))
+
+    def test_search(self):
+        self.assertEqual(REVERB, self.index.search('calf reverb')[0])
+        self.assertEqual(SCREAM, self.index.search('scream')[0])
+        self.assertEqual([], self.index.search(' - '))
+        self.assertEqual([], self.index.search('qqqq'))
+
+        self.assertEqual(3, len(self.index.search('reverb', limit=3)))
+        self.assertEqual(self.index.search('reverb', limit=None)[:3], self.index.search('reverb', limit=3))
+
+    def test_search_incomplete_and_typos(self):
+        self.assertIn(SCREAM, self.index.search('scre', limit=3))
+        self.assertIn(SCREAM, self.index.search('screm', limit=3))
+        self.assertEqual(REVERB, self.index.search('calf revreb')[0])
+
+    def test_update_incremental(self):
+        self.assertEqual((0, 0), self.index.update(self.plugins))
+
+        plugins = [plugin for plugin in self.plugins if plugin['uri'] != SCREAM]
+        reverb = [plugin for plugin in plugins if plugin['uri'] == REVERB][0]
+        plugins[plugins.index(reverb)] = dict(reverb, name='Calf Cathedral')
+
+        self.assertEqual((1, 1), self.index.update(plugins))
+
+        self.assertNotIn(SCREAM, self.index)
+        self.assertNotIn(SCREAM, self.index.search('scream', limit=None))
+        self.assertEqual(REVERB, self.index.search('cathedral')[0])
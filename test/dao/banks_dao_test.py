@@ -0,0 +1,141 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from application.controller.device_controller import DeviceController
+from application.dao.banks_dao import BanksDao
+from application.dao.banks_reader import BanksReader
+from application.dao.data_store import DataStore
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class BanksDaoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        (self.data_path / Path('banks')).mkdir()
+
+        self.dao = BanksDao(self.data_path)
+
+        manager = BanksManager()
+        for index in range(3):
+            bank = Bank('Bank {}'.format(index))
+            bank.append(Pedalboard('Bank {} pedalboard 0'.format(index)))
+            bank.append(Pedalboard('Bank {} pedalboard 1'.format(index)))
+            BanksDao.assign_uuids(bank)
+            manager.append(bank)
+
+        self.dao.autosaver.save(manager)
+        self.banks = manager.banks
+
+    def tearDown(self):
+        shutil.rmtree(str(self.data_path))
+
+    def test_load_lazy(self):
+        manager = self.dao.load(DeviceController.sys_effect, lazy=True, current_bank=1)
+        bank0, bank1, bank2 = manager.banks
+
+        self.assertEqual([False, True, False], [bank.loaded for bank in manager.banks])
+        self.assertEqual([bank.uuid for bank in self.banks], [bank.uuid for bank in manager.banks])
+        self.assertEqual(['Bank 0 pedalboard 0', 'Bank 0 pedalboard 1'], bank0.pedalboards_names)
+
+        self.assertEqual(self.banks[0].json, bank0.json)
+        self.assertTrue(bank0.loaded)
+        self.assertEqual(bank0, bank0.pedalboards[0].bank)
+
+        # The stubs share the dao reader (plugins builder and effects templates)
+        self.assertIsInstance(bank0._reader, BanksReader)
+        self.assertIs(bank0._reader, bank2._reader)
+
+    def test_load_lazy_changes_are_persisted(self):
+        manager = self.dao.load(DeviceController.sys_effect, lazy=True)
+        bank = manager.banks[2]
+
+        bank.append(Pedalboard('New pedalboard'))
+        self.dao.autosaver.flush()
+
+        data = Persistence.read(self.data_path / Path('banks/{}.json'.format(bank.uuid)))
+        self.assertEqual(
+            ['Bank 2 pedalboard 0', 'Bank 2 pedalboard 1', 'New pedalboard'],
+            [pedalboard['name'] for pedalboard in data['pedalboards']]
+        )
+
+    def test_summary(self):
+        self.dao.load(DeviceController.sys_effect, lazy=True)
+        self.assertTrue(self.dao.summary_path.exists())
+
+        with patch('application.dao.banks_dao.Persistence.read', wraps=Persistence.read) as read:
+            manager = self.dao.load(DeviceController.sys_effect, lazy=True)
+
+        # Only the summary and the index file are read
+        read_files = [str(call[0][0]) for call in read.call_args_list]
+        self.assertFalse([file for file in read_files if file.endswith('.json')])
+        self.assertEqual(['Bank 1 pedalboard 0', 'Bank 1 pedalboard 1'], manager.banks[1].pedalboards_names)
+
+    def test_assign_uuids_on_load(self):
+        manager = self.banks[0].manager
+        for pedalboard in self.banks[2].pedalboards:
+            pedalboard.data = {}
+        self.dao.autosaver.save(manager)
+
+        dao = BanksDao(self.data_path)
+        manager = dao.load(DeviceController.sys_effect, lazy=True)
+        bank = manager.banks[2]
+
+        # Only the bank with pedalboards without uuid is loaded
+        self.assertEqual([False, False, True], [bank.loaded for bank in manager.banks])
+        uuids = bank.pedalboards_uuids
+        self.assertNotIn(None, uuids)
+        self.assertEqual((bank, ), dao.autosaver.banks_files.dirty)
+
+        dao.autosaver.flush()
+
+        manager = BanksDao(self.data_path).load(DeviceController.sys_effect)
+        self.assertEqual(uuids, [pedalboard.data['uuid'] for pedalboard in manager.banks[2].pedalboards])
+
+    def test_store(self):
+        store = DataStore(self.data_path / Path('pedalpi.db'))
+        dao = BanksDao(self.data_path, store=store)
+
+        manager = dao.load(DeviceController.sys_effect)
+        self.assertEqual([bank.json for bank in self.banks], [bank.json for bank in manager.banks])
+
+        manager.banks[0].append(Pedalboard('New pedalboard'))
+        manager.banks[2].pedalboards.remove(manager.banks[2].pedalboards[0])
+        commits = store.commits
+        dao.autosaver.flush()
+
+        # The dirty banks are written in one transaction
+        self.assertEqual(commits + 1, store.commits)
+
+        file = Persistence.read(self.data_path / Path('banks/{}.json'.format(self.banks[0].uuid)))
+        self.assertEqual(2, len(file['pedalboards']))
+
+        manager.banks.remove(manager.banks[1])
+
+        manager = BanksDao(self.data_path, store=store).load(DeviceController.sys_effect, lazy=True, current_bank=0)
+        bank0, bank2 = manager.banks
+        self.assertEqual(['Bank 0 pedalboard 0', 'Bank 0 pedalboard 1', 'New pedalboard'], bank0.pedalboards_names)
+        self.assertEqual(['Bank 2 pedalboard 1'], bank2.pedalboards_names)
+        self.assertFalse(bank2.loaded)
+        self.assertEqual('Bank 2 pedalboard 1', bank2.pedalboards[0].name)
+        store.close()
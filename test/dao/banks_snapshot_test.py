@@ -0,0 +1,145 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from application.controller.device_controller import DeviceController
+from application.dao.banks_dao import BanksDao
+from application.dao.banks_reader import BanksReader
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.observer.autosaver.persistence import Persistence
+from pluginsmanager.util.persistence_decoder import PersistenceDecoder
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class BanksSnapshotTest(unittest.TestCase):
+    builder = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.builder = Lv2EffectBuilder()
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        (self.data_path / Path('banks')).mkdir()
+
+        self.dao = BanksDao(self.data_path)
+
+        manager = BanksManager()
+        for index in range(3):
+            manager.append(self.generate_bank('Bank {}'.format(index)))
+
+        self.dao.autosaver.save(manager)
+        self.dao.autosaver.index_file.save(manager)
+        self.banks = manager.banks
+
+    def tearDown(self):
+        shutil.rmtree(str(self.data_path))
+
+    def generate_bank(self, name):
+        sys_effect = DeviceController.sys_effect
+
+        pedalboard = Pedalboard('{} pedalboard'.format(name))
+        reverb = self.builder.build(REVERB)
+        pedalboard.append(reverb)
+        pedalboard.connect(sys_effect.outputs[0], reverb.inputs[0])
+        pedalboard.connect(reverb.outputs[0], sys_effect.inputs[0])
+        reverb.params[0].value = reverb.params[0].maximum
+        reverb.toggle()
+
+        bank = Bank(name)
+        bank.append(pedalboard)
+        BanksDao.assign_uuids(bank)
+
+        return bank
+
+    def load(self, dao=None):
+        dao = BanksDao(self.data_path) if dao is None else dao
+        return dao.load(DeviceController.sys_effect, snapshot=True)
+
+    def test_reader(self):
+        json = self.banks[0].json
+
+        expected = PersistenceDecoder(DeviceController.sys_effect).read(json)
+        bank = BanksReader(DeviceController.sys_effect, self.builder).read(json)
+
+        self.assertEqual(expected.json, bank.json)
+
+    def test_load_snapshot(self):
+        self.assertFalse(self.dao.snapshot.path.exists())
+        manager = self.load()
+        self.assertTrue(self.dao.snapshot.path.exists())
+        modified = self.dao.snapshot.path.stat().st_mtime_ns
+
+        dao = BanksDao(self.data_path)
+        with patch('application.dao.banks_snapshot.json', wraps=json) as json_module:
+            snapshot_manager = self.load(dao)
+
+        # The json files aren't decoded and the snapshot isn't written again
+        self.assertFalse(json_module.loads.called)
+        self.assertEqual(0, dao.snapshot.decoded)
+        self.assertEqual(modified, self.dao.snapshot.path.stat().st_mtime_ns)
+
+        self.assertEqual(
+            sorted(bank.uuid for bank in self.banks),
+            sorted(bank.uuid for bank in snapshot_manager.banks)
+        )
+        self.assertEqual([bank.json for bank in manager.banks], [bank.json for bank in snapshot_manager.banks])
+        # Observed by the autosaver
+        self.assertEqual(1, len(snapshot_manager.observer_manager.observers))
+
+    def test_outdated_snapshot(self):
+        self.load()
+
+        dao = BanksDao(self.data_path)
+        manager = self.load(dao)
+        manager.banks[1].append(Pedalboard('New pedalboard'))
+        dao.autosaver.flush()
+
+        # Only the changed bank is decoded
+        dao = BanksDao(self.data_path)
+        manager = self.load(dao)
+        self.assertEqual(1, dao.snapshot.decoded)
+        self.assertEqual(
+            ['Bank 1 pedalboard', 'New pedalboard'],
+            [pedalboard.name for pedalboard in manager.banks[1].pedalboards]
+        )
+
+        dao = BanksDao(self.data_path)
+        self.load(dao)
+        self.assertEqual(0, dao.snapshot.decoded)
+
+    def test_removed_bank(self):
+        manager = self.load()
+        del manager.banks[0]
+
+        manager = self.load()
+        self.assertEqual(['Bank 1', 'Bank 2'], [bank.name for bank in manager.banks])
+
+    def test_invalid_snapshot(self):
+        with open(str(self.dao.snapshot.path), 'wb') as file:
+            file.write(b'invalid')
+
+        manager = self.load(self.dao)
+        self.assertEqual(['Bank 0', 'Bank 1', 'Bank 2'], [bank.name for bank in manager.banks])
+        self.assertEqual(3, self.dao.snapshot.decoded)
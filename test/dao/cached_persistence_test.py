@@ -0,0 +1,71 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from application.dao.cached_persistence import CachedPersistence
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class CachedPersistenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        self.path = self.data_path / Path('data.json')
+        Persistence.save(self.path, {'value': 1})
+
+        self.persistence = CachedPersistence()
+
+    def tearDown(self):
+        shutil.rmtree(str(self.data_path))
+
+    def test_read_cached(self):
+        self.assertEqual({'value': 1}, self.persistence.read(self.path))
+
+        with patch('application.dao.cached_persistence.Persistence.read') as read:
+            for _ in range(10):
+                self.assertEqual({'value': 1}, self.persistence.read(self.path))
+
+        read.assert_not_called()
+        self.assertEqual(10, self.persistence.hits)
+        self.assertEqual(1, self.persistence.misses)
+
+    def test_file_changed(self):
+        self.persistence.read(self.path)
+
+        Persistence.save(self.path, {'value': 22})
+        stat = self.path.stat()
+        os.utime(str(self.path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+        self.assertEqual({'value': 22}, self.persistence.read(self.path))
+        self.assertEqual(2, self.persistence.misses)
+
+    def test_save(self):
+        self.persistence.save(self.path, {'value': 3})
+
+        self.assertEqual({'value': 3}, Persistence.read(self.path))
+        self.assertEqual({'value': 3}, self.persistence.read(self.path))
+        self.assertEqual(0, self.persistence.misses)
+
+    def test_invalidate(self):
+        self.persistence.read(self.path)
+        self.persistence.invalidate(self.path)
+        self.persistence.read(self.path)
+
+        self.assertEqual(2, self.persistence.misses)
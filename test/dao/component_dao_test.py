@@ -0,0 +1,143 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from application.dao.component_dao import ComponentDao
+from application.dao.data_store import DataStore
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class ComponentDaoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        (self.data_path / Path('components')).mkdir()
+
+        self.dao = ComponentDao(self.data_path, journal=True, compact_after=3)
+        Persistence.save(self.dao.path, {'display': {'line': 1}})
+
+    def tearDown(self):
+        self.dao.close()
+        shutil.rmtree(str(self.data_path))
+
+    def reload(self):
+        return ComponentDao(self.data_path, journal=True).load()
+
+    def test_journal_changes(self):
+        data = self.dao.load()
+
+        data['web'] = {'port': 3000}
+        self.dao.save_key(data, 'web')
+        del data['display']
+        self.dao.delete_key(data, 'display')
+
+        self.assertEqual({'display': {'line': 1}}, Persistence.read(self.dao.path))
+        self.assertTrue(self.dao.journal_path.exists())
+        self.assertEqual({'web': {'port': 3000}}, self.reload())
+
+    def test_compact(self):
+        data = self.dao.load()
+
+        for index in range(3):
+            data['key'] = index
+            self.dao.save_key(data, 'key')
+
+        self.assertFalse(self.dao.journal_path.exists())
+        self.assertEqual({'display': {'line': 1}, 'key': 2}, Persistence.read(self.dao.path))
+
+    def test_incomplete_entry_ignored(self):
+        data = self.dao.load()
+        data['web'] = {'port': 3000}
+        self.dao.save_key(data, 'web')
+
+        with open(str(self.dao.journal_path), 'a') as journal:
+            journal.write('["set", "midi", {"chan')
+
+        self.assertEqual({'display': {'line': 1}, 'web': {'port': 3000}}, self.reload())
+
+    def test_changes_after_incomplete_entry(self):
+        data = self.dao.load()
+        data['web'] = {'port': 3000}
+        self.dao.save_key(data, 'web')
+        self.dao._close_journal()
+
+        with open(str(self.dao.journal_path), 'a') as journal:
+            journal.write('["set", "midi", {"chan')
+
+        # Restart after the crash
+        dao = ComponentDao(self.data_path, journal=True, compact_after=10)
+        data = dao.load()
+        data['midi'] = {'channel': 2}
+        dao.save_key(data, 'midi')
+        dao._close_journal()
+
+        self.assertEqual({'display': {'line': 1}, 'web': {'port': 3000}, 'midi': {'channel': 2}}, self.reload())
+
+    def test_disable_journal_compacts(self):
+        data = self.dao.load()
+        data['web'] = {'port': 3000}
+        self.dao.save_key(data, 'web')
+
+        self.dao.journal = False
+
+        self.assertFalse(self.dao.journal_path.exists())
+        self.assertEqual(data, Persistence.read(self.dao.path))
+
+    def test_without_journal(self):
+        self.dao.journal = False
+
+        data = self.dao.load()
+        data['web'] = {'port': 3000}
+        self.dao.save_key(data, 'web')
+
+        self.assertFalse(self.dao.journal_path.exists())
+        self.assertEqual(data, Persistence.read(self.dao.path))
+
+    def test_journal_compacted_when_loaded_without_journal(self):
+        data = self.dao.load()
+        data['web'] = {'port': 3000}
+        self.dao.save_key(data, 'web')
+        self.dao._close_journal()
+
+        dao = ComponentDao(self.data_path, journal=False)
+        data = dao.load()
+        self.assertFalse(self.dao.journal_path.exists())
+
+        data['web'] = {'port': 4000}
+        dao.save_key(data, 'web')
+
+        self.assertEqual({'display': {'line': 1}, 'web': {'port': 4000}}, ComponentDao(self.data_path).load())
+
+    def test_store(self):
+        store = DataStore(self.data_path / Path('pedalpi.db'))
+        dao = ComponentDao(self.data_path, store=store)
+
+        data = dao.load()
+        self.assertEqual({'display': {'line': 1}}, data)
+
+        writes = store.writes
+        data['web'] = {'port': 3000}
+        dao.save_key(data, 'web')
+        del data['display']
+        dao.delete_key(data, 'display')
+
+        # Only the changed keys are written
+        self.assertEqual(writes + 2, store.writes)
+        self.assertEqual({'display': {'line': 1}}, Persistence.read(self.dao.path))
+        self.assertEqual({'web': {'port': 3000}}, ComponentDao(self.data_path, store=store).load())
+        store.close()
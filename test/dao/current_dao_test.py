@@ -0,0 +1,134 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from application.dao.current_dao import CurrentDao
+from application.dao.data_store import DataStore
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class CurrentDaoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        (self.data_path / Path('current')).mkdir()
+
+        self.dao = CurrentDao(self.data_path, delay=0.05)
+        Persistence.save(self.dao.path, {'bank': 0, 'pedalboard': 0})
+
+    def tearDown(self):
+        self.dao.flush()
+        shutil.rmtree(str(self.data_path))
+
+    def test_save_coalesces_writes(self):
+        for pedalboard in range(10):
+            self.dao.save(1, pedalboard)
+
+        self.assertTrue(self.dao.pending)
+        self.assertEqual({'bank': 0, 'pedalboard': 0}, Persistence.read(self.dao.path))
+
+        data = self.dao.load()
+        self.assertEqual(1, data.bank)
+        self.assertEqual(9, data.pedalboard)
+
+    def test_save_after_delay(self):
+        self.dao.save(1, 2)
+
+        time.sleep(0.2)
+
+        self.assertFalse(self.dao.pending)
+        self.assertEqual({'bank': 1, 'pedalboard': 2}, Persistence.read(self.dao.path))
+
+    def test_continuous_changes_written_after_max_delay(self):
+        self.dao.delay = 0.1
+        self.dao.max_delay = 0.2
+        threads = threading.active_count()
+
+        start = time.perf_counter()
+        pedalboard = 0
+        while Persistence.read(self.dao.path)['pedalboard'] == 0 and time.perf_counter() - start < 2:
+            pedalboard += 1
+            self.dao.save(1, pedalboard)
+            time.sleep(0.02)
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertLessEqual(threading.active_count(), threads + 1)
+
+    def test_flush(self):
+        self.dao.delay = 60
+        self.dao.save(3, 4)
+
+        self.dao.flush()
+
+        self.assertFalse(self.dao.pending)
+        self.assertEqual({'bank': 3, 'pedalboard': 4}, Persistence.read(self.dao.path))
+        self.assertFalse(Path(str(self.dao.path) + '.tmp').exists())
+
+    def test_save_doesnt_wait_the_write(self):
+        self.dao.delay = 60
+        writing = threading.Event()
+        release = threading.Event()
+        write = self.dao._write
+
+        def slow_write(data):
+            writing.set()
+            release.wait(5)
+            write(data)
+
+        self.dao._write = slow_write
+        self.dao.save(3, 4)
+
+        flusher = threading.Thread(target=self.dao.flush)
+        flusher.start()
+        self.assertTrue(writing.wait(5))
+
+        start = time.perf_counter()
+        self.dao.save(5, 6)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        self.dao._write = write
+        release.set()
+        flusher.join(5)
+
+        self.assertEqual({'bank': 3, 'pedalboard': 4}, Persistence.read(self.dao.path))
+        self.assertEqual(5, self.dao.load().bank)
+        self.dao.flush()
+        self.assertEqual({'bank': 5, 'pedalboard': 6}, Persistence.read(self.dao.path))
+
+    def test_save_empty(self):
+        self.dao.save_empty()
+        self.dao.flush()
+
+        self.assertTrue(self.dao.load().empty)
+
+    def test_store(self):
+        store = DataStore(self.data_path / Path('pedalpi.db'))
+        dao = CurrentDao(self.data_path, delay=60, store=store)
+
+        # Imported of current.json
+        self.assertEqual(0, dao.load().bank)
+
+        dao.save(2, 3)
+        dao.flush()
+
+        self.assertEqual({'bank': 2, 'pedalboard': 3}, store.get('current', 'current'))
+        self.assertEqual({'bank': 0, 'pedalboard': 0}, Persistence.read(self.dao.path))
+        self.assertEqual(3, CurrentDao(self.data_path, store=store).load().pedalboard)
+        store.close()
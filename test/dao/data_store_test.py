@@ -0,0 +1,83 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from application.dao.data_store import DataStore
+
+
+class DataStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        self.store = DataStore(self.data_path / Path('pedalpi.db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(str(self.data_path))
+
+    def reopen(self):
+        self.store.close()
+        return DataStore(self.store.path)
+
+    def test_records(self):
+        self.store.put('banks', 'b', {'name': 'B'})
+        self.store.put('banks', 'a', {'name': 'A'})
+        self.store.put('current', 'current', {'bank': 1})
+
+        self.store.put('banks', 'a', {'name': 'A2'})
+        self.store.delete('current', 'current')
+
+        store = self.reopen()
+        self.assertEqual([('a', {'name': 'A2'}), ('b', {'name': 'B'})], store.items('banks'))
+        self.assertEqual({}, store.get('current', 'current', {}))
+        self.assertIsNone(store.get('current', 'current'))
+        store.close()
+
+    def test_wal_mode(self):
+        self.store.put('banks', 'a', {})
+
+        mode = self.store._connect().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual('wal', mode)
+
+    def test_transaction(self):
+        with self.store.transaction():
+            with self.store.transaction():
+                self.store.put('banks', 'a', {'name': 'A'})
+            self.store.put('banks', 'b', {'name': 'B'})
+
+        self.assertEqual(1, self.store.commits)
+        self.assertEqual(2, self.store.writes)
+        self.assertEqual(2, len(self.store.items('banks')))
+
+    def test_transaction_rollback(self):
+        self.store.put('banks', 'a', {'name': 'A'})
+
+        with self.assertRaises(ValueError):
+            with self.store.transaction():
+                self.store.put('banks', 'a', {'name': 'Changed'})
+                self.store.clear('banks')
+                raise ValueError()
+
+        self.assertEqual([('a', {'name': 'A'})], self.store.items('banks'))
+
+    def test_migrate_once(self):
+        self.assertTrue(self.store.migrate('components', lambda: {'web': {'port': 3000}}))
+        self.store.delete('components', 'web')
+
+        self.assertFalse(self.store.migrate('components', lambda: {'web': {'port': 3000}}))
+        self.assertEqual([], self.store.items('components'))
@@ -0,0 +1,97 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from application.dao.plugins_catalog import PluginsCatalog
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class PluginsCatalogTest(unittest.TestCase):
+    plugins = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.plugins = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        self.source_path = self.data_path / Path('plugins_lv2.json')
+        Persistence.save(self.source_path, [])
+
+        self.catalog = PluginsCatalog(self.data_path / Path('plugins_lv2.catalog'))
+        self.catalog.rebuild(self.plugins, self.source_path)
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(str(self.data_path))
+
+    def test_get(self):
+        plugin = [plugin for plugin in self.plugins if plugin['uri'] == REVERB][0]
+
+        self.assertEqual(plugin, self.catalog.get(REVERB))
+        self.assertIsNone(self.catalog.get('http://not/installed'))
+
+    def test_contains_and_uris(self):
+        self.assertTrue(self.catalog.contains(REVERB))
+        self.assertFalse(self.catalog.contains('http://not/installed'))
+
+        uris = self.catalog.uris()
+        self.assertEqual(sorted(plugin['uri'] for plugin in self.plugins), sorted(uris))
+        self.assertEqual([plugin['uri'] for plugin in self.catalog.query(limit=None)], uris)
+
+    def test_query_category(self):
+        expected = sorted(
+            (plugin['name'] for plugin in self.plugins if 'Reverb' in plugin['category']),
+            key=str.lower
+        )
+
+        self.assertEqual(len(expected), self.catalog.count(category='Reverb'))
+        self.assertEqual(expected, [plugin['name'] for plugin in self.catalog.query(category='Reverb', limit=None)])
+
+    def test_query_prefix_and_pagination(self):
+        plugins = self.catalog.query(prefix='calf', limit=None)
+        self.assertTrue(plugins)
+        self.assertTrue(all(plugin['name'].lower().startswith('calf') for plugin in plugins))
+
+        page = self.catalog.query(prefix='CALF', offset=2, limit=3)
+        self.assertEqual(plugins[2:5], page)
+
+    def test_query_author_and_ports(self):
+        summary = self.catalog.query(prefix='Calf Reverb')[0]
+
+        self.assertEqual(REVERB, summary['uri'])
+        self.assertIn('Reverb', summary['category'])
+        self.assertIn(summary, self.catalog.query(
+            author=summary['author'],
+            audio_inputs=summary['ports']['audio']['input'],
+            audio_outputs=summary['ports']['audio']['output'],
+            limit=None
+        ))
+
+    def test_outdated(self):
+        self.assertFalse(self.catalog.outdated(self.source_path))
+
+        stat = self.source_path.stat()
+        os.utime(str(self.source_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertTrue(self.catalog.outdated(self.source_path))
+
+        self.assertTrue(PluginsCatalog(self.data_path / Path('other.catalog')).outdated(self.source_path))
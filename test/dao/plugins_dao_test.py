@@ -0,0 +1,49 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from application.dao.plugins_dao import PluginsDao
+from pluginsmanager.model.lv2.lv2_effect_builder import Lv2EffectBuilder
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class PluginsDaoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+        self.dao = PluginsDao(self.data_path)
+
+    def tearDown(self):
+        shutil.rmtree(str(self.data_path))
+
+    def test_plugins_data_not_cached(self):
+        plugins_data = Persistence.read(Path(Lv2EffectBuilder.plugins_json_file))
+
+        self.dao.save(plugins_data)
+        self.assertEqual(plugins_data, self.dao.load())
+        self.assertIsNot(self.dao.load(), self.dao.load())
+
+        self.assertEqual(0, self.dao.persistence.hits + self.dao.persistence.misses)
+
+    def test_fingerprint_cached(self):
+        self.assertIsNone(self.dao.load_fingerprint())
+
+        self.dao.save_fingerprint('fingerprint')
+        self.assertEqual('fingerprint', self.dao.load_fingerprint())
+        self.assertEqual('fingerprint', PluginsDao(self.data_path).load_fingerprint())
+        self.assertEqual(1, self.dao.persistence.hits)
@@ -0,0 +1,149 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from application.controller.device_controller import DeviceController
+from application.dao.atomic_persistence import AtomicPersistence
+from application.dao.write_behind_autosaver import WriteBehindAutosaver
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from pluginsmanager.observer.autosaver.persistence import Persistence
+
+
+class WriteBehindAutosaverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data_path = Path(tempfile.mkdtemp())
+
+        self.autosaver = WriteBehindAutosaver(str(self.data_path), interval=60)
+        self.manager = BanksManager()
+        self.manager.register(self.autosaver)
+
+        self.bank = Bank('WriteBehindAutosaverTest')
+        self.manager.append(self.bank)
+
+    def tearDown(self):
+        self.autosaver.banks_files.discard()
+        shutil.rmtree(str(self.data_path))
+
+    def bank_path(self, bank):
+        return self.data_path / Path('{}.json'.format(bank.uuid))
+
+    def test_write_behind(self):
+        self.assertFalse(self.bank_path(self.bank).exists())
+
+        for index in range(10):
+            self.bank.append(Pedalboard('Pedalboard {}'.format(index)))
+
+        banks_files = self.autosaver.banks_files
+        self.assertEqual((self.bank, ), banks_files.dirty)
+
+        self.autosaver.flush()
+
+        data = Persistence.read(self.bank_path(self.bank))
+        self.assertEqual(10, len(data['pedalboards']))
+        self.assertEqual(1, banks_files.writes)
+        self.assertEqual(10, banks_files.writes_avoided)
+        self.assertEqual(1, banks_files.flushes)
+        self.assertEqual((), banks_files.dirty)
+
+    def test_interval(self):
+        self.autosaver.flush()
+        self.autosaver.banks_files.interval = 0.05
+        self.bank.append(Pedalboard('Pedalboard'))
+
+        time.sleep(0.3)
+
+        self.assertEqual((), self.autosaver.banks_files.dirty)
+        self.assertTrue(self.bank_path(self.bank).exists())
+
+    def test_save_doesnt_wait_the_write(self):
+        banks_files = self.autosaver.banks_files
+        writing = threading.Event()
+        release = threading.Event()
+        save = AtomicPersistence.save
+
+        def slow_save(path, data):
+            writing.set()
+            release.wait(5)
+            save(path, data)
+
+        with patch.object(AtomicPersistence, 'save', side_effect=slow_save):
+            flush = threading.Thread(target=banks_files.flush)
+            flush.start()
+            self.assertTrue(writing.wait(5))
+
+            start = time.perf_counter()
+            self.bank.append(Pedalboard('Changed during the write'))
+            self.assertLess(time.perf_counter() - start, 1)
+            self.assertEqual((self.bank, ), banks_files.dirty)
+
+            release.set()
+            flush.join(5)
+
+        self.assertEqual(0, len(Persistence.read(self.bank_path(self.bank))['pedalboards']))
+
+        self.autosaver.flush()
+        self.assertEqual(1, len(Persistence.read(self.bank_path(self.bank))['pedalboards']))
+
+    def test_write_error(self):
+        banks_files = self.autosaver.banks_files
+
+        with patch.object(AtomicPersistence, 'save', side_effect=IOError()):
+            with self.assertRaises(IOError):
+                banks_files.flush()
+
+        self.assertEqual((self.bank, ), banks_files.dirty)
+
+        banks_files.flush()
+        self.assertTrue(self.bank_path(self.bank).exists())
+
+    def test_delete(self):
+        self.autosaver.flush()
+        self.bank.append(Pedalboard('Pedalboard'))
+
+        self.manager.banks.remove(self.bank)
+        self.autosaver.flush()
+
+        self.assertFalse(self.bank_path(self.bank).exists())
+
+    def test_replace(self):
+        self.autosaver.flush()
+        self.assertTrue(self.bank_path(self.bank).exists())
+
+        replacement = Bank('Replacement')
+        self.manager.banks[0] = replacement
+
+        self.assertFalse(self.bank_path(self.bank).exists())
+        self.assertTrue(self.bank_path(replacement).exists())
+        self.assertEqual((), self.autosaver.banks_files.dirty)
+
+    def test_load(self):
+        self.bank.append(Pedalboard('Pedalboard'))
+        self.autosaver.flush()
+
+        autosaver = WriteBehindAutosaver(str(self.data_path), interval=60)
+        manager = autosaver.load(DeviceController.sys_effect)
+
+        self.assertEqual(['Pedalboard'], [pedalboard.name for pedalboard in manager.banks[0].pedalboards])
+        # The loaded banks aren't written again
+        self.assertEqual((), autosaver.banks_files.dirty)
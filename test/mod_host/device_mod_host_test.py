@@ -0,0 +1,132 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock
+
+from application.controller.device_controller import DeviceController
+from application.controller.plugins_controller import PluginsController
+from application.mod_host.device_mod_host import DeviceModHost
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from test.controller.controller_test import ControllerTest
+
+
+class DeviceModHostTest(ControllerTest):
+
+    def setUp(self):
+        self.mod_host = DeviceModHost()
+        self.mod_host.host = MagicMock()
+        self.mod_host.max_standby_pedalboards = 2
+
+        self.manager = BanksManager()
+        self.manager.register(self.mod_host)
+
+        self.bank = self.generate_bank('DeviceModHostTest')
+        self.manager.append(self.bank)
+
+    def tearDown(self):
+        self.mod_host.close()
+
+    def generate_bank(self, name):
+        plugins = self.controller(PluginsController)
+        sys_effect = DeviceController.sys_effect
+
+        bank = Bank(name)
+        for index in range(3):
+            pedalboard = Pedalboard('{} pedalboard {}'.format(name, index))
+            reverb = plugins.lv2_effect('http://calf.sourceforge.net/plugins/Reverb')
+            pedalboard.append(reverb)
+            pedalboard.connect(sys_effect.outputs[0], reverb.inputs[0])
+            pedalboard.connect(reverb.outputs[0], sys_effect.inputs[0])
+            bank.append(pedalboard)
+
+        return bank
+
+    def test_preload(self):
+        pedalboard0, pedalboard1, pedalboard2 = self.bank.pedalboards
+
+        self.mod_host.pedalboard = pedalboard0
+        self.mod_host.preload([pedalboard1, pedalboard2])
+
+        self.assertEqual((pedalboard2, pedalboard1), self.mod_host.standby)
+        self.assertEqual(3, self.mod_host.host.add.call_count)
+        self.assertEqual(2, self.mod_host.host.connect.call_count)
+
+    def test_preload_disabled(self):
+        self.mod_host.max_standby_pedalboards = 0
+
+        self.mod_host.pedalboard = self.bank.pedalboards[0]
+        self.mod_host.preload(self.bank.pedalboards[1:])
+
+        self.assertEqual((), self.mod_host.standby)
+        self.assertEqual(1, self.mod_host.host.add.call_count)
+
+    def test_change_to_standby_pedalboard(self):
+        pedalboard0, pedalboard1, pedalboard2 = self.bank.pedalboards
+
+        self.mod_host.pedalboard = pedalboard0
+        self.mod_host.preload([pedalboard1])
+        self.mod_host.host.reset_mock()
+
+        self.mod_host.pedalboard = pedalboard1
+
+        self.mod_host.host.add.assert_not_called()
+        self.mod_host.host.remove.assert_not_called()
+        self.assertEqual(2, self.mod_host.host.disconnect.call_count)
+        self.assertEqual(2, self.mod_host.host.connect.call_count)
+        self.assertEqual(pedalboard1, self.mod_host.pedalboard)
+        self.assertEqual((pedalboard0, ), self.mod_host.standby)
+
+    def test_evict_least_recently_used(self):
+        pedalboard0, pedalboard1, pedalboard2 = self.bank.pedalboards
+        self.mod_host.max_standby_pedalboards = 1
+
+        self.mod_host.pedalboard = pedalboard0
+        self.mod_host.pedalboard = pedalboard1
+        self.mod_host.pedalboard = pedalboard2
+
+        self.assertEqual((pedalboard1, ), self.mod_host.standby)
+        self.mod_host.host.remove.assert_called_once_with(pedalboard0.effects[0])
+
+    def test_evict_by_instances(self):
+        pedalboard0, pedalboard1, pedalboard2 = self.bank.pedalboards
+        self.mod_host.max_standby_instances = 1
+
+        self.mod_host.pedalboard = pedalboard0
+        self.mod_host.preload([pedalboard1, pedalboard2])
+
+        self.assertEqual((pedalboard1, ), self.mod_host.standby)
+
+    def test_standby_param_changes(self):
+        pedalboard0, pedalboard1, pedalboard2 = self.bank.pedalboards
+
+        self.mod_host.pedalboard = pedalboard0
+        self.mod_host.preload([pedalboard1])
+
+        param = pedalboard1.effects[0].params[0]
+        param.value = param.minimum
+
+        self.mod_host.host.set_param_value.assert_called_with(param)
+
+    def test_standby_pedalboard_removed(self):
+        pedalboard0, pedalboard1, pedalboard2 = self.bank.pedalboards
+
+        self.mod_host.pedalboard = pedalboard0
+        self.mod_host.preload([pedalboard1])
+
+        self.bank.pedalboards.remove(pedalboard1)
+
+        self.assertEqual((), self.mod_host.standby)
+        self.mod_host.host.remove.assert_called_once_with(pedalboard1.effects[0])
@@ -0,0 +1,135 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from unittest.mock import MagicMock
+
+from application.component.components_observer import ComponentsObserver
+from application.controller.device_controller import DeviceController
+from application.controller.plugins_controller import PluginsController
+from application.mod_host.device_mod_host import DeviceModHost
+from application.mod_host.feedback_reader import FeedbackReader
+from application.mod_host.mod_host_simulator import ModHostSimulator
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from test.controller.controller_test import ControllerTest
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class FeedbackReaderTest(ControllerTest):
+
+    def setUp(self):
+        self.simulator = ModHostSimulator(port=None)
+        self.simulator.start()
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    def wait(self, condition, timeout=5):
+        limit = time.perf_counter() + timeout
+        while not condition() and time.perf_counter() < limit:
+            time.sleep(0.005)
+
+        self.assertTrue(condition())
+
+    def generate_pedalboard(self):
+        plugins = self.controller(PluginsController)
+        sys_effect = DeviceController.sys_effect
+
+        pedalboard = Pedalboard('FeedbackReaderTest')
+        reverb = plugins.lv2_effect(REVERB)
+        pedalboard.append(reverb)
+        pedalboard.connect(sys_effect.outputs[0], reverb.inputs[0])
+        pedalboard.connect(reverb.outputs[0], sys_effect.inputs[0])
+
+        bank = Bank('FeedbackReaderTest')
+        bank.append(pedalboard)
+
+        return pedalboard
+
+    def test_messages(self):
+        messages = []
+        reader = FeedbackReader(self.simulator.port + 1, listener=messages.append)
+        self.wait(lambda: self.simulator._feedback_clients)
+
+        self.simulator.feedback('param_set 0 gain 2.5')
+        self.simulator.feedback('output_set 0 level 0.8')
+        self.wait(lambda: reader.messages == 2)
+        reader.close()
+
+        self.assertEqual(['param_set 0 gain 2.5', 'output_set 0 level 0.8'], messages)
+        self.assertGreater(reader.throughput, 0)
+        self.assertGreater(reader.mean_lag, 0)
+        self.assertGreaterEqual(reader.max_lag, reader.last_lag)
+
+    def test_param_feedback(self):
+        mod_host = DeviceModHost(port=self.simulator.port)
+        mod_host.connect()
+        self.wait(lambda: self.simulator._feedback_clients)
+
+        manager = BanksManager()
+        manager.register(mod_host)
+
+        observer = MagicMock()
+        components_observer = ComponentsObserver(manager)
+        components_observer.register(observer)
+        manager.register(components_observer)
+
+        pedalboard = self.generate_pedalboard()
+        manager.append(pedalboard.bank)
+        mod_host.pedalboard = pedalboard
+
+        param = pedalboard.effects[0].params[0]
+        sent = self.simulator.statistics['param_set']
+
+        self.simulator.feedback('param_set {} {} {}'.format(
+            param.effect.instance, param.symbol, param.maximum
+        ))
+        self.wait(lambda: mod_host.feedback.messages == 1)
+
+        self.assertEqual(param.maximum, param.value)
+        observer.on_param_value_changed.assert_called_once_with(param)
+        # The change isn't sent again to mod-host
+        self.assertEqual(sent, self.simulator.statistics['param_set'])
+
+        mod_host.close()
+
+    def test_param_feedback_waits_the_lock(self):
+        mod_host = DeviceModHost(port=self.simulator.port)
+        mod_host.connect()
+        self.wait(lambda: self.simulator._feedback_clients)
+
+        manager = BanksManager()
+        manager.register(mod_host)
+
+        pedalboard = self.generate_pedalboard()
+        manager.append(pedalboard.bank)
+        mod_host.pedalboard = pedalboard
+
+        param = pedalboard.effects[0].params[0]
+
+        with mod_host.pipeline():
+            self.simulator.feedback('param_set {} {} {}'.format(
+                param.effect.instance, param.symbol, param.maximum
+            ))
+            time.sleep(0.05)
+            # A pedalboard change (in the pipeline) isn't interleaved with the feedback changes
+            self.assertEqual(param.default, param.value)
+
+        self.wait(lambda: mod_host.feedback.messages == 1)
+        self.assertEqual(param.maximum, param.value)
+
+        mod_host.close()
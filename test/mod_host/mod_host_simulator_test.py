@@ -0,0 +1,117 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import time
+
+from application.controller.device_controller import DeviceController
+from application.controller.plugins_controller import PluginsController
+from application.mod_host.device_mod_host import DeviceModHost
+from application.mod_host.mod_host_simulator import ModHostSimulator
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from test.controller.controller_test import ControllerTest
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class ModHostSimulatorTest(ControllerTest):
+
+    def setUp(self):
+        self.simulator = ModHostSimulator(port=None)
+        self.simulator.start()
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    def generate_pedalboard(self):
+        plugins = self.controller(PluginsController)
+        sys_effect = DeviceController.sys_effect
+
+        pedalboard = Pedalboard('ModHostSimulatorTest')
+        reverb = plugins.lv2_effect(REVERB)
+        pedalboard.append(reverb)
+        pedalboard.connect(sys_effect.outputs[0], reverb.inputs[0])
+        pedalboard.connect(reverb.outputs[0], sys_effect.inputs[0])
+
+        bank = Bank('ModHostSimulatorTest')
+        bank.append(pedalboard)
+
+        return pedalboard
+
+    def test_model(self):
+        mod_host = DeviceModHost(port=self.simulator.port)
+        mod_host.connect()
+
+        manager = BanksManager()
+        manager.register(mod_host)
+
+        pedalboard = self.generate_pedalboard()
+        manager.append(pedalboard.bank)
+        mod_host.pedalboard = pedalboard
+
+        reverb = pedalboard.effects[0]
+        reverb.params[0].value = reverb.params[0].maximum
+
+        self.assertEqual({reverb.instance}, set(self.simulator.instances))
+        self.assertEqual(REVERB, self.simulator.instances[reverb.instance]['uri'])
+        self.assertEqual(
+            {reverb.params[0].symbol: reverb.params[0].maximum},
+            self.simulator.instances[reverb.instance]['params']
+        )
+        self.assertEqual(2, len(self.simulator.connections))
+        self.assertEqual(1, self.simulator.statistics['add'])
+
+        mod_host.close()
+        self.assertEqual({}, self.simulator.instances)
+        self.assertEqual(set(), self.simulator.connections)
+        # The connections are removed with the effects
+        self.assertEqual(0, self.simulator.statistics['disconnect'])
+
+    def test_errors(self):
+        process = self.simulator.process
+
+        self.assertEqual('resp 0', process('add {} 0'.format(REVERB)))
+        self.assertEqual('resp -2', process('add {} 0'.format(REVERB)))
+        self.assertEqual('resp -3', process('param_set 1 gain 2'))
+        self.assertEqual('resp -205', process('connect effect_1:out system:playback_1'))
+        self.assertEqual('resp -206', process('disconnect effect_0:out system:playback_1'))
+        self.assertEqual('resp -902', process('unknown 0'))
+        self.assertEqual('resp -902', process('add {}'.format(REVERB)))
+
+        self.assertEqual('resp 0', process('param_set 0 gain 2.5'))
+        self.assertEqual('resp 0 2.5', process('param_get 0 gain'))
+
+    def test_pipelined_commands(self):
+        client = socket.create_connection(('localhost', self.simulator.port))
+        client.sendall('add {} 0\0bypass 0 1\0remove 0\0'.format(REVERB).encode('utf-8'))
+
+        responses = b''
+        while responses.count(b'\0') < 3:
+            responses += client.recv(1024)
+        client.close()
+
+        self.assertEqual(b'resp 0\0resp 0\0resp 0\0', responses)
+        self.assertEqual({}, self.simulator.instances)
+
+    def test_latency(self):
+        self.simulator.latency = 0.01
+        self.simulator.latencies['add'] = 0.05
+
+        start = time.perf_counter()
+        self.simulator.process('add {} 0'.format(REVERB))
+        self.simulator.process('bypass 0 1')
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.06)
@@ -0,0 +1,137 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from application.controller.device_controller import DeviceController
+from application.controller.plugins_controller import PluginsController
+from application.mod_host.device_mod_host import DeviceModHost
+from application.mod_host.mod_host_simulator import ModHostSimulator
+from application.mod_host.mod_host_supervisor import ModHostSupervisor
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from test.controller.controller_test import ControllerTest
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class ModHostSupervisorTest(ControllerTest):
+
+    def setUp(self):
+        self.simulator = ModHostSimulator(port=None)
+        self.simulator.start()
+
+        self.mod_host = DeviceModHost(port=self.simulator.port)
+        self.mod_host.connect()
+
+        self.manager = BanksManager()
+        self.manager.register(self.mod_host)
+
+        self.pedalboard = self.generate_pedalboard()
+        self.manager.append(self.pedalboard.bank)
+        self.mod_host.pedalboard = self.pedalboard
+
+        self.supervisor = ModHostSupervisor(
+            self.mod_host,
+            lambda: self.mod_host.restore(self.pedalboard),
+            heartbeat=0.05,
+            backoff=0.01
+        )
+        self.supervisor.start()
+
+    def tearDown(self):
+        self.supervisor.stop()
+        self.mod_host.close()
+        self.simulator.stop()
+
+    def generate_pedalboard(self):
+        plugins = self.controller(PluginsController)
+        sys_effect = DeviceController.sys_effect
+
+        pedalboard = Pedalboard('ModHostSupervisorTest')
+        reverb = plugins.lv2_effect(REVERB)
+        pedalboard.append(reverb)
+        pedalboard.connect(sys_effect.outputs[0], reverb.inputs[0])
+        pedalboard.connect(reverb.outputs[0], sys_effect.inputs[0])
+
+        bank = Bank('ModHostSupervisorTest')
+        bank.append(pedalboard)
+
+        return pedalboard
+
+    def wait_reconnections(self, reconnections, timeout=5):
+        limit = time.perf_counter() + timeout
+        while self.supervisor.reconnections < reconnections and time.perf_counter() < limit:
+            time.sleep(0.01)
+
+        self.assertEqual(reconnections, self.supervisor.reconnections)
+
+    def test_reconnect(self):
+        self.simulator.restart()
+        self.assertEqual({}, self.simulator.instances)
+
+        self.wait_reconnections(1)
+
+        reverb = self.pedalboard.effects[0]
+        self.assertTrue(self.supervisor.connected)
+        self.assertEqual({reverb.instance}, set(self.simulator.instances))
+        self.assertEqual(2, len(self.simulator.connections))
+        self.assertGreater(self.supervisor.last_reconnect_time, 0)
+
+    def test_reconnect_backoff(self):
+        port = self.simulator.port
+        self.simulator.stop()
+
+        reverb = self.pedalboard.effects[0]
+        reverb.params[0].value = reverb.params[0].maximum
+
+        self.assertFalse(self.supervisor.connected)
+        self.assertEqual(1, self.supervisor.queued_commands)
+
+        time.sleep(0.1)
+        self.simulator = ModHostSimulator(port=port)
+        self.simulator.start()
+
+        self.wait_reconnections(1)
+
+        self.assertGreater(self.supervisor.attempts, 1)
+        self.assertEqual(1, self.supervisor.discarded_commands)
+        self.assertEqual(0, self.supervisor.queued_commands)
+        # The changes while disconnected are restored
+        self.assertEqual(
+            {reverb.params[0].symbol: reverb.params[0].maximum},
+            self.simulator.instances[reverb.instance]['params']
+        )
+
+    def test_restore_error(self):
+        restore = self.supervisor.restore
+        errors = []
+
+        def failing_restore():
+            if not errors:
+                errors.append(RuntimeError('Restore error'))
+                raise errors[0]
+            restore()
+
+        self.supervisor.restore = failing_restore
+        self.simulator.restart()
+
+        self.wait_reconnections(1)
+
+        reverb = self.pedalboard.effects[0]
+        self.assertEqual(1, len(errors))
+        self.assertGreaterEqual(self.supervisor.attempts, 2)
+        self.assertTrue(self.supervisor._thread.is_alive())
+        self.assertEqual({reverb.instance}, set(self.simulator.instances))
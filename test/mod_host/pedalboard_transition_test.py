@@ -0,0 +1,112 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import MagicMock
+
+from application.controller.device_controller import DeviceController
+from application.controller.plugins_controller import PluginsController
+from application.mod_host.device_mod_host import DeviceModHost
+from application.mod_host.pedalboard_transition import PedalboardTransition
+from pluginsmanager.banks_manager import BanksManager
+from pluginsmanager.model.bank import Bank
+from pluginsmanager.model.pedalboard import Pedalboard
+from test.controller.controller_test import ControllerTest
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+FLANGER = 'http://calf.sourceforge.net/plugins/Flanger'
+
+
+class PedalboardTransitionTest(ControllerTest):
+
+    def generate_pedalboard(self, name, *uris):
+        plugins = self.controller(PluginsController)
+        sys_effect = DeviceController.sys_effect
+
+        pedalboard = Pedalboard(name)
+        for uri in uris:
+            pedalboard.append(plugins.lv2_effect(uri))
+
+        effects = list(pedalboard.effects)
+        pedalboard.connect(sys_effect.outputs[0], effects[0].inputs[0])
+        for effect, next_effect in zip(effects, effects[1:]):
+            pedalboard.connect(effect.outputs[0], next_effect.inputs[0])
+        pedalboard.connect(effects[-1].outputs[0], sys_effect.inputs[0])
+
+        return pedalboard
+
+    def test_same_plugins(self):
+        current = self.generate_pedalboard('current', FLANGER, REVERB)
+        pedalboard = self.generate_pedalboard('pedalboard', FLANGER, REVERB)
+
+        param = pedalboard.effects[1].params[0]
+        param.value = param.minimum
+        pedalboard.effects[0].active = False
+
+        transition = PedalboardTransition(current, pedalboard)
+
+        self.assertEqual([param], transition.params_to_set)
+        self.assertEqual([pedalboard.effects[0]], transition.effects_to_toggle)
+        self.assertEqual([], transition.effects_to_add)
+        self.assertEqual([], transition.effects_to_remove)
+        self.assertEqual([], transition.connections_to_connect)
+        self.assertEqual([], transition.connections_to_disconnect)
+        self.assertEqual(2, transition.operations)
+        self.assertLess(transition.operations, transition.rebuild_operations)
+
+    def test_different_plugins(self):
+        current = self.generate_pedalboard('current', FLANGER)
+        pedalboard = self.generate_pedalboard('pedalboard', REVERB)
+
+        transition = PedalboardTransition(current, pedalboard)
+
+        self.assertEqual([current.effects[0]], transition.effects_to_remove)
+        self.assertEqual([pedalboard.effects[0]], transition.effects_to_add)
+        # Connections of removed effects are removed by mod-host
+        self.assertEqual([], transition.connections_to_disconnect)
+        self.assertEqual(2, len(transition.connections_to_connect))
+
+    def test_changed_connections(self):
+        current = self.generate_pedalboard('current', FLANGER, REVERB)
+        pedalboard = self.generate_pedalboard('pedalboard', REVERB, FLANGER)
+
+        transition = PedalboardTransition(current, pedalboard)
+
+        self.assertEqual(2, len(transition.pairs))
+        self.assertEqual(3, len(transition.connections_to_disconnect))
+        self.assertEqual(3, len(transition.connections_to_connect))
+
+    def test_device_mod_host_uses_transition(self):
+        mod_host = DeviceModHost()
+        mod_host.host = MagicMock()
+
+        manager = BanksManager()
+        manager.register(mod_host)
+
+        bank = Bank('PedalboardTransitionTest')
+        bank.append(self.generate_pedalboard('current', FLANGER, REVERB))
+        bank.append(self.generate_pedalboard('pedalboard', FLANGER, REVERB))
+        manager.append(bank)
+
+        mod_host.pedalboard = bank.pedalboards[0]
+        mod_host.host.reset_mock()
+
+        mod_host.pedalboard = bank.pedalboards[1]
+
+        self.assertEqual(0, mod_host.last_transition.operations)
+        mod_host.host.add.assert_not_called()
+        mod_host.host.remove.assert_not_called()
+        mod_host.host.connect.assert_not_called()
+        mod_host.host.disconnect.assert_not_called()
+
+        mod_host.close()
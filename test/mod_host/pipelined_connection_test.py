@@ -0,0 +1,117 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from application.mod_host.mod_host_simulator import ModHostSimulator
+from application.mod_host.pipelined_connection import PipelinedConnection
+
+REVERB = 'http://calf.sourceforge.net/plugins/Reverb'
+
+
+class PipelinedConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = ModHostSimulator(port=None)
+        self.simulator.start()
+
+        self.connection = PipelinedConnection(self.simulator.port)
+
+    def tearDown(self):
+        self.connection.close()
+        self.simulator.stop()
+
+    def load(self, instance):
+        send = self.connection.send
+
+        send('add {} {}'.format(REVERB, instance))
+        send('param_set {} decay_time 3'.format(instance))
+        send('bypass {} 1'.format(instance))
+        send('connect system:capture_1 effect_{}:in_l'.format(instance))
+        send('connect effect_{}:out_l system:playback_1'.format(instance))
+
+    def test_send(self):
+        self.assertEqual(b'resp 0', self.connection.send('add {} 0'.format(REVERB)))
+        self.assertEqual(b'resp -2', self.connection.send('add {} 0'.format(REVERB)))
+        self.assertEqual(2, self.connection.round_trips)
+
+    def test_pipeline(self):
+        with self.connection.pipeline():
+            self.load(0)
+            self.assertTrue(self.connection.pipelining)
+
+        self.assertFalse(self.connection.pipelining)
+
+        # The connect waits the add
+        self.assertEqual(2, self.connection.round_trips)
+        self.assertEqual(5, self.connection.sent)
+        self.assertEqual(0, self.connection.errors)
+
+        self.assertEqual({'decay_time': 3}, self.simulator.instances[0]['params'])
+        self.assertEqual(2, len(self.simulator.connections))
+
+    def test_pipeline_errors(self):
+        with self.connection.pipeline():
+            self.connection.send('param_set 10 decay_time 3')
+            self.connection.send('add {} 0'.format(REVERB))
+
+        self.assertEqual(1, self.connection.errors)
+        self.assertIn(0, self.simulator.instances)
+
+    def test_pipeline_window(self):
+        self.connection.window = 2
+
+        with self.connection.pipeline():
+            for instance in range(5):
+                self.connection.send('add {} {}'.format(REVERB, instance))
+
+        self.assertEqual(5, len(self.simulator.instances))
+
+    def test_pipeline_round_trip(self):
+        self.simulator.round_trip = 0.02
+
+        start = time.perf_counter()
+        for instance in range(5):
+            self.load(instance)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with self.connection.pipeline():
+            for instance in range(5, 10):
+                self.load(instance)
+        pipelined = time.perf_counter() - start
+
+        # Each pedalboard load waits the add before the connections
+        self.assertGreaterEqual(sequential, 25 * 0.02)
+        self.assertLess(pipelined, 10 * 0.02)
+        self.assertLess(pipelined, sequential / 2)
+
+    def test_connection_lost(self):
+        disconnections = []
+        self.connection.on_disconnected = lambda: disconnections.append(True)
+
+        # The simulator only disconnects the clients that it has already accepted
+        self.assertTrue(self.connection.ping())
+        self.simulator.restart()
+
+        self.assertIsNone(self.connection.send('add {} 0'.format(REVERB)))
+        self.assertFalse(self.connection.connected)
+        self.assertEqual([True], disconnections)
+        self.assertEqual(['add {} 0'.format(REVERB)], list(self.connection.queued))
+
+        self.connection.connect()
+        self.assertEqual(0, len(self.connection.queued))
+        self.assertEqual(b'resp 0', self.connection.send('add {} 0'.format(REVERB)))
+        self.assertTrue(self.connection.ping())
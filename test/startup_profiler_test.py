@@ -0,0 +1,84 @@
+# Copyright 2017 SrMouraSilva
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import logging
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from application.startup_profiler import StartupProfiler, main
+from test.controller.controller_test import ControllerTest
+
+
+class StartupProfilerTest(ControllerTest):
+
+    def test_phases(self):
+        clock = iter([10, 11, 13, 13, 14, 14, 16]).__next__
+        profiler = StartupProfiler(clock=clock)
+
+        with profiler.phase('banks load'):
+            pass
+        with profiler.phase('CurrentController', group='controller'):
+            pass
+        with profiler.phase('PluginsController', group='controller'):
+            pass
+
+        self.assertEqual(['banks load', 'CurrentController', 'PluginsController'],
+                         [phase.name for phase in profiler.phases])
+        self.assertEqual([2, 1, 2], [phase.duration for phase in profiler.phases])
+        self.assertEqual(6, profiler.total)
+        self.assertEqual({'controller': 3}, profiler.groups)
+
+    def test_phase_with_error(self):
+        profiler = StartupProfiler()
+
+        with self.assertRaises(ValueError):
+            with profiler.phase('component init'):
+                raise ValueError()
+
+        self.assertEqual(1, len(profiler.phases))
+
+    def test_application_report(self):
+        profiler = self.application.startup_profiler
+        names = [phase.name for phase in profiler.phases]
+
+        self.assertIn('banks load', names)
+        self.assertIn('current pedalboard load', names)
+        self.assertIn('PluginsController', names)
+        self.assertEqual(4, len([phase for phase in profiler.phases if phase.group == 'controller']))
+
+        json.dumps(profiler.json)
+        self.assertIn('Total', str(profiler))
+
+    def test_main_json_output(self):
+        data_path = Path(tempfile.mkdtemp())
+        handler = logging.getLogger().handlers[0]
+        stream = handler.stream
+
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                # Application logs in stdout
+                handler.stream = sys.stdout
+                main([str(data_path / Path('data')), '--test', '--json'])
+        finally:
+            handler.stream = stream
+            shutil.rmtree(str(data_path))
+
+        self.assertIn('total', json.loads(output.getvalue()))
+